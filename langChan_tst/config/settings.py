@@ -81,10 +81,77 @@ LOGS_DIR = PROJECT_ROOT / "logs"
 
 # --- Manim Reference ---
 MANIM_REF_PATH = PROJECT_ROOT / "manimRef.md"
+MANIM_REF_TOKEN_BUDGET = int(os.getenv("MANIM_REF_TOKEN_BUDGET", "1500"))  # 0 sends the whole reference
+
+# --- Rendering ---
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "subprocess").lower()  # "subprocess" or "pool"
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+RENDER_POOL_MAX_TASKS = int(os.getenv("RENDER_POOL_MAX_TASKS", "20"))  # Recycle a worker after this many renders
+RENDER_POOL_MAX_MEMORY_MB = int(os.getenv("RENDER_POOL_MAX_MEMORY_MB", "3072"))
+ASSEMBLY_MODE = os.getenv("ASSEMBLY_MODE", "single_pass").lower()  # "single_pass" or "per_scene"
+PREFLIGHT_ENABLED = os.getenv("PREFLIGHT_ENABLED", "true").lower() == "true"  # Dry-run scenes before rendering
+PREFLIGHT_TIMEOUT = int(os.getenv("PREFLIGHT_TIMEOUT", "60"))
+CORRECTION_CANDIDATES = int(os.getenv("CORRECTION_CANDIDATES", "1"))  # >1 races that many corrections per failed render
+
+# --- Caching ---
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(PROJECT_ROOT / "cache")))
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "true").lower() == "true"
+RENDER_CACHE_DIR = CACHE_DIR / "renders"
+RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", "2048"))
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_DIR = CACHE_DIR / "tts"
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "1024"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_DIR = CACHE_DIR / "llm"
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # One week
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+API_INDEX_DIR = CACHE_DIR / "api_index"
+
+# --- Static Validation ---
+STATIC_VALIDATION_ENABLED = os.getenv("STATIC_VALIDATION_ENABLED", "true").lower() == "true"
+
+# --- Script Generation ---
+SCRIPT_STREAMING_ENABLED = os.getenv("SCRIPT_STREAMING_ENABLED", "true").lower() == "true"  # Pipeline mode only
+SCRIPT_MAX_RETRIES = int(os.getenv("SCRIPT_MAX_RETRIES", "2"))  # New requests when local JSON repair fails
+SCRIPT_VARIATIONS = int(os.getenv("SCRIPT_VARIATIONS", "3"))  # Scripts per /api/generate_scripts request
+SCRIPT_GENERATION_CONCURRENCY = int(os.getenv("SCRIPT_GENERATION_CONCURRENCY", "6"))  # In-flight script requests across all API calls
+
+# --- Code Generation Streaming ---
+CODE_STREAMING_ENABLED = os.getenv("CODE_STREAMING_ENABLED", "true").lower() == "true"
+CODE_STREAM_MAX_CHARS = int(os.getenv("CODE_STREAM_MAX_CHARS", "60000"))  # Abort longer responses (~15k tokens)
+CODE_STREAM_REPEAT_LIMIT = int(os.getenv("CODE_STREAM_REPEAT_LIMIT", "6"))  # Abort when a block repeats this often
+CODE_STREAM_MAX_ABORTS = int(os.getenv("CODE_STREAM_MAX_ABORTS", "2"))  # Immediate retries after an abort
+
+# --- Model Cascade for Manim Code ---
+# Scenes start on the fast model and escalate to MANIM_MODEL when checks fail
+MANIM_CASCADE_ENABLED = os.getenv("MANIM_CASCADE_ENABLED", "true").lower() == "true"
+MANIM_FAST_MODEL = os.getenv("MANIM_FAST_MODEL", "gemini-2.5-flash-lite")
+MANIM_FAST_THINKING_BUDGET = int(os.getenv("MANIM_FAST_THINKING_BUDGET", "512"))
+MANIM_ESCALATE_AFTER = int(os.getenv("MANIM_ESCALATE_AFTER", "1"))  # Failed checks before moving up a model
+MANIM_FAST_MIN_SUCCESS_RATE = float(os.getenv("MANIM_FAST_MIN_SUCCESS_RATE", "0.5"))  # Below this, skip the fast model
+MANIM_FAST_MIN_SAMPLES = int(os.getenv("MANIM_FAST_MIN_SAMPLES", "6"))  # Outcomes needed before the rate counts
+MANIM_FAST_LAYOUTS = [layout.strip() for layout in os.getenv(
+    "MANIM_FAST_LAYOUTS", "title_and_main_content,split_screen").split(",") if layout.strip()]
 
 # --- Batch Processing ---
 BATCH_SIZE = 10
 BATCH_TIMEOUT = 3600  # 1 hour
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "180"))  # Seconds per attempt
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))  # Retries for rate limits and transient errors
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "2.0"))  # Doubled on every retry
+
+# --- Shared Clients ---
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Hosts kept in each session's pool
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # Keep-alive connections per host
+
+# --- API Job Workers ---
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))  # Generation jobs run at once; the rest queue
+JOB_RENDER_BUDGET = int(os.getenv("JOB_RENDER_BUDGET", "4"))  # Concurrent Manim renders shared by all jobs
+
+# --- API Job Store ---
+JOB_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", str(PROJECT_ROOT / "data" / "api_store.db")))
+JOB_STORE_TTL_HOURS = float(os.getenv("JOB_STORE_TTL_HOURS", "72"))  # Scripts and finished jobs expire after this
 
 # --- Logging Configuration ---
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -274,6 +341,15 @@ def validate_config():
     if DEFAULT_QUALITY not in QUALITY_PRESETS:
         errors.append(f"Invalid default quality: {DEFAULT_QUALITY}")
     
+    if RENDER_BACKEND not in ("subprocess", "pool"):
+        errors.append(f"Invalid render backend: {RENDER_BACKEND}")
+    
+    if ASSEMBLY_MODE not in ("single_pass", "per_scene"):
+        errors.append(f"Invalid assembly mode: {ASSEMBLY_MODE}")
+    
+    if MAX_CONCURRENT_JOBS < 1 or JOB_RENDER_BUDGET < 1:
+        errors.append("MAX_CONCURRENT_JOBS and JOB_RENDER_BUDGET must be at least 1")
+    
     return errors
 
 # --- Directory Setup ---
@@ -10,15 +10,16 @@ import json
 import uuid
 import time
 import copy
+import concurrent.futures
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from dotenv import load_dotenv
 
 # Try to import FastAPI dependencies (optional for API mode)
 try:
-    from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+    from fastapi import FastAPI, HTTPException, Request
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import JSONResponse, StreamingResponse
     from pydantic import BaseModel, Field
     import uvicorn
     FASTAPI_AVAILABLE = True
@@ -37,20 +38,33 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.engine import create_video_engine
+from src.core.jobs import JobWorkerPool, run_generation_job
 from src.core.models import (
     TTSConfig, ManimConfig, RenderConfig, TTSProvider, QualityPreset,
     VideoScript, Scene, ProcessingSummary
 )
 from src.utils.logging import setup_logging
-from config.settings import validate_config, setup_directories, TTS_VOICE_NAME, TTS_PROVIDER
+from src.utils.file_ops import load_json
+from src.utils.job_store import get_job_store
+from src.utils.events import EventBroker, format_sse, HEARTBEAT_SECONDS
+from src.providers.registry import load_prompt_assets, close_shared_clients
+from config.settings import validate_config, setup_directories, TTS_VOICE_NAME, TTS_PROVIDER, RENDER_BACKEND, ASSEMBLY_MODE, MANIM_FAST_MODEL, CORRECTION_CANDIDATES, SCRIPT_VARIATIONS, SCRIPT_GENERATION_CONCURRENCY
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global storage for API (only used if FastAPI is available)
-scripts_storage: Dict[str, Any] = {}
-generation_jobs: Dict[str, Dict[str, Any]] = {}
+# Job worker pool for API generation jobs (scripts and jobs live in the job store)
+job_pool: Optional[JobWorkerPool] = None
+# Job and script changes, pushed to server-sent event streams
+event_broker = EventBroker()
+# Background script generation; bounds in-flight script requests across all API calls
+script_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=SCRIPT_GENERATION_CONCURRENCY, thread_name_prefix="script-generation"
+)
+
+# Job states after which a job's event stream ends
+TERMINAL_STATUSES = ("completed", "failed")
 
 
 # ============================================================================
@@ -75,8 +89,13 @@ class GenerateVideoRequest(BaseModel):
     enable_parallel: Optional[bool] = True
     max_tts_workers: Optional[int] = 4
     max_render_workers: Optional[int] = 2
+    pipeline_mode: Optional[bool] = False
+    max_codegen_workers: Optional[int] = 4
+    stream_script: Optional[bool] = True
+    bypass_llm_cache: Optional[bool] = False
     use_thinking: Optional[bool] = True
     use_batch: Optional[bool] = True
+    model_cascade: Optional[bool] = True
 
 class GetScriptRequest(BaseModel):
     token: str
@@ -91,11 +110,13 @@ class StartGenerationRequest(BaseModel):
 
 class JobStatus(BaseModel):
     job_id: str
+    token: Optional[str] = None
     status: str  # "pending", "running", "completed", "failed"
     progress: float = 0.0
     message: str = ""
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None  # Stage, scene counts, ETA and final video path
     created_at: float
     updated_at: float
 
@@ -132,99 +153,88 @@ def merge_scripts(existing: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str
 
     return result
 
-def create_job(job_id: str, status: str = "pending", message: str = "") -> JobStatus:
+def publish_job(job: Dict[str, Any]):
+    """Push a job's current state to its event streams and its script's"""
+    event_broker.publish(("job", job["job_id"]), "job", job)
+    if job.get("token"):
+        event_broker.publish(("script", job["token"]), "job", job)
+
+def publish_script(token: str, script: Dict[str, Any]):
+    """Push a stored or edited script to its event streams"""
+    event_broker.publish(("script", token), "script", script)
+
+def create_job(job_id: str, status: str = "pending", message: str = "",
+               token: Optional[str] = None) -> JobStatus:
     """Create a new job status entry"""
-    current_time = time.time()
-    job = JobStatus(
-        job_id=job_id,
-        status=status,
-        progress=0.0,
-        message=message,
-        created_at=current_time,
-        updated_at=current_time
-    )
-    generation_jobs[job_id] = job.dict()
-    return job
+    job = get_job_store().create_job(job_id, status=status, message=message, token=token)
+    publish_job(job)
+    return JobStatus(**job)
 
 def update_job(job_id: str, **updates) -> Optional[JobStatus]:
     """Update job status"""
-    if job_id not in generation_jobs:
+    job = get_job_store().update_job(job_id, **updates)
+    if job is None:
         return None
-    
-    generation_jobs[job_id].update(updates)
-    generation_jobs[job_id]["updated_at"] = time.time()
-    return JobStatus(**generation_jobs[job_id])
+    publish_job(job)
+    return JobStatus(**job)
 
-async def background_video_generation(job_id: str, script_data: Dict[str, Any], config: GenerateVideoRequest):
-    """Background task for video generation"""
+def generate_script_variation(token: str, topic: str, variation: int):
+    """Generate one script variation for a reserved token (runs on script_executor)"""
+    from src.providers.llm import create_llm_provider
+    
+    store = get_job_store()
     try:
-        update_job(job_id, status="running", message="Starting video generation", progress=10)
-        
-        # Create configurations
-        tts_config = TTSConfig(
-            provider=TTSProvider(config.tts_provider),
-            voice=config.voice
-        )
-        
-        manim_config = ManimConfig(
-            use_thinking=config.use_thinking,
-            use_batch=config.use_batch
-        )
-        
-        render_config = RenderConfig(
-            quality=QualityPreset(config.quality)
-        )
-        
-        update_job(job_id, message="Creating video engine", progress=20)
-        
-        # Create engine
-        engine = create_video_engine(
-            tts_config=tts_config,
-            manim_config=manim_config,
-            render_config=render_config,
-            enable_parallel=config.enable_parallel,
-            max_tts_workers=config.max_tts_workers,
-            max_render_workers=config.max_render_workers
-        )
-        
-        update_job(job_id, message="Generating video", progress=30)
-        
-        # Convert script data to VideoScript object
-        video_script = VideoScript(**script_data)
-        
-        # Generate video (this will take time)
-        success, summary = engine.generate_video(video_script.title)
-        
-        if success:
-            result = {
-                "success": True,
-                "summary": summary.dict(),
-                "total_scenes": summary.total_scenes,
-                "success_rates": {
-                    "tts": f"{summary.tts_stats.success}/{summary.total_scenes}",
-                    "code_generation": f"{summary.manim_stats.success}/{summary.total_scenes}",
-                    "rendering": f"{summary.render_stats.success}/{summary.total_scenes}"
-                }
-            }
-            update_job(job_id, 
-                      status="completed", 
-                      message="Video generation completed successfully", 
-                      progress=100,
-                      result=result)
-        else:
-            update_job(job_id, 
-                      status="failed", 
-                      message="Video generation failed", 
-                      progress=100,
-                      error="Generation process failed")
-            
+        # A provider per variation, since providers keep per-call state. No response
+        # cache here: the repeated identical prompt is what produces distinct variations.
+        script = create_llm_provider("gemini").generate_script(topic).dict()
     except Exception as e:
-        logger.error(f"Background generation failed for job {job_id}: {e}")
-        update_job(job_id, 
-                  status="failed", 
-                  message=f"Generation failed: {str(e)}", 
-                  progress=100,
-                  error=str(e))
+        logger.error(f"Failed to generate script #{variation} ({token}): {e}")
+        if store.fail_script(token, str(e)):
+            event_broker.publish(("script", token), "script_failed", {"token": token, "error": str(e)})
+        return
+    
+    if store.complete_script(token, script):
+        publish_script(token, script)
+        logger.info(f"Script #{variation} stored with token: {token}")
+    else:
+        logger.info(f"Discarded generated script #{variation}: token {token} was edited or expired first")
+
+def generation_engine_options(config: GenerateVideoRequest) -> Dict[str, Any]:
+    """Engine arguments for an API generation request"""
+    tts_config = TTSConfig(
+        provider=TTSProvider(config.tts_provider),
+        voice=config.voice
+    )
+    
+    manim_config = ManimConfig(
+        use_thinking=config.use_thinking,
+        use_batch=config.use_batch,
+        cascade=config.model_cascade
+    )
+    
+    render_config = RenderConfig(
+        quality=QualityPreset(config.quality)
+    )
+    
+    return {
+        "tts_config": tts_config,
+        "manim_config": manim_config,
+        "render_config": render_config,
+        "enable_parallel": config.enable_parallel,
+        "max_tts_workers": config.max_tts_workers,
+        "max_render_workers": config.max_render_workers,
+        "pipeline_mode": config.pipeline_mode,
+        "max_codegen_workers": config.max_codegen_workers,
+        "stream_script": config.stream_script,
+        "bypass_llm_cache": config.bypass_llm_cache
+    }
+
+def get_job_pool() -> JobWorkerPool:
+    """Get the API's job worker pool, starting it on first use"""
+    global job_pool
+    if job_pool is None:
+        job_pool = JobWorkerPool(on_update=update_job)
+    return job_pool
 
 # ============================================================================
 # FASTAPI APPLICATION (Only available if FastAPI is installed)
@@ -256,6 +266,21 @@ if FASTAPI_AVAILABLE:
         logger.info(f"API response: {response.status_code} in {process_time:.3f}s")
         return response
 
+    @app.on_event("startup")
+    async def warm_shared_clients():
+        """Load prompt assets once so the first job does not pay for it"""
+        await asyncio.to_thread(load_prompt_assets)
+        get_job_store().fail_interrupted_jobs()
+        get_job_store().fail_interrupted_scripts()
+        get_job_pool()
+
+    @app.on_event("shutdown")
+    async def release_shared_clients():
+        if job_pool is not None:
+            job_pool.shutdown()
+        script_executor.shutdown(wait=False, cancel_futures=True)
+        close_shared_clients()
+
     # ============================================================================
     # API ENDPOINTS
     # ============================================================================
@@ -273,43 +298,34 @@ if FASTAPI_AVAILABLE:
                 "update_script": "POST /api/script/{token}",
                 "start_generation": "POST /api/generate/{token}",
                 "job_status": "GET /api/job/{job_id}",
+                "job_events": "GET /api/job/{job_id}/events",
+                "script_events": "GET /api/script/{token}/events",
                 "list_jobs": "GET /api/jobs"
             }
         }
 
     @app.post("/api/generate_scripts")
     async def generate_scripts(request: GenerateVideoRequest):
-        """Generate multiple script variations for a topic"""
-        logger.info(f"Generating scripts for topic: {request.topic}")
+        """Start generating script variations for a topic and return their tokens
+        
+        The variations are generated concurrently in the background. Each
+        token's script can be read (or streamed) as soon as it lands; until
+        then GET /api/script/{token} answers 202 with status "pending".
+        """
+        logger.info(f"Generating {SCRIPT_VARIATIONS} scripts for topic: {request.topic}")
         
         try:
-            from src.providers.llm import create_llm_provider
-            
-            # Create LLM provider for script generation
-            llm_provider = create_llm_provider("gemini")
-            
-            tokens = []
-            for i in range(3):  # Generate 3 variations
-                logger.info(f"Generating script variation #{i+1}")
-                
-                try:
-                    script = llm_provider.generate_script(request.topic)
-                    token = uuid.uuid4().hex[:8]
-                    scripts_storage[token] = script.dict()
-                    tokens.append(token)
-                    logger.info(f"Script #{i+1} stored with token: {token}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to generate script #{i+1}: {e}")
-                    continue
-            
-            if not tokens:
-                raise HTTPException(status_code=500, detail="Failed to generate any scripts")
+            store = get_job_store()
+            tokens = [uuid.uuid4().hex[:8] for _ in range(SCRIPT_VARIATIONS)]
+            for i, token in enumerate(tokens):
+                store.reserve_script(token)
+                script_executor.submit(generate_script_variation, token, request.topic, i + 1)
             
             return {
                 "topic": request.topic,
                 "tokens": tokens,
-                "count": len(tokens)
+                "count": len(tokens),
+                "status": "pending"
             }
             
         except Exception as e:
@@ -321,25 +337,37 @@ if FASTAPI_AVAILABLE:
         """Get script by token"""
         logger.info(f"Retrieving script for token: {token}")
         
-        if token not in scripts_storage:
+        record = get_job_store().get_script_status(token)
+        if record is None:
             raise HTTPException(status_code=404, detail="Script token not found")
+        if record["status"] == "pending":
+            return JSONResponse(status_code=202, content={"token": token, "status": "pending"})
+        if record["status"] == "failed":
+            return JSONResponse(status_code=500, content={
+                "token": token, "status": "failed", "error": record["error"]
+            })
         
-        return scripts_storage[token]
+        return record["script"]
 
     @app.post("/api/script/{token}")
     async def update_script(token: str, script_updates: Dict[str, Any]):
         """Update script with partial or complete changes"""
         logger.info(f"Updating script for token: {token}")
         
-        try:
-            if token in scripts_storage:
-                merged = merge_scripts(scripts_storage[token], script_updates)
+        def merge_and_validate(existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if existing is not None:
+                merged = merge_scripts(existing, script_updates)
             else:
                 merged = copy.deepcopy(script_updates)
             
             # Validate merged script
-            validated = APIVideoScript(**merged)
-            scripts_storage[token] = merged
+            APIVideoScript(**merged)
+            return merged
+        
+        try:
+            # Merged and written in one transaction so concurrent edits are not lost
+            merged = get_job_store().update_script(token, merge_and_validate)
+            publish_script(token, merged)
             
             logger.info(f"Script updated successfully for token: {token}")
             return {
@@ -353,61 +381,135 @@ if FASTAPI_AVAILABLE:
             raise HTTPException(status_code=400, detail=f"Script update failed: {str(e)}")
 
     @app.post("/api/generate/{token}")
-    async def start_generation(token: str, config: Optional[GenerateVideoRequest] = None, background_tasks: BackgroundTasks = None):
+    async def start_generation(token: str, config: Optional[GenerateVideoRequest] = None):
         """Start video generation for a script"""
         logger.info(f"Starting generation for token: {token}")
         
-        if token not in scripts_storage:
+        script = get_job_store().get_script(token)
+        if script is None:
             raise HTTPException(status_code=404, detail="Script token not found")
         
+        # The stored script is rendered as-is, so reject it now rather than in the worker
+        try:
+            VideoScript(**script)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid script: {str(e)}")
+        
         # Use default config if none provided
         if config is None:
             config = GenerateVideoRequest(topic="Generated Video")
         
         # Create job
         job_id = uuid.uuid4().hex[:12]
-        job = create_job(job_id, status="pending", message="Generation queued")
-        
-        # Start background generation
-        background_tasks.add_task(
-            background_video_generation,
-            job_id,
-            scripts_storage[token],
-            config
-        )
+        job = create_job(job_id, status="pending", message="Generation queued", token=token)
+        
+        # Run in a job worker process; it starts once a worker is free
+        get_job_pool().submit(job_id, run_generation_job, script, generation_engine_options(config))
         
         return {
             "job_id": job_id,
             "status": "pending",
-            "message": "Video generation started",
+            "message": "Video generation queued",
             "token": token
         }
 
     @app.get("/api/job/{job_id}")
     async def get_job_status(job_id: str):
         """Get job status and progress"""
-        if job_id not in generation_jobs:
+        job = get_job_store().get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        return job
+
+    async def event_stream(request: Request, key: Any, snapshot: Callable[[], List[Tuple[str, Any]]],
+                           done: Optional[Callable[[str, Any], bool]] = None):
+        """Server-sent events for key: the current state, then every update
+
+        The stream subscribes before taking the snapshot so no update is
+        missed, sends keep-alive comments while idle, and ends when done(event,
+        data) is true or the client disconnects.
+        """
+        queue = event_broker.subscribe(key)
+        try:
+            for event, data in snapshot():
+                yield format_sse(event, data)
+                if done and done(event, data):
+                    return
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+                if done and done(event, data):
+                    return
+        finally:
+            event_broker.unsubscribe(key, queue)
+
+    def sse_response(stream) -> StreamingResponse:
+        return StreamingResponse(stream, media_type="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop reverse proxies from buffering the stream
+        })
+
+    @app.get("/api/job/{job_id}/events")
+    async def job_events(job_id: str, request: Request):
+        """Stream job progress as server-sent events until the job finishes"""
+        if get_job_store().get_job(job_id) is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return generation_jobs[job_id]
+        def snapshot():
+            job = get_job_store().get_job(job_id)
+            return [("job", job)] if job else [("deleted", {"job_id": job_id})]
+        
+        def finished(event: str, data: Any) -> bool:
+            return event == "deleted" or data["status"] in TERMINAL_STATUSES
+        
+        return sse_response(event_stream(request, ("job", job_id), snapshot, finished))
+
+    @app.get("/api/script/{token}/events")
+    async def script_events(token: str, request: Request):
+        """Stream a script and the progress of jobs started from it as server-sent events
+        
+        Sends the script as soon as it is generated (or script_failed if it
+        could not be) and again after every edit, plus every update of the
+        token's jobs. The stream stays open until the client disconnects.
+        """
+        def snapshot():
+            store = get_job_store()
+            record = store.get_script_status(token)
+            events = []
+            if record and record["status"] == "ready":
+                events.append(("script", record["script"]))
+            elif record and record["status"] == "failed":
+                events.append(("script_failed", {"token": token, "error": record["error"]}))
+            events.extend(("job", job) for job in reversed(store.list_jobs(10, token=token)))
+            return events
+        
+        return sse_response(event_stream(request, ("script", token), snapshot))
 
     @app.get("/api/jobs")
-    async def list_jobs(limit: int = 50):
-        """List recent jobs"""
-        jobs = list(generation_jobs.values())
-        jobs.sort(key=lambda x: x["created_at"], reverse=True)
+    async def list_jobs(limit: int = 50, status: Optional[str] = None):
+        """List recent jobs, optionally filtered by status"""
+        store = get_job_store()
         return {
-            "jobs": jobs[:limit],
-            "total": len(generation_jobs)
+            "jobs": store.list_jobs(limit, status=status),
+            "total": store.count_jobs(status),
+            "workers": get_job_pool().get_stats()
         }
 
     @app.delete("/api/job/{job_id}")
     async def delete_job(job_id: str):
         """Delete a job record"""
-        if job_id not in generation_jobs:
+        # A queued job is dropped rather than run for a record that no longer exists
+        get_job_pool().cancel(job_id)
+        if not get_job_store().delete_job(job_id):
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        del generation_jobs[job_id]
+        event_broker.publish(("job", job_id), "deleted", {"job_id": job_id})
         return {"message": "Job deleted successfully"}
 
     @app.post("/api/validate_config")
@@ -453,6 +555,7 @@ Examples:
   %(prog)s "machine learning basics" --quality high --tts-provider dia
   %(prog)s "quantum computing" --custom-layout --no-batch
   %(prog)s "calculus introduction" --output-dir ./my_videos
+  %(prog)s --script archives/<run>/llm_outputs/script_generation.json
   
   # API Mode
   %(prog)s api                    # Start API server on localhost:8000
@@ -489,6 +592,11 @@ Examples:
         "--tts-model",
         help="TTS model to use (provider-specific)"
     )
+    tts_group.add_argument(
+        "--no-tts-cache",
+        action="store_true",
+        help="Always call the TTS service instead of reusing cached narration"
+    )
     
     # Parallel Processing Configuration
     parallel_group = parser.add_argument_group("Parallel Processing Options")
@@ -520,6 +628,22 @@ Examples:
         default=2,
         help="Maximum number of render workers for parallel processing (default: 2)"
     )
+    parallel_group.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Process each scene as its own TTS -> code generation -> render -> mux pipeline"
+    )
+    parallel_group.add_argument(
+        "--max-codegen-workers",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent Manim code generation requests in pipeline mode (default: 4)"
+    )
+    parallel_group.add_argument(
+        "--no-script-streaming",
+        action="store_true",
+        help="In pipeline mode, wait for the whole script instead of starting scenes as they stream in"
+    )
     
     # Video Quality Configuration
     video_group = parser.add_argument_group("Video Quality Options")
@@ -535,6 +659,34 @@ Examples:
         default="mp4",
         help="Output format (default: mp4)"
     )
+    video_group.add_argument(
+        "--render-backend",
+        choices=["subprocess", "pool"],
+        default=RENDER_BACKEND,
+        help=f"Run each render through the manim CLI or a pool of warm worker processes (default: {RENDER_BACKEND})"
+    )
+    video_group.add_argument(
+        "--assembly",
+        choices=["single_pass", "per_scene"],
+        default=ASSEMBLY_MODE,
+        help=f"Build the final video in one ffmpeg encode or mux each scene before concatenating (default: {ASSEMBLY_MODE})"
+    )
+    video_group.add_argument(
+        "--no-render-cache",
+        action="store_true",
+        help="Always re-render scenes instead of reusing cached clips"
+    )
+    video_group.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="Skip the fast dry-run that catches scene errors before the full-quality render"
+    )
+    video_group.add_argument(
+        "--correction-candidates",
+        type=int,
+        default=CORRECTION_CANDIDATES,
+        help=f"Corrections to request and render in parallel when a scene fails; the first that renders wins (default: {CORRECTION_CANDIDATES})"
+    )
     
     # Generation Options
     gen_group = parser.add_argument_group("Generation Options")
@@ -554,11 +706,32 @@ Examples:
         default=6000,
         help="Token budget for thinking mode (default: 6000)"
     )
+    gen_group.add_argument(
+        "--no-model-cascade",
+        action="store_true",
+        help="Generate all Manim code with MANIM_MODEL instead of trying the fast model first"
+    )
+    gen_group.add_argument(
+        "--fast-model",
+        default=MANIM_FAST_MODEL,
+        help=f"Fast model tried first for Manim code (default: {MANIM_FAST_MODEL})"
+    )
     gen_group.add_argument(
         "--custom-layout",
         action="store_true",
         help="Use custom layout generation instead of templates"
     )
+    gen_group.add_argument(
+        "--script",
+        type=Path,
+        help="Generate from an existing script JSON (e.g. an archived script_generation.json) "
+             "instead of generating a new one; the topic defaults to its title"
+    )
+    gen_group.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses and request fresh ones (results are still cached)"
+    )
     
     # Output Options
     output_group = parser.add_argument_group("Output Options")
@@ -622,19 +795,30 @@ def create_configs_from_args(args: argparse.Namespace) -> tuple:
         voice=args.voice,
         model=args.tts_model
     )
+    if args.no_tts_cache:
+        tts_config.use_cache = False
     
     # Manim Configuration
     manim_config = ManimConfig(
         use_thinking=not args.no_thinking,
         thinking_budget=args.thinking_budget,
-        use_batch=not args.no_batch
+        use_batch=not args.no_batch,
+        cascade=not args.no_model_cascade,
+        fast_model=args.fast_model
     )
     
     # Render Configuration
     render_config = RenderConfig(
         quality=QualityPreset(args.quality),
-        output_format=args.format
+        output_format=args.format,
+        render_backend=args.render_backend,
+        assembly_mode=args.assembly,
+        correction_candidates=args.correction_candidates
     )
+    if args.no_render_cache:
+        render_config.use_cache = False
+    if args.no_preflight:
+        render_config.preflight = False
     
     return tts_config, manim_config, render_config
 
@@ -706,7 +890,7 @@ def main():
     
     # Determine the topic for CLI mode
     topic = args.topic_or_mode or args.topic
-    if not topic:
+    if not topic and not args.script:
         print("Error: Topic is required for CLI mode. Use --help for usage information.")
         return 1
     
@@ -736,11 +920,13 @@ def run_api_server():
     logger.info("Starting AI Video Generator API server...")
     logger.info("API documentation available at: http://localhost:8001/docs")
     logger.info("API endpoints:")
-    logger.info("  - POST /api/generate_scripts - Generate script variations")
+    logger.info("  - POST /api/generate_scripts - Start generating script variations")
     logger.info("  - GET /api/script/{token} - Get script by token")
     logger.info("  - POST /api/script/{token} - Update script")
     logger.info("  - POST /api/generate/{token} - Start video generation")
     logger.info("  - GET /api/job/{job_id} - Check generation status")
+    logger.info("  - GET /api/job/{job_id}/events - Stream job progress (server-sent events)")
+    logger.info("  - GET /api/script/{token}/events - Stream script and job updates (server-sent events)")
     logger.info("  - GET /api/jobs - List all jobs")
     
     try:
@@ -795,6 +981,16 @@ def run_cli(args):
         logger.error(f"Invalid configuration: {e}")
         return 1
     
+    # Load an existing script, if given
+    script = None
+    if args.script:
+        try:
+            script = VideoScript(**load_json(args.script))
+        except Exception as e:
+            logger.error(f"Invalid script file {args.script}: {e}")
+            return 1
+        args.topic = args.topic or script.title
+    
     # Create and run video engine
     try:
         logger.info(f"Starting video generation for topic: {args.topic}")
@@ -812,10 +1008,18 @@ def run_cli(args):
             render_config=render_config,
             enable_parallel=enable_parallel,
             max_tts_workers=args.max_tts_workers,
-            max_render_workers=args.max_render_workers
+            max_render_workers=args.max_render_workers,
+            pipeline_mode=args.pipeline,
+            max_codegen_workers=args.max_codegen_workers,
+            stream_script=not args.no_script_streaming,
+            bypass_llm_cache=args.no_llm_cache
         )
         
-        success, summary = engine.generate_video(args.topic)
+        if script is not None:
+            logger.info(f"Using script from {args.script} ({len(script.scenes)} scenes)")
+            success, summary = engine.generate_video_from_script(script, args.topic)
+        else:
+            success, summary = engine.generate_video(args.topic)
         
         if success:
             logger.info("🎉 Video generation completed successfully!")
@@ -2,11 +2,14 @@
 Main video generation engine with parallel processing optimizations
 """
 
+import functools
+import shutil
 import subprocess
 import time
 import asyncio
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Callable, Dict, Any, List, Tuple, Optional, Iterable, Iterator, Set
 import sys
 import concurrent.futures
 
@@ -15,19 +18,31 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.core.models import (
     VideoScript, Scene, ProcessingSummary, RenderConfig, 
-    TTSConfig, ManimConfig, ArchiveMetadata
+    TTSConfig, ManimConfig, ArchiveMetadata, GenerationStats
 )
 # Avoid circular imports by importing providers lazily inside functions
 # from src.providers.llm import create_llm_provider, BatchManimLLM
 # from src.providers.tts import create_tts_provider
 
-from src.utils.video import combine_audio_video, concatenate_videos, get_audio_duration
+from src.utils.video import (
+    combine_audio_video, concatenate_videos, assemble_final_video, get_audio_duration, get_media_duration
+)
 from src.utils.file_ops import (
     ensure_directory, create_timestamped_dir, save_json, 
     copy_file_safe, clean_filename
 )
 from src.utils.logging import setup_logging, ProcessLogger, StatsLogger
-from src.utils.parallel import ParallelProcessor, ParallelConfig, TTSParallelProcessor, ManimParallelProcessor
+from src.utils.cache import get_render_cache, render_cache_key
+from src.utils.render_pool import RenderError, get_render_pool
+from src.utils.probe import probe_media_batch
+from src.utils.scene_validator import validate_scene_source, format_issues
+from src.utils.preflight import preflight_scene
+from src.utils.code_fixers import FixResult, MAX_RULE_FIXES, apply_fixes, record_fix_outcome
+from src.utils.model_router import ModelRouter, ModelTier, update_model_stats
+from src.utils.parallel import (
+    ParallelProcessor, ParallelConfig, TTSParallelProcessor, ManimParallelProcessor, StagedPipeline,
+    first_success, render_slot
+)
 import sys
 from pathlib import Path
 # Add project root to path for config import
@@ -35,14 +50,46 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.settings import (
     PROJECT_ROOT, RENDERS_DIR, ARCHIVES_DIR, TMP_DIR, 
-    DEFAULT_QUALITY, QUALITY_PRESETS, SCRIPT_MODEL, MANIM_MODEL, FINAL_PADDING
+    DEFAULT_QUALITY, QUALITY_PRESETS, SCRIPT_MODEL, MANIM_MODEL, FINAL_PADDING,
+    LLM_CACHE_ENABLED, STATIC_VALIDATION_ENABLED, PREFLIGHT_TIMEOUT, SCRIPT_STREAMING_ENABLED
 )
-from src.providers.llm import get_max_output_tokens
+from src.providers.llm import get_max_output_tokens, generate_text, response_cache_key
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Speculative corrections: candidate i uses variant i (cycling, slightly hotter each cycle)
+CORRECTION_VARIANTS = [
+    (0.1, ""),
+    (0.5, "Make the smallest change that fixes the error and keep everything else exactly as it is."),
+    (0.8, "If the failing part is fragile, replace it with a simpler animation that conveys the same idea."),
+]
+
+
+# Overall progress (percent) when each generation stage starts; finished scenes
+# fill the span from "Processing scenes" to "Creating final video"
+STAGE_PROGRESS = {
+    "Generating script": 0,
+    "Using provided script": 0,
+    "Setting up archive": 5,
+    "Streaming script": 5,
+    "Processing scenes": 10,
+    "Creating final video": 85,
+    "Archiving results": 95,
+    "Cleanup": 98,
+}
+
+
+class CandidateFailed(Exception):
+    """A speculative correction that did not render, with the code and error it produced"""
+
+    def __init__(self, error: str, code: Optional[str] = None, cache_key: Optional[str] = None):
+        super().__init__(error)
+        self.error = error
+        self.code = code
+        self.cache_key = cache_key
+
 
 class VideoGenerationEngine:
     """Main engine for video generation pipeline with parallel processing"""
@@ -53,10 +100,18 @@ class VideoGenerationEngine:
                  render_config: RenderConfig = None,
                  enable_parallel: bool = True,
                  max_tts_workers: int = 4,
-                 max_render_workers: int = 2):
+                 max_render_workers: int = 2,
+                 pipeline_mode: bool = False,
+                 max_codegen_workers: int = 4,
+                 bypass_llm_cache: bool = False,
+                 stream_script: bool = SCRIPT_STREAMING_ENABLED,
+                 render_slots=None,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 run_id: Optional[str] = None):
         
         # Import providers inside __init__ to avoid circular imports
         from src.providers.llm import create_llm_provider, BatchManimLLM
+        from src.utils.cache import get_llm_cache
         from src.providers.tts import create_tts_provider
         
         self.tts_config = tts_config or TTSConfig()
@@ -67,19 +122,71 @@ class VideoGenerationEngine:
         self.enable_parallel = enable_parallel
         self.max_tts_workers = max_tts_workers
         self.max_render_workers = max_render_workers
+        self.max_codegen_workers = max_codegen_workers
+        # Semaphore bounding concurrent Manim renders across every job in the server
+        self.render_slots = render_slots
+        # Called with stage transitions and per-scene progress events
+        self.progress_callback = progress_callback
+        # Scripts, narration and scene clips go under per-run directories so
+        # concurrent jobs never overwrite each other's files
+        self.run_id = run_id
+        self.tmp_dir, self.scene_renders_dir = run_directories(run_id)
+        self._scenes_done = 0
+        self._scenes_started = time.time()
+        
+        # Per-scene pipeline instead of stage-wide barriers
+        self.pipeline_mode = pipeline_mode
+        # In pipeline mode, scenes start while the script is still streaming
+        self.stream_script = stream_script
+        self._summary_lock = threading.Lock()
+        
+        # Narration held back for single-pass assembly, keyed by raw scene video
+        self._deferred_audio: Dict[Path, Tuple[int, Path]] = {}
+        
+        # The last scene's muxed clip carries the final padding so concatenation can stream-copy
+        self._final_scene_seq: Optional[int] = None
+        self._padded_clips: Set[Path] = set()
+        
+        # LLM responses are memoized unless caching is disabled; bypass still refreshes the cache
+        self.bypass_llm_cache = bypass_llm_cache
+        self.llm_cache = get_llm_cache() if LLM_CACHE_ENABLED else None
         
         # Initialize providers
-        self.llm_provider = create_llm_provider("gemini", model=SCRIPT_MODEL)
+        self.llm_provider = create_llm_provider(
+            "gemini",
+            model=SCRIPT_MODEL,
+            response_cache=self.llm_cache,
+            bypass_cache=self.bypass_llm_cache
+        )
         self.tts_provider = create_tts_provider(
             self.tts_config.provider.value,
             **self.tts_config.get_provider_config()
         )
         
+        # Code generation starts on a fast model and escalates to MANIM_MODEL on failed checks
+        self.manim_router = ModelRouter.from_settings(
+            MANIM_MODEL,
+            thinking_budget=self.manim_config.thinking_budget if self.manim_config.use_thinking else 0,
+            cascade=self.manim_config.cascade,
+            fast_model=self.manim_config.fast_model,
+            fast_thinking_budget=self.manim_config.fast_thinking_budget
+        )
+        # Model that wrote each scene's current code, so check outcomes can be credited to it
+        self._scene_models: Dict[int, str] = {}
+        # LLM cache entry each scene's generated code came from, dropped if the code fails a check
+        self._scene_cache_keys: Dict[int, str] = {}
+        
         # Setup batch processing if enabled
         self.batch_manim = None
         if self.manim_config.use_batch:
             try:
-                self.batch_manim = BatchManimLLM(model=MANIM_MODEL)
+                self.batch_manim = BatchManimLLM(
+                    model=MANIM_MODEL,
+                    response_cache=self.llm_cache,
+                    bypass_cache=self.bypass_llm_cache,
+                    max_concurrency=self.max_codegen_workers,
+                    router=self.manim_router
+                )
             except ValueError as e:
                 if "Google GenAI package not available" in str(e):
                     logger.warning("Google GenAI not available, disabling batch Manim processing")
@@ -90,7 +197,11 @@ class VideoGenerationEngine:
         # Initialize parallel processors
         if self.enable_parallel:
             self.tts_parallel = TTSParallelProcessor(self.tts_provider, max_workers=self.max_tts_workers)
-            self.manim_parallel = ManimParallelProcessor(max_workers=self.max_render_workers)
+            self.manim_parallel = ManimParallelProcessor(
+                max_workers=self.max_render_workers,
+                render_backend=self.render_config.render_backend,
+                render_slots=self.render_slots
+            )
         else:
             self.tts_parallel = None
             self.manim_parallel = None
@@ -103,44 +214,89 @@ class VideoGenerationEngine:
         ensure_directory(RENDERS_DIR)
         ensure_directory(ARCHIVES_DIR)
         ensure_directory(TMP_DIR)
+        ensure_directory(self.tmp_dir)
         
         logger.info(f"VideoGenerationEngine initialized with parallel processing: {self.enable_parallel}")
         if self.enable_parallel:
             logger.info(f"TTS workers: {self.max_tts_workers}, Render workers: {self.max_render_workers}")
+        if self.pipeline_mode:
+            logger.info(f"Per-scene pipeline enabled (code generation workers: {self.max_codegen_workers})")
     
     def generate_video(self, topic: str) -> Tuple[bool, ProcessingSummary]:
         """Generate complete video from topic"""
+        return self._generate(topic)
+    
+    def generate_video_from_script(self, script: VideoScript,
+                                   topic: Optional[str] = None) -> Tuple[bool, ProcessingSummary]:
+        """Generate a video from an existing (e.g. user-edited) script without calling the script LLM"""
+        return self._generate(topic or script.title, script)
+    
+    def _generate(self, topic: str, script: Optional[VideoScript] = None) -> Tuple[bool, ProcessingSummary]:
+        """Run the generation stages, generating the script first unless one is given"""
         self.process_logger.start_process(f"Video Generation: {topic}", 6)
         
         # Initialize summary
         summary = ProcessingSummary(topic=topic)
         self.stats_logger.record("topic", topic)
+        self._deferred_audio = {}
+        self._padded_clips = set()
+        self._final_scene_seq = None
+        self._scene_models = {}
+        self._scene_cache_keys = {}
+        self._scenes_done = 0
+        self._scenes_started = time.time()
         
         try:
-            # Step 1: Generate script
-            self.process_logger.step("Generating script")
-            script = self._generate_script(topic, summary)
-            summary.total_scenes = len(script.scenes)
-            
-            # Step 2: Create archive directory
-            self.process_logger.step("Setting up archive")
-            archive_dir = self._setup_archive(topic)
-            self._save_script(script, archive_dir)
-            
-            # Step 3: Process scenes
-            self.process_logger.step("Processing scenes")
-            scene_videos = self._process_scenes(script, archive_dir, summary)
+            if script is None and self.pipeline_mode and self.stream_script:
+                # Steps 1-3 overlap: each scene enters the pipeline as soon as it is streamed
+                self._step("Setting up archive")
+                archive_dir = self._setup_archive(topic)
+                
+                self._step("Streaming script")
+                self._step("Processing scenes")
+                tts_cache_before = self._get_tts_cache_stats()
+                script_stream = self.llm_provider.stream_script(topic)
+                scene_videos = self._process_scenes_pipelined(
+                    self._stream_script_scenes(script_stream, summary), archive_dir, summary
+                )
+                self._record_tts_cache_stats(tts_cache_before, summary)
+                self._save_script(script_stream.script, archive_dir)
+            else:
+                # Step 1: Generate script
+                if script is None:
+                    self._step("Generating script")
+                    script = self._generate_script(topic, summary)
+                else:
+                    self._step("Using provided script")
+                    summary.script_llm = {"success": True, "provided": True}
+                    self.stats_logger.record("script_scenes", len(script.scenes))
+                summary.total_scenes = len(script.scenes)
+                self._final_scene_seq = script.scenes[-1].seq if script.scenes else None
+                
+                # Step 2: Create archive directory
+                self._step("Setting up archive")
+                archive_dir = self._setup_archive(topic)
+                self._save_script(script, archive_dir)
+                
+                # Step 3: Process scenes
+                self._step("Processing scenes")
+                tts_cache_before = self._get_tts_cache_stats()
+                scene_videos = self._process_scenes(script, archive_dir, summary)
+                self._record_tts_cache_stats(tts_cache_before, summary)
+            self._report_fixer_stats(summary)
+            self._report_model_stats(summary)
             
             # Step 4: Generate final video
-            self.process_logger.step("Creating final video")
-            final_video = self._create_final_video(scene_videos, topic, archive_dir)
+            self._step("Creating final video")
+            final_video = self._create_final_video(scene_videos, topic, archive_dir, summary)
+            summary.final_video = str(final_video) if final_video else None
             
             # Step 5: Archive results
-            self.process_logger.step("Archiving results")
+            self._step("Archiving results")
             self._archive_results(archive_dir, final_video, summary)
             
             # Step 6: Cleanup
-            self.process_logger.step("Cleanup")
+            self._step("Cleanup")
             self._cleanup_temporary_files()
             
             # Report completion
@@ -153,18 +309,92 @@ class VideoGenerationEngine:
             self.process_logger.error("Video generation failed", str(e))
             logger.error(f"Video generation failed: {e}")
             return False, summary
+        finally:
+            self._remove_run_directories()
+    
+    def _step(self, stage: str):
+        """Start a generation stage and report it to progress_callback"""
+        self.process_logger.step(stage)
+        if stage == "Processing scenes":
+            self._scenes_started = time.time()
+        self._emit_progress(stage=stage, progress=STAGE_PROGRESS[stage])
+    
+    def _scene_done(self, summary: ProcessingSummary, seq: int, success: bool):
+        """Count a scene's render outcome and report progress with an ETA for the rest"""
+        with self._summary_lock:
+            stat = "success" if success else "failed"
+            setattr(summary.render_stats, stat, getattr(summary.render_stats, stat) + 1)
+            self._scenes_done += 1
+            done = self._scenes_done
+        # While the script streams, total_scenes only counts the scenes seen so far
+        total = max(summary.total_scenes, done)
+        elapsed = time.time() - self._scenes_started
+        start, end = STAGE_PROGRESS["Processing scenes"], STAGE_PROGRESS["Creating final video"]
+        self._emit_progress(
+            stage="Processing scenes",
+            progress=round(start + (end - start) * done / total, 1),
+            scene=seq,
+            scene_success=success,
+            scenes_done=done,
+            total_scenes=total,
+            eta_seconds=round(elapsed / done * (total - done), 1)
+        )
+    
+    def _emit_progress(self, **event):
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(event)
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+    
+    def _report_fixer_stats(self, summary: ProcessingSummary):
+        """Log how often each fix rule fired and how often that cleared the error"""
+        for rule, counts in sorted(summary.fixer_stats.items()):
+            logger.info(f"Fix rule {rule}: fired {counts['fired']}x, resolved {counts['resolved']}, "
+                        f"unresolved {counts['unresolved']}")
+            self.stats_logger.record(f"fix_rule_{rule}", counts)
+    
+    def _report_model_stats(self, summary: ProcessingSummary):
+        """Log success rate and latency of each code generation model"""
+        for model, counts in sorted(summary.manim_stats.per_model.items()):
+            rate = "n/a" if counts["success_rate"] is None else f"{counts['success_rate']:.0%}"
+            latency = "n/a" if counts["avg_latency"] is None else f"{counts['avg_latency']:.1f}s"
+            logger.info(f"Model {model}: {counts['requests']} request(s), success rate {rate}, "
+                        f"avg latency {latency}")
+            self.stats_logger.record(f"manim_model_{model}", counts)
     
     def _generate_script(self, topic: str, summary: ProcessingSummary) -> VideoScript:
         """Generate video script"""
         try:
             script = self.llm_provider.generate_script(topic)
-            summary.script_llm = {"success": True}
+            summary.script_llm = {"success": True, **getattr(self.llm_provider, "script_report", {})}
             self.stats_logger.record("script_scenes", len(script.scenes))
             return script
         except Exception as e:
             summary.script_llm = {"success": False, "error": str(e)}
             raise
     
+    def _stream_script_scenes(self, script_stream, summary: ProcessingSummary) -> Iterator[Scene]:
+        """Pass streamed scenes through, recording the script once the stream completes"""
+        started = time.time()
+        try:
+            for scene in script_stream:
+                if not summary.total_scenes:
+                    logger.info(f"First scene streamed after {time.time() - started:.1f}s")
+                summary.total_scenes += 1
+                yield scene
+        except Exception as e:
+            summary.script_llm = {"success": False, "error": str(e)}
+            raise
+        
+        script = script_stream.script
+        summary.total_scenes = len(script.scenes)
+        summary.script_llm = {"success": True, "streamed": True, **script_stream.report}
+        self.stats_logger.record("script_scenes", len(script.scenes))
+        self._final_scene_seq = script.scenes[-1].seq if script.scenes else None
+        logger.info(f"Script stream completed after {time.time() - started:.1f}s")
+    
     def _setup_archive(self, topic: str) -> Path:
         """Setup archive directory"""
         clean_topic = clean_filename(topic.replace(" ", "_"))
@@ -184,6 +414,10 @@ class VideoGenerationEngine:
     def _process_scenes(self, script: VideoScript, archive_dir: Path, 
                        summary: ProcessingSummary) -> List[Path]:
         """Process all scenes in the script"""
+        if self.pipeline_mode:
+            logger.info("Using per-scene pipeline for TTS, code generation, rendering and muxing")
+            return self._process_scenes_pipelined(script.scenes, archive_dir, summary)
+        
         scene_videos = []
         
         # Setup batch processing
@@ -200,7 +434,7 @@ class VideoGenerationEngine:
             # Add to batches
             tts_requests.append({
                 "scene": scene,
-                "audio_file": TMP_DIR / f"scene_{scene.seq}_audio.wav"
+                "audio_file": self.tmp_dir / f"scene_{scene.seq}_audio.wav"
             })
             
             if self.batch_manim:
@@ -230,6 +464,207 @@ class VideoGenerationEngine:
         
         return scene_videos
     
+    def _process_scenes_pipelined(self, scenes: Iterable[Scene], archive_dir: Path,
+                                  summary: ProcessingSummary) -> List[Path]:
+        """Move each scene through TTS -> code generation -> render -> mux as soon as its own inputs are ready"""
+        stage_workers = {
+            "tts": self.max_tts_workers,
+            "codegen": self.max_codegen_workers,
+            "render": self.max_render_workers,
+            "mux": self.max_render_workers
+        }
+        logger.info(f"Starting per-scene pipeline with stage workers: {stage_workers}")
+        
+        results: Dict[int, Optional[Path]] = {}
+        
+        with StagedPipeline(stage_workers) as pipeline:
+            drivers = {}
+            for scene in scenes:
+                drivers[scene.seq] = pipeline.drive(
+                    self._drive_scene_pipeline, pipeline, scene, archive_dir, summary
+                )
+            
+            for seq, driver in drivers.items():
+                try:
+                    results[seq] = driver.result()
+                except Exception as e:
+                    logger.error(f"Scene pipeline failed for scene {seq}: {e}")
+                    results[seq] = None
+            
+            stage_stats = pipeline.get_stats()
+        
+        for stage, stats in stage_stats.items():
+            self.stats_logger.record(f"pipeline_{stage}_max_time", stats["max_time"])
+        
+        scene_videos = [results[seq] for seq in sorted(results) if results[seq]]
+        logger.info(f"Per-scene pipeline completed: {len(scene_videos)}/{len(results)} successful")
+        return scene_videos
+    
+    def _drive_scene_pipeline(self, pipeline: StagedPipeline, scene: Scene, archive_dir: Path,
+                              summary: ProcessingSummary) -> Optional[Path]:
+        """Chain the stages for a single scene"""
+        # TTS and code generation only depend on the script, so both start immediately
+        audio_future = pipeline.submit("tts", self._synthesize_scene_audio, scene, archive_dir, summary)
+        code_future = pipeline.submit("codegen", self._generate_scene_code, scene, archive_dir, summary)
+        
+        scene_code, class_name = code_future.result()
+        
+        # Narration is usually ready before the code; its length decides how much Manim renders
+        audio_file = audio_future.result()
+        scene_code = self._apply_audio_timing(scene_code, class_name, audio_file)
+        render_future = pipeline.submit(
+            "render", self._save_and_render_manim,
+            scene_code, class_name, scene.seq, scene.dict(), summary
+        )
+        
+        try:
+            video_path = render_future.result()
+        except Exception as e:
+            logger.error(f"Scene rendering failed for scene {scene.seq}: {e}")
+            self._scene_done(summary, scene.seq, False)
+            return None
+        self._scene_done(summary, scene.seq, True)
+        
+        if not audio_file:
+            logger.info(f"No audio file for scene {scene.seq}, using video only")
+            return video_path
+        
+        return pipeline.submit("mux", self._mux_scene_audio, scene, video_path, audio_file, summary).result()
+    
+    def _get_tts_cache_stats(self) -> Dict[str, int]:
+        """Get TTS cache counters, if the provider is cached"""
+        if hasattr(self.tts_provider, "get_cache_stats"):
+            return self.tts_provider.get_cache_stats()
+        return {"hits": 0, "misses": 0}
+    
+    def _record_tts_cache_stats(self, before: Dict[str, int], summary: ProcessingSummary):
+        """Record TTS cache hits and misses since the given snapshot"""
+        after = self._get_tts_cache_stats()
+        summary.tts_stats.cache_hits = after["hits"] - before["hits"]
+        summary.tts_stats.cache_misses = after["misses"] - before["misses"]
+        if summary.tts_stats.cache_hits or summary.tts_stats.cache_misses:
+            logger.info(f"TTS cache: {summary.tts_stats.cache_hits} hits, {summary.tts_stats.cache_misses} misses")
+            self.stats_logger.record("tts_cache_hits", summary.tts_stats.cache_hits)
+    
+    def _synthesize_scene_audio(self, scene: Scene, archive_dir: Path,
+                                summary: ProcessingSummary) -> Optional[Path]:
+        """Synthesize and archive narration audio for one scene"""
+        audio_file = self.tmp_dir / f"scene_{scene.seq}_audio.wav"
+        
+        try:
+            success = self.tts_provider.synthesize(scene.text, audio_file)
+        except Exception as e:
+            logger.error(f"TTS failed for scene {scene.seq}: {e}")
+            success = False
+        
+        if not success:
+            self._record_stat(summary.tts_stats, "failed")
+            return None
+        
+        self._record_stat(summary.tts_stats, "success")
+        archive_audio = archive_dir / "audio_files" / f"scene_{scene.seq}_audio.wav"
+        copy_file_safe(audio_file, archive_audio)
+        return audio_file
+    
+    def _generate_scene_code(self, scene: Scene, archive_dir: Path,
+                             summary: ProcessingSummary) -> Tuple[str, str]:
+        """Generate and archive Manim code for one scene"""
+        request_id = f"scene_{scene.seq}"
+        
+        if self.batch_manim:
+            result = self._track_scene_model(
+                scene.seq, self.batch_manim.generate_single(scene.dict(), scene.layout.value, request_id), summary
+            )
+            if result.success:
+                full_code, class_name = self._create_full_scene_code(scene, result.content)
+                self._record_stat(summary.manim_stats, "success")
+            else:
+                full_code, class_name = self._generate_fallback_scene(scene)
+                self._record_stat(summary.manim_stats, "fallback")
+        else:
+            try:
+                full_code, class_name = self.llm_provider.generate_manim_code(
+                    scene.dict(), scene.layout.value
+                )
+                self._record_stat(summary.manim_stats, "success")
+            except Exception as e:
+                logger.error(f"Manim generation failed for scene {scene.seq}: {e}")
+                full_code, class_name = self._generate_fallback_scene(scene)
+                self._record_stat(summary.manim_stats, "fallback")
+        
+        code_file = archive_dir / "scene_codes" / f"{request_id}_code.py"
+        code_file.write_text(full_code, encoding="utf-8")
+        
+        return full_code, class_name
+    
+    def _mux_scene_audio(self, scene: Scene, video_path: Path, audio_file: Path,
+                         summary: ProcessingSummary) -> Path:
+        """Combine a rendered scene with its narration, or defer it to single-pass assembly"""
+        if self.render_config.assembly_mode == "single_pass":
+            with self._summary_lock:
+                self._deferred_audio[video_path] = (scene.seq, audio_file)
+            return video_path
+        
+        return self._combine_scene_audio(scene.seq, video_path, audio_file, summary)
+    
+    def _combine_scene_audio(self, scene_seq: int, video_path: Path, audio_file: Path,
+                             summary: ProcessingSummary) -> Path:
+        """Mux one scene with its narration, falling back to the silent clip"""
+        final_video = self.scene_renders_dir / f"scene_{scene_seq}" / f"scene_{scene_seq}_final.mp4"
+        ensure_directory(final_video.parent)
+        padding = FINAL_PADDING if scene_seq == self._final_scene_seq else 0.0
+        
+        if combine_audio_video(video_path, audio_file, final_video, padding_duration=padding):
+            self._record_stat(summary.audio_mux_stats, "success")
+            if padding:
+                with self._summary_lock:
+                    self._padded_clips.add(final_video)
+            return final_video
+        
+        self._record_stat(summary.audio_mux_stats, "failed")
+        logger.warning(f"Audio-video combination failed for scene {scene_seq}, using video only")
+        return video_path
+    
+    def _track_scene_model(self, scene_seq: int, result, summary: ProcessingSummary):
+        """Record which model generated a scene and how long it took; returns result"""
+        with self._summary_lock:
+            if result.success and result.model:
+                self._scene_models[scene_seq] = result.model
+            else:
+                self._scene_models.pop(scene_seq, None)
+            if result.success and result.cache_key:
+                self._scene_cache_keys[scene_seq] = result.cache_key
+            else:
+                self._scene_cache_keys.pop(scene_seq, None)
+            if result.model:
+                update_model_stats(summary.manim_stats.per_model, result.model, latency=result.latency)
+        return result
+    
+    def _record_model_outcome(self, model: Optional[str], success: bool,
+                              summary: ProcessingSummary = None):
+        """Credit a passed or failed check to the model that wrote the code"""
+        if model is None:
+            return
+        self.manim_router.record_outcome(model, success)
+        if summary:
+            with self._summary_lock:
+                update_model_stats(summary.manim_stats.per_model, model, success=success)
+    
+    def _discard_cached_code(self, cache_key: Optional[str]):
+        """Drop the cached LLM response behind code that failed a check
+        
+        Otherwise the next run of the topic would replay the same broken code
+        and the same failed corrections.
+        """
+        if cache_key and self.llm_cache is not None:
+            logger.info(f"Dropping cached LLM response {cache_key[:12]} for code that failed a check")
+            self.llm_cache.discard(cache_key)
+    
+    def _record_stat(self, stats: GenerationStats, field: str, amount: int = 1):
+        """Increment a summary counter; pipeline stages update the summary concurrently"""
+        with self._summary_lock:
+            setattr(stats, field, getattr(stats, field) + amount)
+    
     def _render_scenes_parallel(self, scenes: List[Scene], scene_codes: Dict[str, Tuple[str, str]], 
                                audio_files: Dict[int, Path], archive_dir: Path, 
                                summary: ProcessingSummary) -> List[Path]:
@@ -253,6 +688,7 @@ class VideoGenerationEngine:
             
             if scene_code_data:
                 scene_code, class_name = scene_code_data
+                scene_code = self._apply_audio_timing(scene_code, class_name, audio_file)
                 logger.info(f"Scene {scene.seq}: class_name = {class_name}")
                 
                 render_task = {
@@ -271,61 +707,63 @@ class VideoGenerationEngine:
         logger.info(f"Created {len(render_tasks)} render tasks out of {len(scenes)} scenes")
         
         if render_tasks:
+            videos: Dict[int, Path] = {}
+            reported: Set[int] = set()
+            
+            def scene_rendered(task: Dict[str, Any], scene_video: Optional[Path]):
+                # Called as each render finishes, so progress is reported per scene
+                scene = task["scene"]
+                audio_file = task["audio_file"]
+                reported.add(scene.seq)
+                
+                if scene_video is None:
+                    logger.error(f"Parallel rendering failed for scene {scene.seq}")
+                    self._scene_done(summary, scene.seq, False)
+                    return
+                logger.info(f"✓ Render successful for {task['task_id']}: {scene_video}")
+                
+                # Combine with audio if available
+                if audio_file and audio_file.exists():
+                    videos[scene.seq] = self._mux_scene_audio(scene, scene_video, audio_file, summary)
+                else:
+                    videos[scene.seq] = scene_video
+                    if audio_file:
+                        logger.warning(f"Audio file not found for scene {scene.seq}: {audio_file}")
+                    else:
+                        logger.info(f"No audio file for scene {scene.seq}")
+                self._scene_done(summary, scene.seq, True)
+            
             # Use parallel Manim processor
             logger.info(f"Starting parallel rendering of {len(render_tasks)} tasks")
             try:
-                results = self.manim_parallel.render_scenes_batch(render_tasks)
+                results = self.manim_parallel.render_scenes_batch(
+                    render_tasks, on_scene_done=scene_rendered,
+                    render_scene=functools.partial(self._render_task, summary=summary)
+                )
                 logger.info(f"Parallel rendering completed with {len(results)} successful results")
             except Exception as e:
                 logger.error(f"Parallel rendering batch failed: {type(e).__name__}: {e}")
                 import traceback
                 logger.error(f"Full traceback: {traceback.format_exc()}")
-                results = {}
             
-            # Process results and combine with audio
+            # Keep scene order; scenes the batch never reported count as failed
             for task in render_tasks:
-                task_id = task["task_id"]
-                scene = task["scene"]
-                audio_file = task["audio_file"]
-                
-                logger.info(f"Processing results for {task_id}")
-                
-                if task_id in results:
-                    scene_video = results[task_id]
-                    logger.info(f"✓ Render successful for {task_id}: {scene_video}")
-                    
-                    # Combine with audio if available
-                    if audio_file and audio_file.exists():
-                        final_video = RENDERS_DIR / "video" / f"scene_{scene.seq}" / f"scene_{scene.seq}_final.mp4"
-                        ensure_directory(final_video.parent)
-                        
-                        logger.info(f"Combining audio and video for scene {scene.seq}")
-                        if combine_audio_video(scene_video, audio_file, final_video):
-                            scene_videos.append(final_video)
-                            summary.render_stats.success += 1
-                            summary.audio_mux_stats.success += 1
-                            logger.info(f"✓ Audio-video combination successful for scene {scene.seq}")
-                        else:
-                            scene_videos.append(scene_video)  # Use video without audio
-                            summary.render_stats.success += 1
-                            summary.audio_mux_stats.failed += 1
-                            logger.warning(f"Audio-video combination failed for scene {scene.seq}, using video only")
-                    else:
-                        scene_videos.append(scene_video)
-                        summary.render_stats.success += 1
-                        if audio_file:
-                            logger.warning(f"Audio file not found for scene {scene.seq}: {audio_file}")
-                        else:
-                            logger.info(f"No audio file for scene {scene.seq}")
-                else:
-                    logger.error(f"Parallel rendering failed for scene {scene.seq}")
-                    logger.error(f"Task ID {task_id} not found in results")
-                    logger.error(f"Available results: {list(results.keys())}")
-                    summary.render_stats.failed += 1
+                seq = task["scene"].seq
+                if seq in videos:
+                    scene_videos.append(videos[seq])
+                elif seq not in reported:
+                    logger.error(f"Parallel rendering never reported scene {seq}")
+                    self._scene_done(summary, seq, False)
         
         logger.info(f"Parallel scene rendering completed: {len(scene_videos)}/{len(scenes)} successful")
         return scene_videos
     
+    def _render_task(self, task: Dict[str, Any], summary: ProcessingSummary) -> Path:
+        """Render a parallel task with the same checks and corrections as the other paths"""
+        scene = task["scene"]
+        return self._save_and_render_manim(task["scene_code"], task["class_name"], scene.seq,
+                                           scene.dict(), summary)
+    
     def _render_scenes_sequential(self, scenes: List[Scene], scene_codes: Dict[str, Tuple[str, str]], 
                                  audio_files: Dict[int, Path], archive_dir: Path, 
                                  summary: ProcessingSummary) -> List[Path]:
@@ -345,13 +783,11 @@ class VideoGenerationEngine:
                 )
                 if scene_video:
                     scene_videos.append(scene_video)
-                    summary.render_stats.success += 1
-                else:
-                    summary.render_stats.failed += 1
+                self._scene_done(summary, scene.seq, bool(scene_video))
                     
             except Exception as e:
                 logger.error(f"Failed to render scene {scene.seq}: {e}")
-                summary.render_stats.failed += 1
+                self._scene_done(summary, scene.seq, False)
         
         return scene_videos
     
@@ -470,29 +906,30 @@ class VideoGenerationEngine:
         scene_codes = {}
         
         if self.batch_manim:
-            # Process batch
-            batch_results = self.batch_manim.process_batch()
+            # Requests run concurrently; handle each response as soon as it arrives
+            scenes_by_id = {req["request_id"]: req["scene"] for req in manim_requests}
             
-            for req in manim_requests:
-                scene = req["scene"]
-                request_id = req["request_id"]
+            for result in self.batch_manim.iter_batch():
+                scene = scenes_by_id.get(result.id)
+                if scene is None:
+                    continue
                 
-                if request_id in batch_results:
-                    result = batch_results[request_id]
-                    
-                    if result.success:
-                        code_content = result.content
-                        full_code, class_name = self._create_full_scene_code(
-                            scene, code_content
-                        )
-                        scene_codes[request_id] = (full_code, class_name)
-                        summary.manim_stats.success += 1
-                    else:
-                        # Use fallback
-                        fallback_code, class_name = self._generate_fallback_scene(scene)
-                        scene_codes[request_id] = (fallback_code, class_name)
-                        summary.manim_stats.fallback += 1
+                self._track_scene_model(scene.seq, result, summary)
+                if result.success:
+                    code_content = result.content
+                    full_code, class_name = self._create_full_scene_code(
+                        scene, code_content
+                    )
+                    scene_codes[result.id] = (full_code, class_name)
+                    summary.manim_stats.success += 1
                 else:
+                    # Use fallback
+                    fallback_code, class_name = self._generate_fallback_scene(scene)
+                    scene_codes[result.id] = (fallback_code, class_name)
+                    summary.manim_stats.fallback += 1
+            
+            for request_id, scene in scenes_by_id.items():
+                if request_id not in scene_codes:
                     # Missing result, use fallback
                     fallback_code, class_name = self._generate_fallback_scene(scene)
                     scene_codes[request_id] = (fallback_code, class_name)
@@ -565,6 +1002,27 @@ Scene{scene.seq}.audio_duration = 5.0
         
         return full_code, f"Scene{scene.seq}"
     
+    def _apply_audio_timing(self, scene_code: str, class_name: str,
+                            audio_file: Optional[Path]) -> str:
+        """Inject the measured narration length so Manim skips rendering the static hold
+        
+        The scene stops once its narration box is shown; muxing then holds that
+        last frame until the audio ends instead of Manim drawing every frame.
+        """
+        if not audio_file or not audio_file.exists():
+            return scene_code
+        
+        audio_duration = get_media_duration(audio_file)
+        if audio_duration is None:
+            return scene_code
+        
+        return scene_code + f"""
+
+# Narration timing measured from the synthesized audio
+{class_name}.audio_duration = {audio_duration:.3f}
+{class_name}.external_hold = True
+"""
+    
     def _indent_code(self, code: str) -> str:
         """Indent code for class method"""
         lines = code.strip().split('\n')
@@ -589,6 +1047,7 @@ Scene{scene.seq}.audio_duration = 5.0
         
         code = f"""import sys
 sys.path.append(r'{PROJECT_ROOT}')
+from manim import *
 from src.templates.layouts import TitleAndMainContent
 
 class Scene{scene.seq}(TitleAndMainContent):
@@ -627,6 +1086,7 @@ Scene{scene.seq}.audio_duration = 5.0"""
             return None
         
         scene_code, class_name = scene_code_data
+        scene_code = self._apply_audio_timing(scene_code, class_name, audio_file)
         
         try:
             # Save and render Manim with scene data for corrections
@@ -636,15 +1096,7 @@ Scene{scene.seq}.audio_duration = 5.0"""
             
             # Combine with audio if available
             if audio_file and audio_file.exists():
-                final_video = RENDERS_DIR / "video" / f"scene_{scene.seq}" / f"scene_{scene.seq}_final.mp4"
-                ensure_directory(final_video.parent)
-                
-                if combine_audio_video(video_path, audio_file, final_video):
-                    summary.audio_mux_stats.success += 1
-                    return final_video
-                else:
-                    summary.audio_mux_stats.failed += 1
-                    return video_path
+                return self._mux_scene_audio(scene, video_path, audio_file, summary)
             else:
                 return video_path
                 
@@ -751,7 +1203,7 @@ Scene{scene.seq}.audio_duration = 5.0"""
                               summary: ProcessingSummary = None,
                               max_correction_attempts: int = 2) -> Path:
         """Save and render Manim scene with error correction"""
-        script_path = TMP_DIR / f"scene_{class_name}.py"
+        script_path = self.tmp_dir / f"scene_{class_name}.py"
         
         # Clean the code first
         scene_code = self._clean_scene_code(scene_code)
@@ -764,9 +1216,38 @@ Scene{scene.seq}.audio_duration = 5.0"""
         
         original_code = scene_code
         
-        for attempt in range(max_correction_attempts + 1):
-            current_code = scene_code if attempt == 0 else scene_code  # Will be updated in correction attempts
+        # Setup output directory
+        output_dir = self.scene_renders_dir / f"scene_{scene_num}"
+        ensure_directory(output_dir)
+        
+        # Build Manim command using RenderConfig's get_manim_args method
+        manim_args = self.render_config.get_manim_args()
+        
+        # Identical code and render settings always produce the same clip
+        render_cache = get_render_cache() if self.render_config.use_cache else None
+        cache_keys = []
+        if render_cache:
+            cache_keys.append(render_cache_key(original_code, manim_args))
+            cached_video = output_dir / f"{class_name}_cached.mp4"
+            if render_cache.fetch(cache_keys[0], cached_video):
+                logger.info(f"✓ Render cache hit for {class_name} ({cache_keys[0][:12]}), skipping Manim")
+                if summary:
+                    self._record_stat(summary.render_stats, "cache_hits")
+                return cached_video
+            if summary:
+                self._record_stat(summary.render_stats, "cache_misses")
+        
+        attempt = 0
+        rule_fixes = 0
+        pending_fix = None
+        failures = 0
+        code_model = self._scene_models.get(scene_num)
+        code_key = self._scene_cache_keys.get(scene_num)
+        while attempt <= max_correction_attempts:
+            current_code = scene_code
             script_path.write_text(current_code, encoding="utf-8")
+            # Code patched by fix rules is not credited to (or blamed on) the model
+            judged_model = code_model if pending_fix is None else None
             
             # Validate syntax
             try:
@@ -774,68 +1255,130 @@ Scene{scene.seq}.audio_duration = 5.0"""
                 logger.info(f"✓ Code syntax is valid for {class_name} (attempt {attempt + 1})")
             except SyntaxError as e:
                 logger.error(f"✗ Syntax error in generated code (attempt {attempt + 1}): {e}")
+                failures += 1
+                self._record_model_outcome(judged_model, False, summary)
+                self._discard_cached_code(code_key)
+                code_key = None
                 if attempt < max_correction_attempts:
                     # Try to correct the syntax error
                     logger.info(f"Attempting syntax error correction...")
                     try:
-                        corrected_code = self._correct_manim_code(current_code, str(e), scene_data)
+                        corrected_code, code_model, code_key = self._correct_with_cascade(
+                            current_code, str(e), scene_data, scene_num, code_model, failures, summary
+                        )
                         scene_code = corrected_code  # Update for next iteration
+                        attempt += 1
                         continue
                     except Exception as correction_e:
                         logger.error(f"Code correction failed: {correction_e}")
                 raise
             
-            # Setup output directory
-            output_dir = RENDERS_DIR / "video" / f"scene_{scene_num}"
-            ensure_directory(output_dir)
-            
-            # Build Manim command using RenderConfig's get_manim_args method
-            manim_args = self.render_config.get_manim_args()
-            cmd = [
-                "manim", str(script_path.absolute()), class_name
-            ] + manim_args + [
-                "--media_dir", str(output_dir.absolute())
-            ]
+            # Catch API misuse statically instead of paying for a failed render
+            if STATIC_VALIDATION_ENABLED and attempt < max_correction_attempts:
+                issues = validate_scene_source(current_code)
+                if issues:
+                    report = format_issues(issues)
+                    logger.warning(f"✗ Static validation found {len(issues)} issue(s) in {class_name} "
+                                   f"(attempt {attempt + 1}):\n{report}")
+                    if summary:
+                        self._record_stat(summary.render_stats, "static_rejections")
+                    pending_fix = self._record_fix_outcome(pending_fix, report, summary)
+                    failures += 1
+                    self._record_model_outcome(judged_model, False, summary)
+                    self._discard_cached_code(code_key)
+                    code_key = None
+                    try:
+                        scene_code, code_model, code_key = self._correct_with_cascade(
+                            current_code, f"Static validation errors:\n{report}", scene_data,
+                            scene_num, code_model, failures, summary
+                        )
+                        attempt += 1
+                        continue
+                    except Exception as correction_e:
+                        logger.error(f"Code correction failed: {correction_e}")
             
-            logger.info(f"Running manim: {' '.join(cmd)}")
+            # Dry-run at minimal resolution so runtime errors surface in seconds
+            if self.render_config.preflight and attempt < max_correction_attempts:
+                with self._render_slot():
+                    preflight = preflight_scene(
+                        script_path, class_name, timeout=PREFLIGHT_TIMEOUT,
+                        use_pool=self.render_config.render_backend == "pool"
+                    )
+                if preflight.ok:
+                    logger.info(f"✓ Preflight passed for {class_name} (attempt {attempt + 1})")
+                    pending_fix = self._record_fix_outcome(pending_fix, None, summary)
+                    for mobject in preflight.offscreen:
+                        logger.warning(f"{class_name}: {mobject['type']} at {mobject['center']} "
+                                       f"({mobject['width']}x{mobject['height']}) extends off screen")
+                elif not preflight.inconclusive:
+                    logger.error(f"✗ Preflight failed for {class_name} (attempt {attempt + 1}):\n{preflight.error}")
+                    if summary:
+                        self._record_stat(summary.render_stats, "preflight_failures")
+                    pending_fix = self._record_fix_outcome(pending_fix, preflight.error, summary)
+                    failures += 1
+                    self._record_model_outcome(judged_model, False, summary)
+                    self._discard_cached_code(code_key)
+                    code_key = None
+                    if rule_fixes < MAX_RULE_FIXES:
+                        pending_fix = self._apply_rule_fixes(current_code, preflight.error, class_name, summary)
+                        if pending_fix:
+                            scene_code = pending_fix.code
+                            rule_fixes += 1
+                            continue
+                    if self.render_config.correction_candidates > 1:
+                        video_path, final_code, rounds = self._race_corrections(
+                            current_code, preflight.error, scene_data, scene_num, class_name, manim_args,
+                            output_dir, code_model, failures, max_correction_attempts - attempt, summary
+                        )
+                        return self._finish_render(video_path, final_code, original_code, attempt + rounds,
+                                                   rule_fixes, render_cache, cache_keys, manim_args, summary)
+                    try:
+                        scene_code, code_model, code_key = self._correct_with_cascade(
+                            current_code, preflight.error, scene_data, scene_num, code_model, failures, summary
+                        )
+                        attempt += 1
+                        continue
+                    except Exception as correction_e:
+                        logger.error(f"Code correction failed: {correction_e}")
             
             try:
-                result = subprocess.run(
-                    cmd, 
-                    check=True, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=self.render_config.timeout
-                )
+                video_path = self._run_manim(script_path, class_name, manim_args, output_dir)
                 logger.info(f"✓ Manim render successful for {class_name} (attempt {attempt + 1})")
+                pending_fix = self._record_fix_outcome(pending_fix, None, summary)
+                self._record_model_outcome(judged_model, True, summary)
+                return self._finish_render(video_path, current_code, original_code, attempt, rule_fixes,
+                                           render_cache, cache_keys, manim_args, summary)
                 
-                # Find generated video
-                mp4_candidates = sorted(
-                    list(output_dir.rglob("*.mp4")), 
-                    key=lambda p: p.stat().st_mtime, 
-                    reverse=True
-                )
-                
-                if not mp4_candidates:
-                    raise FileNotFoundError("No mp4 produced by Manim")
-                
-                # Track if self-correction was used
-                if attempt > 0:
-                    logger.info(f"✓ Self-correction successful after {attempt} attempt(s)")
-                    if summary:
-                        summary.render_stats.self_corrected += 1
-                        summary.render_stats.correction_attempts += attempt
-                
-                return mp4_candidates[0]
-                
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, RenderError) as e:
                 logger.error(f"Manim failed (attempt {attempt + 1}). Stderr:\n{e.stderr}")
+                pending_fix = self._record_fix_outcome(pending_fix, e.stderr, summary)
+                failures += 1
+                self._record_model_outcome(judged_model, False, summary)
+                self._discard_cached_code(code_key)
+                code_key = None
+                # Mechanical fixes are retried locally and do not use up correction attempts
+                if rule_fixes < MAX_RULE_FIXES:
+                    pending_fix = self._apply_rule_fixes(current_code, e.stderr, class_name, summary)
+                    if pending_fix:
+                        scene_code = pending_fix.code
+                        rule_fixes += 1
+                        continue
+                if attempt < max_correction_attempts and self.render_config.correction_candidates > 1:
+                    video_path, final_code, rounds = self._race_corrections(
+                        current_code, e.stderr, scene_data, scene_num, class_name, manim_args,
+                        output_dir, code_model, failures, max_correction_attempts - attempt, summary
+                    )
+                    return self._finish_render(video_path, final_code, original_code, attempt + rounds,
+                                               rule_fixes, render_cache, cache_keys, manim_args, summary)
                 if attempt < max_correction_attempts:
                     # Try to correct the runtime error
                     logger.info(f"Attempting runtime error correction...")
                     try:
-                        corrected_code = self._correct_manim_code(current_code, e.stderr, scene_data)
+                        corrected_code, code_model, code_key = self._correct_with_cascade(
+                            current_code, e.stderr, scene_data, scene_num, code_model, failures, summary
+                        )
                         scene_code = corrected_code  # Update for next iteration
+                        attempt += 1
                         continue
                     except Exception as correction_e:
                         logger.error(f"Code correction failed: {correction_e}")
@@ -844,8 +1387,269 @@ Scene{scene.seq}.audio_duration = 5.0"""
         # If we get here, all attempts failed
         raise RuntimeError(f"Failed to render scene {scene_num} after {max_correction_attempts + 1} attempts")
     
+    def _finish_render(self, video_path: Path, final_code: str, original_code: str, attempt: int,
+                       rule_fixes: int, render_cache, cache_keys: List[str], manim_args: List[str],
+                       summary: ProcessingSummary = None) -> Path:
+        """Record correction stats for a successful render and cache the clip"""
+        # Track if self-correction was used
+        if attempt > 0:
+            logger.info(f"✓ Self-correction successful after {attempt} attempt(s)")
+            if summary:
+                self._record_stat(summary.render_stats, "self_corrected")
+                self._record_stat(summary.render_stats, "correction_attempts", attempt)
+        if rule_fixes and summary:
+            self._record_stat(summary.render_stats, "rule_fixed")
+        
+        if render_cache:
+            # Store under the corrected code too so either version hits next time
+            if final_code != original_code:
+                cache_keys.append(render_cache_key(final_code, manim_args))
+            for cache_key in cache_keys:
+                render_cache.put(cache_key, video_path)
+        
+        return video_path
+    
+    def _correct_with_cascade(self, failed_code: str, error_message: str, scene_data: Optional[dict],
+                              scene_num: int, code_model: Optional[str], failures: int,
+                              summary: ProcessingSummary = None) -> Tuple[str, str, Optional[str]]:
+        """Correct code with the model the cascade picks after failures failed checks
+        
+        Returns the corrected code, the model that wrote it and its LLM cache key.
+        """
+        tier = self._select_correction_tier(scene_data, scene_num, code_model, failures, summary)
+        corrected_code, cache_key = self._timed_correction(failed_code, error_message, scene_data, tier,
+                                                           summary=summary)
+        with self._summary_lock:
+            self._scene_models[scene_num] = tier.model
+        return corrected_code, tier.model, cache_key
+    
+    def _select_correction_tier(self, scene_data: Optional[dict], scene_num: int, code_model: Optional[str],
+                                failures: int, summary: ProcessingSummary = None) -> ModelTier:
+        """Ask the cascade for the correction model, counting escalations"""
+        tier = self.manim_router.select(failures, (scene_data or {}).get("layout"))
+        if self.manim_router.is_escalation(code_model, tier):
+            logger.info(f"Escalating scene {scene_num} from {code_model} to {tier.model} "
+                        f"after {failures} failed check(s)")
+            if summary:
+                self._record_stat(summary.manim_stats, "escalations")
+        return tier
+    
+    def _timed_correction(self, failed_code: str, error_message: str, scene_data: Optional[dict],
+                          tier: ModelTier, temperature: float = 0.1, hint: str = "",
+                          summary: ProcessingSummary = None) -> Tuple[str, Optional[str]]:
+        """Request a correction and record the model's latency; returns the code and its LLM cache key"""
+        started = time.time()
+        corrected = self._correct_manim_code(failed_code, error_message, scene_data, tier, temperature, hint)
+        latency = time.time() - started
+        self.manim_router.record_request(tier.model, latency)
+        if summary:
+            with self._summary_lock:
+                update_model_stats(summary.manim_stats.per_model, tier.model, latency=latency)
+        return corrected
+    
+    def _race_corrections(self, failed_code: str, error_message: str, scene_data: Optional[dict],
+                          scene_num: int, class_name: str, manim_args: List[str], output_dir: Path,
+                          code_model: Optional[str], failures: int, rounds: int,
+                          summary: ProcessingSummary = None) -> Tuple[Path, str, int]:
+        """Request several corrections at once and keep the first that renders
+        
+        Each round asks for render_config.correction_candidates corrections
+        with different temperatures and instructions, then validates and
+        renders them concurrently; the remaining candidates are cancelled as
+        soon as one renders. If none does, the next round starts from the
+        first failed candidate and its error. Returns the video, the winning
+        code and the number of rounds used.
+        """
+        candidates = self.render_config.correction_candidates
+        for round_number in range(1, rounds + 1):
+            tier = self._select_correction_tier(scene_data, scene_num, code_model, failures, summary)
+            logger.info(f"Racing {candidates} correction candidates for {class_name} on {tier.model} "
+                        f"(round {round_number}/{rounds})")
+            if summary:
+                self._record_stat(summary.render_stats, "correction_candidates", candidates)
+            
+            tasks = [
+                (f"candidate_{index}", functools.partial(
+                    self._render_correction_candidate, index, failed_code, error_message, scene_data,
+                    tier, class_name, manim_args, output_dir, summary
+                ))
+                for index in range(candidates)
+            ]
+            winner, finished = first_success(tasks)
+            
+            for result in finished:
+                if not result.success and getattr(result.result, "code", None):
+                    self._record_model_outcome(tier.model, False, summary)
+                    self._discard_cached_code(result.result.cache_key)
+            if winner:
+                final_code, video_path = winner.result
+                logger.info(f"✓ {winner.task_id} rendered {class_name} after {winner.duration:.1f}s, "
+                            f"cancelled the rest")
+                self._record_model_outcome(tier.model, True, summary)
+                if summary:
+                    self._record_stat(summary.render_stats, "speculative_wins")
+                with self._summary_lock:
+                    self._scene_models[scene_num] = tier.model
+                return video_path, final_code, round_number
+            
+            failures += 1
+            failed = [result.result for result in finished if getattr(result.result, "code", None)]
+            for result in finished:
+                logger.error(f"✗ {result.task_id} for {class_name} failed: {result.error}")
+            if not failed:
+                break  # No candidate even produced code; another round would fail the same way
+            failed_code, error_message, code_model = failed[0].code, failed[0].error, tier.model
+        
+        raise RuntimeError(f"No correction candidate rendered scene {scene_num}")
+    
+    def _render_correction_candidate(self, index: int, failed_code: str, error_message: str,
+                                     scene_data: Optional[dict], tier: ModelTier, class_name: str,
+                                     manim_args: List[str], output_dir: Path,
+                                     summary: Optional[ProcessingSummary],
+                                     cancel: threading.Event) -> Tuple[str, Path]:
+        """Request one correction variant, check it and render it unless cancelled"""
+        temperature, hint = CORRECTION_VARIANTS[index % len(CORRECTION_VARIANTS)]
+        temperature = min(1.0, temperature + 0.1 * (index // len(CORRECTION_VARIANTS)))
+        try:
+            code, cache_key = self._timed_correction(failed_code, error_message, scene_data, tier,
+                                                     temperature, hint, summary)
+        except Exception as e:
+            raise CandidateFailed(f"correction request failed: {e}")
+        if cancel.is_set():
+            raise concurrent.futures.CancelledError()
+        
+        script_path = self.tmp_dir / f"scene_{class_name}_candidate{index}.py"
+        script_path.write_text(code, encoding="utf-8")
+        try:
+            compile(code, str(script_path), "exec")
+        except SyntaxError as e:
+            raise CandidateFailed(str(e), code, cache_key)
+        if STATIC_VALIDATION_ENABLED:
+            issues = validate_scene_source(code)
+            if issues:
+                raise CandidateFailed(f"Static validation errors:\n{format_issues(issues)}", code, cache_key)
+        
+        try:
+            video_path = self._run_manim(script_path, class_name, manim_args,
+                                         output_dir / f"candidate_{index}", cancel=cancel)
+        except (subprocess.CalledProcessError, RenderError) as e:
+            raise CandidateFailed(e.stderr or str(e), code, cache_key)
+        return code, video_path
+    
+    def _apply_rule_fixes(self, scene_code: str, error: str, class_name: str,
+                          summary: ProcessingSummary = None) -> Optional[FixResult]:
+        """Try the deterministic fixers on an error before asking the LLM"""
+        fix = apply_fixes(scene_code, error)
+        if fix is None:
+            logger.info(f"No fix rule matched the error in {class_name}, escalating to LLM correction")
+            return None
+        
+        logger.info(f"✓ Applied fix rules to {class_name}: {', '.join(fix.rules)}")
+        if summary:
+            with self._summary_lock:
+                for rule in fix.rules:
+                    counts = summary.fixer_stats.setdefault(rule, {"fired": 0, "resolved": 0, "unresolved": 0})
+                    counts["fired"] += 1
+        return fix
+    
+    def _record_fix_outcome(self, fix: Optional[FixResult], error: Optional[str],
+                            summary: ProcessingSummary = None) -> None:
+        """Record whether the last rule fixes cleared their error
+        
+        Always returns None so the caller can clear its pending fix in one step.
+        """
+        if fix is None:
+            return None
+        
+        outcome = record_fix_outcome(fix, error)
+        if summary:
+            with self._summary_lock:
+                for rule, resolved in outcome.items():
+                    summary.fixer_stats[rule]["resolved" if resolved else "unresolved"] += 1
+        return None
+    
+    def _run_manim(self, script_path: Path, class_name: str, manim_args: List[str],
+                   output_dir: Path, cancel: Optional[threading.Event] = None) -> Path:
+        """Render a scene script with the configured backend and return the video path
+        
+        Setting cancel stops the render (killing its worker or process) and
+        raises concurrent.futures.CancelledError. When the engine shares a
+        render budget with other jobs, the render first waits for a slot.
+        """
+        with self._render_slot(cancel):
+            if self.render_config.render_backend == "pool":
+                logger.info(f"Rendering {class_name} in the warm render pool")
+                pool = get_render_pool()
+                future = pool.submit(
+                    script_path, class_name, manim_args, output_dir,
+                    timeout=self.render_config.timeout
+                )
+                while cancel is not None:
+                    try:
+                        return future.result(timeout=0.2)
+                    except concurrent.futures.TimeoutError:
+                        if cancel.is_set():
+                            pool.cancel(future)
+                            raise concurrent.futures.CancelledError()
+                return future.result()
+        
+            cmd = [
+                "manim", str(script_path.absolute()), class_name
+            ] + manim_args + [
+                "--media_dir", str(output_dir.absolute())
+            ]
+        
+            logger.info(f"Running manim: {' '.join(cmd)}")
+        
+            if cancel is None:
+                subprocess.run(
+                    cmd, 
+                    check=True, 
+                    capture_output=True, 
+                    text=True, 
+                    timeout=self.render_config.timeout
+                )
+            else:
+                self._run_cancellable(cmd, cancel)
+        
+            # Find generated video
+            mp4_candidates = sorted(
+                list(output_dir.rglob("*.mp4")), 
+                key=lambda p: p.stat().st_mtime, 
+                reverse=True
+            )
+        
+            if not mp4_candidates:
+                raise FileNotFoundError("No mp4 produced by Manim")
+            return mp4_candidates[0]
+    
+    def _render_slot(self, cancel: Optional[threading.Event] = None):
+        """Hold one of the render slots shared with other jobs, if a budget is set"""
+        return render_slot(self.render_slots, cancel)
+    
+    def _run_cancellable(self, cmd: List[str], cancel: threading.Event):
+        """Run a command like subprocess.run(check=True), killing it if cancel is set"""
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        deadline = time.monotonic() + self.render_config.timeout
+        try:
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=0.2)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancel.is_set():
+                        raise concurrent.futures.CancelledError()
+                    if time.monotonic() > deadline:
+                        raise subprocess.TimeoutExpired(cmd, self.render_config.timeout)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.communicate()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    
     def _create_final_video(self, scene_videos: List[Path], topic: str, 
-                           archive_dir: Path) -> Optional[Path]:
+                           archive_dir: Path, summary: ProcessingSummary) -> Optional[Path]:
         """Create final concatenated video"""
         if not scene_videos:
             logger.error("No scene videos to concatenate")
@@ -854,7 +1658,10 @@ Scene{scene.seq}.audio_duration = 5.0"""
         clean_topic = clean_filename(topic.replace(" ", "_"))
         final_output = RENDERS_DIR / f"{clean_topic}_final.mp4"
         
-        success = concatenate_videos(scene_videos, final_output)
+        if self.render_config.assembly_mode == "single_pass":
+            success = self._assemble_final_video(scene_videos, final_output, summary)
+        else:
+            success = self._concatenate_scene_videos(scene_videos, final_output)
         
         if success:
             # Archive final video
@@ -864,6 +1671,38 @@ Scene{scene.seq}.audio_duration = 5.0"""
         
         return None
     
+    def _assemble_final_video(self, scene_videos: List[Path], final_output: Path,
+                              summary: ProcessingSummary) -> bool:
+        """Mux, pad and concatenate all scenes in one encode, falling back to per-scene muxing"""
+        segments = []
+        for video_path in scene_videos:
+            deferred = self._deferred_audio.get(video_path)
+            segments.append((video_path, deferred[1] if deferred else None))
+        
+        if assemble_final_video(segments, final_output, padding_duration=FINAL_PADDING):
+            self._record_stat(summary.audio_mux_stats, "success", sum(1 for _, audio in segments if audio))
+            return True
+        
+        logger.warning("Single-pass assembly failed, muxing scenes individually")
+        muxed_videos = []
+        for video_path in scene_videos:
+            deferred = self._deferred_audio.get(video_path)
+            if deferred:
+                muxed_videos.append(self._combine_scene_audio(deferred[0], video_path, deferred[1], summary))
+            else:
+                muxed_videos.append(video_path)
+        
+        return self._concatenate_scene_videos(muxed_videos, final_output)
+    
+    def _concatenate_scene_videos(self, scene_videos: List[Path], final_output: Path) -> bool:
+        """Concatenate muxed scene clips, padding the end unless the last clip already carries it"""
+        return concatenate_videos(
+            scene_videos,
+            final_output,
+            add_padding=scene_videos[-1] not in self._padded_clips,
+            padding_duration=FINAL_PADDING
+        )
+    
     def _archive_results(self, archive_dir: Path, final_video: Optional[Path],
                         summary: ProcessingSummary):
         """Archive generation results"""
@@ -886,15 +1725,24 @@ Scene{scene.seq}.audio_duration = 5.0"""
         metadata.final_videos = [f.name for f in (archive_dir / "final_videos").glob("*.mp4")]
         metadata.llm_outputs = [f.name for f in (archive_dir / "llm_outputs").glob("*.json")]
         
+        media_files = list((archive_dir / "audio_files").glob("*.wav")) + list((archive_dir / "final_videos").glob("*.mp4"))
+        metadata.media_durations = {
+            path.name: round(info["duration"], 3)
+            for path, info in probe_media_batch(media_files).items() if info
+        }
+        
         # Save metadata
         metadata_file = archive_dir / "archive_metadata.json"
         save_json(metadata.dict(), metadata_file)
     
-    def _correct_manim_code(self, failed_code: str, error_message: str, scene_data: dict = None) -> str:
-        """Use LLM to correct failed Manim code"""
+    def _correct_manim_code(self, failed_code: str, error_message: str, scene_data: dict = None,
+                            tier: Optional[ModelTier] = None, temperature: float = 0.1,
+                            hint: str = "") -> Tuple[str, Optional[str]]:
+        """Use LLM to correct failed Manim code, with MANIM_MODEL unless a cascade tier is given
+        
+        Returns the corrected code and the LLM cache key of the response, if caching is on.
+        """
         try:
-            from google.genai import types
-            
             system_instruction = """You are an expert Manim developer specializing in fixing broken Python code.
 
 CRITICAL RULES:
@@ -931,20 +1779,26 @@ ERROR MESSAGE:
 {error_message}{scene_info}
 
 Provide the complete corrected Python code:"""
+            if hint:
+                correction_prompt += f"\n\n{hint}"
             
             logger.info("Requesting code correction from LLM...")
             
-            response = self.llm_provider.client.models.generate_content(
-                model=MANIM_MODEL,
-                contents=correction_prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_instruction,
-                    temperature=0.1,  # Low temperature for precise corrections
-                    max_output_tokens=get_max_output_tokens(MANIM_MODEL)
-                )
+            tier = tier or ModelTier(MANIM_MODEL)
+            # Low temperature for precise corrections unless diverse candidates are wanted
+            generation_config = tier.generation_config(temperature, get_max_output_tokens(tier.model))
+            corrected_code = generate_text(
+                self.llm_provider.client,
+                tier.model,
+                correction_prompt,
+                system_prompt=system_instruction,
+                system_as_instruction=True,
+                generation_config=generation_config,
+                response_cache=self.llm_cache,
+                bypass_cache=self.bypass_llm_cache
             )
-            
-            corrected_code = response.text.strip()
+            if not corrected_code:
+                raise ValueError("Empty response from Gemini API")
             
             # Clean up response (remove markdown if present)
             if corrected_code.startswith("```python"):
@@ -954,7 +1808,11 @@ Provide the complete corrected Python code:"""
             corrected_code = corrected_code.strip()
             
             logger.info("✓ Code correction received from LLM")
-            return corrected_code
+            cache_key = None
+            if self.llm_cache is not None:
+                cache_key = response_cache_key(tier.model, correction_prompt, system_instruction,
+                                               generation_config, system_as_instruction=True)
+            return corrected_code, cache_key
             
         except Exception as e:
             logger.error(f"LLM code correction failed: {e}")
@@ -968,6 +1826,24 @@ Provide the complete corrected Python code:"""
             cleanup_old_files(TMP_DIR, max_age_days=3)
         except Exception as e:
             logger.warning(f"Cleanup failed: {e}")
+    
+    def _remove_run_directories(self):
+        """Remove this run's scratch files and scene clips once the final video is assembled"""
+        if self.run_id is None:
+            return
+        for directory in (self.tmp_dir, self.scene_renders_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_directories(run_id: Optional[str] = None) -> Tuple[Path, Path]:
+    """Scratch and scene-clip directories for one engine run
+    
+    Without a run id the shared TMP_DIR and RENDERS_DIR/video are used, as
+    for single CLI runs.
+    """
+    if run_id is None:
+        return TMP_DIR, RENDERS_DIR / "video"
+    return TMP_DIR / run_id, RENDERS_DIR / "video" / run_id
 
 
 def create_video_engine(**config) -> VideoGenerationEngine:
@@ -0,0 +1,289 @@
+"""
+Worker process pool that runs API video generation jobs off the event loop
+"""
+
+import concurrent.futures
+import multiprocessing
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+import logging
+
+import sys
+from pathlib import Path
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import MAX_CONCURRENT_JOBS, JOB_RENDER_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# Job progress when the engine starts; engine progress fills the rest
+ENGINE_PROGRESS_START = 30
+
+# Set in each worker process by _init_worker
+_updates = None
+_render_slots = None
+
+
+def _init_worker(updates, render_slots, log_level: Optional[str]):
+    global _updates, _render_slots
+    _updates = updates
+    _render_slots = render_slots
+
+    from src.utils.logging import setup_logging
+    setup_logging(log_level, include_console=True)
+
+
+def report_progress(job_id: str, **updates):
+    """Send a job status update from a worker process to the API process"""
+    _updates.put(("update", job_id, updates))
+
+
+def _run_job(job_id: str, fn: Callable[..., Any], args: tuple):
+    """Run a job in a worker, first telling the API process it has started
+
+    Jobs that never started are resubmitted if their worker pool breaks.
+    """
+    _updates.put(("started", job_id, None))
+    return fn(job_id, *args)
+
+
+def generation_result(summary) -> Dict[str, Any]:
+    """Job result for a finished generation"""
+    return {
+        "success": True,
+        "summary": summary.dict(),
+        "total_scenes": summary.total_scenes,
+        "final_video": summary.final_video,
+        "success_rates": {
+            "tts": f"{summary.tts_stats.success}/{summary.total_scenes}",
+            "code_generation": f"{summary.manim_stats.success}/{summary.total_scenes}",
+            "rendering": f"{summary.render_stats.success}/{summary.total_scenes}"
+        }
+    }
+
+
+def run_generation_job(job_id: str, script_data: Dict[str, Any], engine_options: Dict[str, Any]):
+    """Generate a video from a stored script inside a job worker process
+
+    The stored script (including user edits) is rendered as-is; the script
+    LLM is not called again. Engine stage transitions and per-scene progress
+    become job updates with the stage, scene counts and ETA in details.
+    Every status change, including the final one, goes through the update
+    queue so the API process applies them in order.
+    """
+    from src.core.engine import create_video_engine
+    from src.core.models import VideoScript
+
+    details: Dict[str, Any] = {}
+
+    def on_progress(event: Dict[str, Any]):
+        details["stage"] = event["stage"]
+        for key in ("scenes_done", "total_scenes", "eta_seconds"):
+            if key in event:
+                details[key] = event[key]
+        if "scene" in event:
+            message = f"Rendered {event['scenes_done']}/{event['total_scenes']} scenes"
+        else:
+            # The ETA is only known while scenes are finishing
+            details.pop("eta_seconds", None)
+            message = event["stage"]
+        progress = ENGINE_PROGRESS_START + (100 - ENGINE_PROGRESS_START) * event["progress"] / 100
+        report_progress(job_id, progress=round(progress, 1), message=message, details=dict(details))
+
+    try:
+        report_progress(job_id, status="running", message="Creating video engine", progress=20)
+        engine = create_video_engine(render_slots=_render_slots, progress_callback=on_progress,
+                                     run_id=job_id, **engine_options)
+
+        report_progress(job_id, message="Generating video", progress=ENGINE_PROGRESS_START)
+        video_script = VideoScript(**script_data)
+        success, summary = engine.generate_video_from_script(video_script)
+
+        if success:
+            details.pop("eta_seconds", None)
+            report_progress(job_id,
+                            status="completed",
+                            message="Video generation completed successfully",
+                            progress=100,
+                            result=generation_result(summary),
+                            details=dict(details, stage="Completed", final_video=summary.final_video))
+        else:
+            report_progress(job_id,
+                            status="failed",
+                            message="Video generation failed",
+                            progress=100,
+                            error="Generation process failed")
+
+    except Exception as e:
+        logger.error(f"Generation failed for job {job_id}: {e}")
+        report_progress(job_id,
+                        status="failed",
+                        message=f"Generation failed: {str(e)}",
+                        progress=100,
+                        error=str(e))
+
+
+class JobWorkerPool:
+    """Run generation jobs in worker processes so the API stays responsive
+
+    At most max_jobs jobs run at once and later submissions stay pending
+    until a worker frees up. All jobs draw from one budget of render_budget
+    concurrent Manim renders, so running more jobs does not oversubscribe
+    the CPU with renders. Status updates from the workers are applied in
+    the API process by on_update(job_id, **updates).
+
+    If a worker process dies, the executor breaks and every job in it fails
+    with BrokenProcessPool. Only jobs that had started are failed; the rest
+    are resubmitted to a fresh executor.
+    """
+
+    def __init__(self, on_update: Callable[..., Any], max_jobs: int = MAX_CONCURRENT_JOBS,
+                 render_budget: int = JOB_RENDER_BUDGET, log_level: Optional[str] = None):
+        self.on_update = on_update
+        self.max_jobs = max(1, max_jobs)
+        self.render_budget = max(1, render_budget)
+        self.log_level = log_level
+        self._context = multiprocessing.get_context("spawn")
+        # Written without a feeder thread, so a start marker is in the pipe
+        # before the worker can crash
+        self._updates = self._context.SimpleQueue()
+        self._render_slots = self._context.BoundedSemaphore(self.render_budget)
+        self._lock = threading.Lock()
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        # Function and arguments of every unfinished job, for resubmission
+        self._jobs: Dict[str, Tuple[Callable[..., Any], tuple]] = {}
+        self._started: Set[str] = set()
+        self._stats = {"submitted": 0, "finished": 0, "cancelled": 0, "crashed": 0, "requeued": 0}
+        self._closed = False
+        self._executor = self._create_executor()
+        self._listener = threading.Thread(target=self._listen, name="job-updates", daemon=True)
+        self._listener.start()
+        logger.info(f"Job worker pool started: {self.max_jobs} concurrent jobs, "
+                    f"{self.render_budget} shared render slots")
+
+    def _create_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_jobs,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._updates, self._render_slots, self.log_level)
+        )
+
+    def submit(self, job_id: str, fn: Callable[..., Any], *args) -> concurrent.futures.Future:
+        """Queue fn(job_id, *args) to run in a worker as soon as one is free
+
+        fn must be a module-level function; it reports its own progress and
+        outcome with report_progress.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Job worker pool is shut down")
+            self._stats["submitted"] += 1
+            self._jobs[job_id] = (fn, args)
+        return self._submit(job_id, fn, args)
+
+    def _submit(self, job_id: str, fn: Callable[..., Any], args: tuple) -> Optional[concurrent.futures.Future]:
+        with self._lock:
+            if self._closed:
+                return None
+            executor = self._executor
+            future = executor.submit(_run_job, job_id, fn, args)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._job_done(job_id, f, executor))
+        return future
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        return future is not None and future.cancel()
+
+    def _job_done(self, job_id: str, future: concurrent.futures.Future,
+                  executor: concurrent.futures.ProcessPoolExecutor):
+        with self._lock:
+            if self._futures.get(job_id) is future:
+                del self._futures[job_id]
+            if future.cancelled():
+                self._stats["cancelled"] += 1
+                self._forget(job_id)
+                return
+        try:
+            future.result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                if self._executor is executor and not self._closed:
+                    # A worker that died holding a render slot never released
+                    # it, so the new executor gets a full budget of its own
+                    self._render_slots = self._context.BoundedSemaphore(self.render_budget)
+                    self._executor = self._create_executor()
+            # The listener decides once it has read every start marker sent before the crash
+            self._updates.put(("crashed", job_id, str(e) or "Job worker process terminated"))
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} could not run: {e}")
+            self._apply(job_id, status="failed", message=f"Generation failed: {str(e)}",
+                        progress=100, error=str(e))
+        with self._lock:
+            self._stats["finished"] += 1
+            self._forget(job_id)
+
+    def _forget(self, job_id: str):
+        self._jobs.pop(job_id, None)
+        self._started.discard(job_id)
+
+    def _job_crashed(self, job_id: str, error: str):
+        """Resubmit a job lost with a broken executor, or fail it if it was running"""
+        with self._lock:
+            job = None if job_id in self._started else self._jobs.get(job_id)
+        if job is not None and self._submit(job_id, *job) is not None:
+            logger.warning(f"Job worker pool broke before job {job_id} started; resubmitted it")
+            with self._lock:
+                self._stats["requeued"] += 1
+            return
+        logger.error(f"Job worker crashed while running job {job_id}: {error}")
+        with self._lock:
+            self._stats["finished"] += 1
+            self._stats["crashed"] += 1
+            self._forget(job_id)
+        self._apply(job_id, status="failed", message="Job worker crashed",
+                    progress=100, error=error)
+
+    def _listen(self):
+        while True:
+            item = self._updates.get()
+            if item is None:
+                return
+            kind, job_id, payload = item
+            if kind == "started":
+                with self._lock:
+                    if job_id in self._jobs:
+                        self._started.add(job_id)
+            elif kind == "crashed":
+                self._job_crashed(job_id, payload)
+            else:
+                self._apply(job_id, **payload)
+
+    def _apply(self, job_id: str, **updates):
+        try:
+            self.on_update(job_id, **updates)
+        except Exception as e:
+            logger.error(f"Failed to apply update for job {job_id}: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            running = sum(1 for f in self._futures.values() if f.running())
+            return dict(self._stats, max_jobs=self.max_jobs, render_budget=self.render_budget,
+                        running=running, pending=len(self._futures) - running)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting jobs, drop pending ones and stop the update listener"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
+        self._updates.put(None)
+        self._listener.join(timeout=5)
@@ -10,7 +10,11 @@ from pathlib import Path
 
 # Add project root to path for config imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config.settings import MANIM_MODEL, get_max_output_tokens_for_model, TTS_VOICE_NAME, TTS_PROVIDER
+from config.settings import (
+    MANIM_MODEL, get_max_output_tokens_for_model, TTS_VOICE_NAME, TTS_PROVIDER, RENDER_CACHE_ENABLED,
+    TTS_CACHE_ENABLED, RENDER_BACKEND, ASSEMBLY_MODE, PREFLIGHT_ENABLED, CORRECTION_CANDIDATES, MANIM_CASCADE_ENABLED,
+    MANIM_FAST_MODEL, MANIM_FAST_THINKING_BUDGET
+)
 
 
 class LayoutType(str, Enum):
@@ -81,6 +85,15 @@ class GenerationStats(BaseModel):
     non_thinking_success: int = 0
     self_corrected: int = 0
     correction_attempts: int = 0
+    static_rejections: int = 0
+    preflight_failures: int = 0
+    rule_fixed: int = 0
+    correction_candidates: int = 0
+    speculative_wins: int = 0
+    escalations: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    per_model: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # Requests, success rate and latency per model
 
 
 class ProcessingSummary(BaseModel):
@@ -95,6 +108,7 @@ class ProcessingSummary(BaseModel):
     manim_stats: GenerationStats = Field(default_factory=GenerationStats)
     render_stats: GenerationStats = Field(default_factory=GenerationStats)
     audio_mux_stats: GenerationStats = Field(default_factory=GenerationStats)
+    fixer_stats: Dict[str, Dict[str, int]] = Field(default_factory=dict)  # Per fix rule: fired/resolved/unresolved
     
     # Layout usage
     layout_stats: Dict[str, int] = Field(default_factory=lambda: {
@@ -104,6 +118,7 @@ class ProcessingSummary(BaseModel):
     })
     
     total_duration: float = 0.0
+    final_video: Optional[str] = None
     
     def add_scene_summary(self, scene_summary: Dict[str, Any]):
         """Add a scene processing summary"""
@@ -122,6 +137,8 @@ class BatchRequest(BaseModel):
     layout: LayoutType
     system_prompt: str
     user_prompt: str
+    model: Optional[str] = None  # Chosen by the model cascade; None uses the client's default
+    thinking_budget: Optional[int] = None
 
 
 class BatchResponse(BaseModel):
@@ -130,6 +147,9 @@ class BatchResponse(BaseModel):
     success: bool
     content: Optional[str] = None
     error: Optional[str] = None
+    model: Optional[str] = None
+    latency: float = 0.0
+    cache_key: Optional[str] = None  # Response cache entry holding content, if caching is on
 
 
 class ArchiveMetadata(BaseModel):
@@ -145,6 +165,7 @@ class ArchiveMetadata(BaseModel):
     scene_codes: List[str] = Field(default_factory=list)
     final_videos: List[str] = Field(default_factory=list)
     llm_outputs: List[str] = Field(default_factory=list)
+    media_durations: Dict[str, float] = Field(default_factory=dict)
 
 
 class RenderConfig(BaseModel):
@@ -153,6 +174,11 @@ class RenderConfig(BaseModel):
     output_format: str = "mp4"
     include_audio: bool = True
     timeout: int = 180
+    use_cache: bool = RENDER_CACHE_ENABLED
+    render_backend: str = RENDER_BACKEND  # "subprocess" (manim CLI) or "pool" (warm workers)
+    assembly_mode: str = ASSEMBLY_MODE  # "single_pass" (one final encode) or "per_scene" (mux, then concat)
+    preflight: bool = PREFLIGHT_ENABLED  # Dry-run each scene at minimal resolution before the real render
+    correction_candidates: int = CORRECTION_CANDIDATES  # Corrections requested and rendered concurrently after a failure
     
     def get_manim_args(self) -> List[str]:
         """Get Manim command line arguments"""
@@ -186,13 +212,15 @@ class TTSConfig(BaseModel):
     model: Optional[str] = None
     speed: float = 1.0
     pitch: float = 0.0
+    use_cache: bool = TTS_CACHE_ENABLED
     
     def get_provider_config(self) -> Dict[str, Any]:
         """Get provider-specific configuration"""
         config = {
             "voice": self.voice,
             "speed": self.speed,
-            "pitch": self.pitch
+            "pitch": self.pitch,
+            "use_cache": self.use_cache
         }
         
         if self.model:
@@ -209,6 +237,9 @@ class ManimConfig(BaseModel):
     max_output_tokens: int = Field(default_factory=lambda: get_max_output_tokens_for_model(MANIM_MODEL))
     temperature: float = 0.3
     use_batch: bool = True
+    cascade: bool = MANIM_CASCADE_ENABLED  # Try fast_model first, escalate to model on failed checks
+    fast_model: str = MANIM_FAST_MODEL
+    fast_thinking_budget: int = MANIM_FAST_THINKING_BUDGET
     
     def get_generation_config(self) -> Dict[str, Any]:
         """Get generation configuration"""
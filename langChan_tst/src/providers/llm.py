@@ -4,9 +4,12 @@ Large Language Model provider implementations
 
 import json
 import logging
+import random
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Callable
 from pathlib import Path
 
 # Optional imports with error handling
@@ -27,6 +30,8 @@ except ImportError:
             def __init__(self, **kwargs): pass
         class Part:
             def __init__(self, **kwargs): pass
+        class ThinkingConfig:
+            def __init__(self, **kwargs): pass
     
     GOOGLE_GENAI_AVAILABLE = False
     logger = logging.getLogger(__name__)
@@ -54,8 +59,17 @@ from src.core.models import (
 
 from config.settings import (
     GOOGLE_API_KEY, OPENAI_API_KEY, SYSTEM_PROMPT_SCRIPT, 
-    SYSTEM_PROMPT_MANIM, MANIM_REF_PATH, SCRIPT_MODEL, MANIM_MODEL
+    SYSTEM_PROMPT_MANIM, MANIM_REF_PATH, MANIM_REF_TOKEN_BUDGET, SCRIPT_MODEL, MANIM_MODEL,
+    LLM_REQUEST_TIMEOUT, LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY,
+    CODE_STREAMING_ENABLED, CODE_STREAM_MAX_ABORTS, SCRIPT_MAX_RETRIES
 )
+from src.utils.cache import ResponseCache
+from src.utils.code_stream import CodeStreamMonitor, StreamAborted
+from src.utils.json_stream import JSONArrayStreamParser
+from src.utils.json_repair import ScriptParse, parse_script, is_repairable_script
+from src.utils.model_router import ModelRouter
+from src.providers.registry import get_genai_client
+from src.utils.reference import ReferenceIndex, estimate_tokens, get_reference_index
 
 logger = logging.getLogger(__name__)
 
@@ -89,12 +103,274 @@ def get_max_output_tokens(model: str) -> int:
     return model_limits.get(model.lower(), 8192)
 
 
+def extract_response_text(response) -> str:
+    """Extract text from a Gemini response, falling back to the first candidate's parts"""
+    if response and hasattr(response, 'text') and response.text:
+        return response.text.strip()
+    if response and hasattr(response, 'candidates') and response.candidates:
+        candidate = response.candidates[0]
+        if hasattr(candidate, 'content') and candidate.content:
+            if hasattr(candidate.content, 'parts') and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if hasattr(part, 'text') and part.text:
+                        return part.text.strip()
+    return ""
+
+
+def response_cache_key(model: str, user_prompt: str, system_prompt: Optional[str] = None,
+                       generation_config: Optional[Dict[str, Any]] = None,
+                       system_as_instruction: bool = False) -> str:
+    """Key under which generate_text and stream_text cache the response to a request"""
+    key_config = dict(generation_config or {}, system_as_instruction=system_as_instruction)
+    return ResponseCache.make_key(model, system_prompt, user_prompt, key_config)
+
+
+def generate_text(client, model: str, user_prompt: str,
+                  system_prompt: Optional[str] = None,
+                  generation_config: Optional[Dict[str, Any]] = None,
+                  response_cache: Optional[ResponseCache] = None,
+                  bypass_cache: bool = False,
+                  system_as_instruction: bool = False,
+                  validate: Optional[Callable[[str], bool]] = None) -> str:
+    """Generate text with Gemini, memoizing responses in response_cache
+
+    The system prompt is sent either as a leading model turn (the default,
+    used by the Manim prompts) or as a system instruction. bypass_cache skips
+    the lookup but still stores the fresh response. Empty responses, and
+    responses rejected by validate, are never cached.
+    """
+    generation_config = dict(generation_config or {})
+    
+    cache_key = None
+    if response_cache is not None:
+        cache_key = response_cache_key(model, user_prompt, system_prompt, generation_config,
+                                       system_as_instruction)
+        if not bypass_cache:
+            cached_text = response_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info(f"✓ LLM cache hit for {model} ({cache_key[:12]})")
+                return cached_text
+    
+    contents, config = _build_contents(user_prompt, system_prompt, generation_config, system_as_instruction)
+    response = client.models.generate_content(model=model, contents=contents, config=config)
+    response_text = extract_response_text(response)
+    
+    if cache_key and response_text and (validate is None or validate(response_text)):
+        response_cache.put(cache_key, response_text, model=model)
+    
+    return response_text
+
+
+def stream_text(client, model: str, user_prompt: str,
+                system_prompt: Optional[str] = None,
+                generation_config: Optional[Dict[str, Any]] = None,
+                response_cache: Optional[ResponseCache] = None,
+                bypass_cache: bool = False,
+                system_as_instruction: bool = False,
+                validate: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """Stream text chunks from Gemini as they are generated
+
+    Shares generate_text's cache: a cached response is yielded as a single
+    chunk, and the full streamed text is stored once the stream ends.
+    """
+    generation_config = dict(generation_config or {})
+    
+    cache_key = None
+    if response_cache is not None:
+        cache_key = response_cache_key(model, user_prompt, system_prompt, generation_config,
+                                       system_as_instruction)
+        if not bypass_cache:
+            cached_text = response_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info(f"✓ LLM cache hit for {model} ({cache_key[:12]})")
+                yield cached_text
+                return
+    
+    contents, config = _build_contents(user_prompt, system_prompt, generation_config, system_as_instruction)
+    chunks = []
+    stream = client.models.generate_content_stream(model=model, contents=contents, config=config)
+    try:
+        for chunk in stream:
+            text = chunk.text if hasattr(chunk, "text") else None
+            if text:
+                chunks.append(text)
+                yield text
+    finally:
+        # Closing the stream early cancels the request instead of waiting for every token
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+    
+    response_text = "".join(chunks).strip()
+    if cache_key and response_text and (validate is None or validate(response_text)):
+        response_cache.put(cache_key, response_text, model=model)
+
+
+def _build_contents(user_prompt: str, system_prompt: Optional[str],
+                    generation_config: Dict[str, Any], system_as_instruction: bool):
+    """Build request contents and config, placing the system prompt as requested"""
+    generation_config = dict(generation_config)
+    if "thinking_budget" in generation_config:
+        generation_config["thinking_config"] = types.ThinkingConfig(
+            thinking_budget=generation_config.pop("thinking_budget")
+        )
+    if system_prompt and system_as_instruction:
+        contents = user_prompt
+        config = types.GenerateContentConfig(system_instruction=system_prompt, **generation_config)
+    elif system_prompt:
+        contents = [
+            types.Content(parts=[types.Part(text=system_prompt)], role="model"),
+            types.Content(parts=[types.Part(text=user_prompt)], role="user")
+        ]
+        config = types.GenerateContentConfig(**generation_config)
+    else:
+        contents = user_prompt
+        config = types.GenerateContentConfig(**generation_config)
+    return contents, config
+
+
+# Extra retrieval terms for what each layout's generated code typically needs
+LAYOUT_QUERY_TERMS = {
+    "title_and_main_content": "Text VGroup move_to Create Write FadeIn",
+    "split_screen": "Text VGroup arrange next_to move_to Create Transform",
+    "custom": "Scene construct Text VGroup Create Write FadeIn"
+}
+
+
+def build_manim_system_prompt(reference_index: ReferenceIndex, scene_data: Dict[str, Any],
+                              layout: str, token_budget: int = MANIM_REF_TOKEN_BUDGET) -> str:
+    """Build the Manim system prompt with only the reference sections relevant to the scene"""
+    query = " ".join([
+        scene_data.get("anim", ""),
+        scene_data.get("title", ""),
+        LAYOUT_QUERY_TERMS.get(layout, "")
+    ])
+    sections = reference_index.select(query, token_budget)
+    reference = "\n\n".join(section.text for section in sections) or "# Manim reference not available"
+    system_prompt = f"{SYSTEM_PROMPT_MANIM}\n\n--- MANIM REFERENCE ---\n{reference}"
+    
+    logger.info(
+        f"Manim prompt for scene {scene_data.get('seq', '?')}: ~{estimate_tokens(system_prompt)} tokens "
+        f"({len(sections)}/{len(reference_index.sections)} reference sections, "
+        f"~{sum(section.tokens for section in sections)}/{reference_index.total_tokens} reference tokens)"
+    )
+    return system_prompt
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an API error is a quota or rate limit rejection"""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code == 429 or "RESOURCE_EXHAUSTED" in str(error).upper()
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether an API error is worth retrying after a backoff"""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return is_rate_limit_error(error) or code in (500, 502, 503, 504) or isinstance(error, ConnectionError)
+
+
+def build_script_prompt(topic: str) -> str:
+    """Build the script generation prompt for a topic"""
+    return f"""Create an educational video script about: {topic}
+
+Output must be valid JSON with this exact structure:
+{{
+    "title": "Video title here",
+    "scenes": [
+        {{
+            "seq": 1,
+            "text": "Narration text for the scene",
+            "anim": "Description of animation to show",
+            "layout": "title_and_main_content"
+        }}
+    ]
+}}
+
+Guidelines:
+- Create 3-5 scenes for a complete video
+- Each scene should be 30-60 seconds of content
+- Use layouts: "title_and_main_content", "split_screen", or "custom"
+- Make animations visually engaging and educational
+- Keep narration clear and concise
+
+Output ONLY the JSON, no other text."""
+
+
+class ScriptStream:
+    """Scenes of a script in the order they arrive from a streamed response
+
+    Iterating yields each Scene as soon as its JSON object closes; once
+    iteration finishes, script holds the complete VideoScript and report the
+    repair and retry counters. The full response is run through parse_script
+    at the end, so scenes the incremental parser skipped (malformed JSON) are
+    still yielded after repair. If nothing usable arrived, retry is called to
+    request the script again.
+    """
+    
+    def __init__(self, chunks: Iterable[str],
+                 retry: Optional[Callable[[], Tuple[VideoScript, Dict[str, Any]]]] = None):
+        self._chunks = chunks
+        self._retry = retry
+        self._generated: Optional[VideoScript] = None
+        self.script: Optional[VideoScript] = None
+        self.report: Dict[str, Any] = {}
+    
+    @classmethod
+    def from_script(cls, script: VideoScript, report: Optional[Dict[str, Any]] = None) -> "ScriptStream":
+        """Wrap an already complete script"""
+        stream = cls([])
+        stream._generated = script
+        stream.report = dict(report or {})
+        return stream
+    
+    def __iter__(self) -> Iterator[Scene]:
+        if self._generated is not None:
+            self.script = self._generated
+            yield from self._generated.scenes
+            return
+        
+        parser = JSONArrayStreamParser("scenes")
+        emitted = set()
+        for chunk in self._chunks:
+            for scene_data in parser.feed(chunk):
+                try:
+                    scene = Scene(**scene_data)
+                except (ValueError, TypeError):
+                    continue  # Left to the repair pass once the response is complete
+                emitted.add(scene.seq)
+                logger.info(f"✓ Streamed scene {scene.seq} ({len(emitted)} so far)")
+                yield scene
+        
+        try:
+            parsed = parse_script(parser.text)
+        except ValueError as e:
+            logger.error(f"Failed to parse script JSON: {e}")
+            if emitted or self._retry is None:
+                raise ValueError(f"Invalid JSON response from LLM: {e}")
+            script, report = self._retry()
+            parsed = ScriptParse(script)
+            self.report = report
+        else:
+            self.report = parsed.report()
+        
+        for scene in parsed.script.scenes:
+            if scene.seq not in emitted:
+                logger.info(f"✓ Recovered scene {scene.seq} from the complete response")
+                yield scene
+        self.script = parsed.script
+        logger.info(f"✓ Script streamed with {len(self.script.scenes)} scenes")
+
+
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
-    def __init__(self, api_key: str, model: str):
+    def __init__(self, api_key: str, model: str,
+                 response_cache: Optional[ResponseCache] = None, bypass_cache: bool = False):
         self.api_key = api_key
         self.model = model
+        self.response_cache = response_cache
+        self.bypass_cache = bypass_cache
+        self.script_report: Dict[str, Any] = {}  # Repair/retry counters of the last generate_script
     
     @abstractmethod
     def generate_script(self, topic: str) -> VideoScript:
@@ -105,111 +381,90 @@ class BaseLLMProvider(ABC):
     def generate_manim_code(self, scene_data: Dict[str, Any], layout: str) -> Tuple[str, str]:
         """Generate Manim code for a scene"""
         pass
+    
+    def stream_script(self, topic: str) -> ScriptStream:
+        """Stream the script scene by scene; providers without streaming yield it all at once"""
+        script = self.generate_script(topic)
+        return ScriptStream.from_script(script, self.script_report)
 
 
 class GeminiLLMProvider(BaseLLMProvider):
     """Gemini LLM provider implementation"""
     
-    def __init__(self, api_key: str = None, model: str = None):
-        super().__init__(api_key or GOOGLE_API_KEY, model or SCRIPT_MODEL)
+    def __init__(self, api_key: str = None, model: str = None,
+                 response_cache: Optional[ResponseCache] = None, bypass_cache: bool = False):
+        super().__init__(api_key or GOOGLE_API_KEY, model or SCRIPT_MODEL, response_cache, bypass_cache)
         if not GOOGLE_GENAI_AVAILABLE:
             raise ValueError("Google GenAI package not available - install with 'pip install google-genai'")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY is required for Gemini LLM")
         
-        self.client = genai.Client(api_key=self.api_key)
-        self.manim_ref = self._load_manim_reference()
-    
-    def _load_manim_reference(self) -> str:
-        """Load Manim reference documentation"""
-        try:
-            if MANIM_REF_PATH.exists():
-                return MANIM_REF_PATH.read_text(encoding="utf-8")
-        except Exception as e:
-            logger.warning(f"Could not load Manim reference: {e}")
-        return "# Manim reference not available"
+        self.client = get_genai_client(self.api_key)
+        self.reference_index = get_reference_index(MANIM_REF_PATH)
     
     def generate_script(self, topic: str) -> VideoScript:
         """Generate video script using Gemini"""
         try:
             logger.info(f"Generating script for topic: {topic}")
-            
-            prompt = f"""Create an educational video script about: {topic}
-
-Output must be valid JSON with this exact structure:
-{{
-    "title": "Video title here",
-    "scenes": [
-        {{
-            "seq": 1,
-            "text": "Narration text for the scene",
-            "anim": "Description of animation to show",
-            "layout": "title_and_main_content"
-        }}
-    ]
-}}
-
-Guidelines:
-- Create 3-5 scenes for a complete video
-- Each scene should be 30-60 seconds of content
-- Use layouts: "title_and_main_content", "split_screen", or "custom"
-- Make animations visually engaging and educational
-- Keep narration clear and concise
-
-Output ONLY the JSON, no other text."""
-
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=get_max_output_tokens(self.model)
-                )
+            script, self.script_report = self._request_script(topic)
+            logger.info(f"✓ Script generated with {len(script.scenes)} scenes")
+            return script
+        except Exception as e:
+            logger.error(f"Script generation failed: {e}")
+            raise
+    
+    def _request_script(self, topic: str, retries: int = 0) -> Tuple[VideoScript, Dict[str, Any]]:
+        """Request the script, asking again only when the response cannot be repaired locally
+
+        retries counts requests already spent (e.g. an unusable stream);
+        repeat requests bypass the cache so a fresh response is generated.
+        """
+        prompt = build_script_prompt(topic)
+        while True:
+            response_text = generate_text(
+                self.client,
+                self.model,
+                prompt,
+                generation_config={
+                    "temperature": 0.7,
+                    "max_output_tokens": get_max_output_tokens(self.model)
+                },
+                response_cache=self.response_cache,
+                bypass_cache=self.bypass_cache or retries > 0,
+                validate=is_repairable_script
             )
             
-            # Extract response text with proper error handling
-            response_text = ""
-            if response and hasattr(response, 'text') and response.text:
-                response_text = response.text.strip()
-            elif response and hasattr(response, 'candidates') and response.candidates:
-                # Try to extract from first candidate
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and candidate.content:
-                    if hasattr(candidate.content, 'parts') and candidate.content.parts:
-                        for part in candidate.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_text = part.text.strip()
-                                break
-            
             if not response_text:
                 logger.error("Could not extract text from Gemini response")
                 logger.error("This may be due to safety filters or API configuration issues")
                 raise ValueError("Empty or filtered response from Gemini API")
             
-            # Clean up response (remove markdown code blocks if present)
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            # Parse JSON
-            data = json.loads(response_text)
-            
-            # Convert to Pydantic model
-            script = VideoScript(
-                title=data["title"],
-                scenes=[Scene(**scene) for scene in data["scenes"]]
-            )
-            
-            logger.info(f"✓ Script generated with {len(script.scenes)} scenes")
-            return script
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse script JSON: {e}")
-            raise ValueError(f"Invalid JSON response from LLM: {e}")
-        except Exception as e:
-            logger.error(f"Script generation failed: {e}")
-            raise
+            try:
+                parsed = parse_script(response_text)
+                return parsed.script, parsed.report(retries)
+            except ValueError as e:
+                if retries >= SCRIPT_MAX_RETRIES:
+                    logger.error(f"Failed to parse script JSON: {e}")
+                    raise ValueError(f"Invalid JSON response from LLM: {e}")
+                retries += 1
+                logger.warning(f"✗ Script response could not be repaired ({e}), "
+                               f"requesting a new one ({retries}/{SCRIPT_MAX_RETRIES})")
+    
+    def stream_script(self, topic: str) -> ScriptStream:
+        """Stream the script so scenes can be processed while later ones are still being written"""
+        logger.info(f"Streaming script for topic: {topic}")
+        return ScriptStream(stream_text(
+            self.client,
+            self.model,
+            build_script_prompt(topic),
+            generation_config={
+                "temperature": 0.7,
+                "max_output_tokens": get_max_output_tokens(self.model)
+            },
+            response_cache=self.response_cache,
+            bypass_cache=self.bypass_cache,
+            validate=is_repairable_script
+        ), retry=(lambda: self._request_script(topic, retries=1)) if SCRIPT_MAX_RETRIES else None)
     
     def generate_manim_code(self, scene_data: Dict[str, Any], layout: str) -> Tuple[str, str]:
         """Generate Manim code for a scene"""
@@ -274,30 +529,26 @@ Instructions:
    ```
 8. Output ONLY the Python code for the *body* of the `construct_scene` method."""
             
-            system_prompt = f"{SYSTEM_PROMPT_MANIM}\n\n--- MANIM REFERENCE ---\n{self.manim_ref}"
+            system_prompt = build_manim_system_prompt(self.reference_index, scene_data, layout)
             
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(parts=[types.Part(text=system_prompt)], role="model"),
-                    types.Content(parts=[types.Part(text=user_prompt)], role="user")
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=get_max_output_tokens(self.model)
-                )
+            code_content = generate_text(
+                self.client,
+                self.model,
+                user_prompt,
+                system_prompt=system_prompt,
+                generation_config={
+                    "temperature": 0.3,
+                    "max_output_tokens": get_max_output_tokens(self.model)
+                },
+                response_cache=self.response_cache,
+                bypass_cache=self.bypass_cache
             )
             
             # Check if response has text content
-            if not response or not hasattr(response, 'text') or response.text is None:
+            if not code_content:
                 logger.error("No text content in Gemini response for Manim generation")
-                logger.debug(f"Response object: {response}")
-                if hasattr(response, 'candidates') and response.candidates:
-                    logger.debug(f"Candidates: {response.candidates}")
                 raise ValueError("Empty response from Gemini API")
             
-            code_content = response.text.strip()
-            
             # Create full scene code
             if layout != "custom":
                 template_class = layout_info["template_class"]
@@ -305,6 +556,7 @@ Instructions:
                 
                 full_code = f"""import sys
 sys.path.append(r'{current_dir}')
+from manim import *
 from src.templates.layouts import {template_class}
 
 class Scene{scene_num}({template_class}):
@@ -346,6 +598,7 @@ Scene{scene_num}.audio_duration = 5.0
         current_dir = Path(__file__).parent.parent.parent
         code = f"""import sys
 sys.path.append(r'{current_dir}')
+from manim import *
 from src.templates.layouts import TitleAndMainContent
 
 class Scene{scene_num}(TitleAndMainContent):
@@ -378,38 +631,69 @@ Scene{scene_num}.audio_duration = 5.0"""
 
 
 class BatchManimLLM:
-    """Batch processing for Manim LLM generation"""
+    """Batch processing for Manim LLM generation
+    
+    Batched requests run concurrently, at most max_concurrency at a time.
+    Each attempt is limited to request_timeout seconds. Rate limit and
+    transient errors are retried with exponential backoff, and a rate limit
+    pauses every worker rather than only the one that hit it. With stream
+    enabled, code is checked while it arrives and a response that has
+    clearly gone wrong is cancelled and retried at once.
+    """
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None,
+                 response_cache: Optional[ResponseCache] = None, bypass_cache: bool = False,
+                 max_concurrency: int = 4, request_timeout: float = LLM_REQUEST_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES, retry_base_delay: float = LLM_RETRY_BASE_DELAY,
+                 stream: bool = CODE_STREAMING_ENABLED, max_stream_aborts: int = CODE_STREAM_MAX_ABORTS,
+                 router: Optional[ModelRouter] = None, client=None):
         self.api_key = api_key or GOOGLE_API_KEY
         self.model = model or MANIM_MODEL
-        if not GOOGLE_GENAI_AVAILABLE:
-            raise ValueError("Google GenAI package not available - install with 'pip install google-genai'")
-        if not self.api_key:
-            raise ValueError("GOOGLE_API_KEY is required for batch Manim LLM")
+        self.response_cache = response_cache
+        self.bypass_cache = bypass_cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.stream = stream
+        self.max_stream_aborts = max_stream_aborts
+        self.router = router
+        
+        if client is None:
+            if not GOOGLE_GENAI_AVAILABLE:
+                raise ValueError("Google GenAI package not available - install with 'pip install google-genai'")
+            if not self.api_key:
+                raise ValueError("GOOGLE_API_KEY is required for batch Manim LLM")
+            client = get_genai_client(self.api_key, timeout=request_timeout)
         
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = client
+        self._backoff_lock = threading.Lock()
+        self._backoff_until = 0.0
+        self._attempt_started: Dict[str, float] = {}
+        self.stream_aborts = 0
         self.batch_requests: List[BatchRequest] = []
         self.batch_id: Optional[str] = None
-        self.manim_ref = self._load_manim_reference()
-    
-    def _load_manim_reference(self) -> str:
-        """Load Manim reference documentation"""
-        try:
-            if MANIM_REF_PATH.exists():
-                return MANIM_REF_PATH.read_text(encoding="utf-8")
-        except Exception as e:
-            logger.warning(f"Could not load Manim reference: {e}")
-        return "# Manim reference not available"
+        self.reference_index = get_reference_index(MANIM_REF_PATH)
     
     def add_to_batch(self, scene_data: Dict[str, Any], layout: str, request_id: str):
         """Add Manim generation request to batch"""
+        request = self._build_request(scene_data, layout, request_id)
+        self.batch_requests.append(request)
+        logger.info(f"Added Manim request {request_id} to batch")
+    
+    def generate_single(self, scene_data: Dict[str, Any], layout: str, request_id: str) -> BatchResponse:
+        """Generate Manim code for one scene without going through the shared batch"""
+        request = self._build_request(scene_data, layout, request_id)
+        return self._process_request(request)
+    
+    def _build_request(self, scene_data: Dict[str, Any], layout: str, request_id: str) -> BatchRequest:
+        """Build the prompts for a single Manim generation request"""
         scene_num = scene_data.get("seq", 1)
         narration = scene_data.get("text", "")
         animation = scene_data.get("anim", "")
         
         # Create prompts
-        system_prompt = f"{SYSTEM_PROMPT_MANIM}\n\n--- MANIM REFERENCE ---\n{self.manim_ref}"
+        system_prompt = build_manim_system_prompt(self.reference_index, scene_data, layout)
         
         if layout == "custom":
             user_prompt = f"Create the COMPLETE animation for scene {scene_num}. Scene data:\n{json.dumps(scene_data, indent=2)}\nThe Scene class MUST be named `Scene{scene_num}`. Output ONLY Python code."
@@ -439,83 +723,187 @@ Instructions:
 5. For sizing: Use `self.region_name.width` and `self.region_name.height` for dimensions.
 6. Output ONLY the Python code for the *body* of the `construct_scene` method."""
         
-        request = BatchRequest(
+        tier = self.router.select(layout=layout) if self.router else None
+        return BatchRequest(
             id=request_id,
             scene_data=scene_data,
             layout=LayoutType(layout),
             system_prompt=system_prompt,
-            user_prompt=user_prompt
+            user_prompt=user_prompt,
+            model=tier.model if tier else None,
+            thinking_budget=tier.thinking_budget if tier else None
         )
-        
-        self.batch_requests.append(request)
-        logger.info(f"Added Manim request {request_id} to batch")
     
     def process_batch(self) -> Dict[str, BatchResponse]:
         """Process all Manim requests in batch"""
-        if not self.batch_requests:
-            return {}
+        return {response.id: response for response in self.iter_batch()}
+    
+    def iter_batch(self) -> Iterator[BatchResponse]:
+        """Run all batched requests concurrently and yield responses as they complete"""
+        requests = list(self.batch_requests)
+        self.batch_requests.clear()
+        if not requests:
+            return
+        
+        logger.info(f"Processing batch with {len(requests)} Manim requests "
+                    f"({min(self.max_concurrency, len(requests))} in flight)")
         
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="manim-llm")
         try:
-            logger.info(f"Processing batch with {len(self.batch_requests)} Manim requests")
+            pending = {executor.submit(self._process_request, req): req for req in requests}
             
-            # Process requests (simplified batch implementation)
-            results = {}
-            for req in self.batch_requests:
-                try:
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=[
-                            types.Content(parts=[types.Part(text=req.system_prompt)], role="model"),
-                            types.Content(parts=[types.Part(text=req.user_prompt)], role="user")
-                        ],
-                        config=types.GenerateContentConfig(
-                            temperature=0.3,
-                            max_output_tokens=get_max_output_tokens(self.model)
-                        )
-                    )
-                    
-                    # Check if response has text content
-                    if not response or not hasattr(response, 'text') or response.text is None:
-                        logger.error(f"No text content in Gemini response for batch request {req.id}")
-                        results[req.id] = BatchResponse(
-                            id=req.id,
-                            success=False,
-                            content="",
-                            error="Empty response from Gemini API"
-                        )
-                        continue
-                    
-                    results[req.id] = BatchResponse(
-                        id=req.id,
-                        success=True,
-                        content=response.text.strip()
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Batch Manim generation failed for request {req.id}: {e}")
-                    results[req.id] = BatchResponse(
-                        id=req.id,
-                        success=False,
-                        error=str(e)
-                    )
+            while pending:
+                done, _ = wait(pending, timeout=self._poll_interval(), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    req = pending.pop(future)
+                    self._attempt_started.pop(req.id, None)
+                    yield future.result()
+                
+                # The worker thread cannot be interrupted, but its late result is dropped
+                now = time.monotonic()
+                for future, req in list(pending.items()):
+                    started = self._attempt_started.get(req.id)
+                    if started is not None and now - started > self.request_timeout:
+                        pending.pop(future)
+                        self._attempt_started.pop(req.id, None)
+                        logger.error(f"Batch request {req.id} timed out after {self.request_timeout}s")
+                        yield BatchResponse(id=req.id, success=False,
+                                            error=f"Timed out after {self.request_timeout}s")
             
-            # Clear batch
-            self.batch_requests.clear()
             logger.info(f"✓ Batch Manim processing completed")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Batch Manim processing failed: {e}")
-            return {
-                req.id: BatchResponse(id=req.id, success=False, error=str(e))
-                for req in self.batch_requests
-            }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _poll_interval(self) -> float:
+        return min(1.0, max(0.01, self.request_timeout / 10))
+    
+    def _wait_for_backoff(self):
+        """Sleep while a rate limit backoff is in effect"""
+        while True:
+            with self._backoff_lock:
+                remaining = self._backoff_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+    
+    def _back_off(self, attempt: int, rate_limited: bool) -> float:
+        """Compute the delay before the next attempt; rate limits pause all workers"""
+        delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, self.retry_base_delay)
+        if rate_limited:
+            with self._backoff_lock:
+                self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+        return delay
+    
+    def _process_request(self, req: BatchRequest) -> BatchResponse:
+        """Send a single Manim generation request to Gemini, retrying transient failures"""
+        attempt = 0
+        aborts = 0
+        abort_reason = None
+        try:
+            while True:
+                self._wait_for_backoff()
+                self._attempt_started[req.id] = time.monotonic()
+                try:
+                    return self._generate_response(req, abort_reason)
+                except StreamAborted as e:
+                    aborts += 1
+                    with self._backoff_lock:
+                        self.stream_aborts += 1
+                    if aborts > self.max_stream_aborts:
+                        logger.error(f"Abandoned streamed code for request {req.id} {aborts} times: {e.reason}")
+                        return BatchResponse(id=req.id, success=False,
+                                             error=f"Streamed code abandoned: {e.reason}")
+                    logger.warning(f"Abandoned streamed code for request {req.id} after {len(e.text)} characters "
+                                   f"({e.reason}), retrying now ({aborts}/{self.max_stream_aborts})")
+                    abort_reason = e.reason
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable_error(e):
+                        logger.error(f"Batch Manim generation failed for request {req.id}: {e}")
+                        return BatchResponse(id=req.id, success=False, error=str(e))
+                    
+                    # Backoff time does not count against the request timeout
+                    self._attempt_started.pop(req.id, None)
+                    rate_limited = is_rate_limit_error(e)
+                    delay = self._back_off(attempt, rate_limited)
+                    attempt += 1
+                    logger.warning(f"{'Rate limited' if rate_limited else 'Transient error'} on request {req.id}, "
+                                   f"retrying in {delay:.1f}s ({attempt}/{self.max_retries}): {e}")
+                    if not rate_limited:
+                        time.sleep(delay)
+        finally:
+            self._attempt_started.pop(req.id, None)
+    
+    def _generate_response(self, req: BatchRequest, abort_reason: Optional[str] = None) -> BatchResponse:
+        """Send a single Manim generation request to Gemini"""
+        user_prompt = req.user_prompt
+        if abort_reason:
+            user_prompt += (f"\n\nA previous answer was discarded because {abort_reason}. "
+                            f"Follow the instructions exactly and output only the requested code.")
+        
+        model = req.model or self.model
+        generation_config = {
+            "temperature": 0.3,
+            "max_output_tokens": get_max_output_tokens(model)
+        }
+        if req.thinking_budget is not None:
+            generation_config["thinking_budget"] = req.thinking_budget
+        request_args = dict(
+            system_prompt=req.system_prompt,
+            generation_config=generation_config,
+            response_cache=self.response_cache,
+            bypass_cache=self.bypass_cache
+        )
+        
+        started = time.monotonic()
+        if self.stream:
+            monitor = CodeStreamMonitor("module" if req.layout == LayoutType.CUSTOM else "body")
+            chunks = stream_text(self.client, model, user_prompt, **request_args)
+            try:
+                for chunk in chunks:
+                    monitor.feed(chunk)
+                    # Stop streaming once iter_batch has given up on this attempt
+                    if time.monotonic() - started > self.request_timeout:
+                        raise TimeoutError(f"Timed out after {self.request_timeout}s")
+            finally:
+                chunks.close()
+            content = monitor.text.strip()
+        else:
+            content = generate_text(self.client, model, user_prompt, **request_args)
+        latency = time.monotonic() - started
+        if self.router:
+            self.router.record_request(model, latency)
+        
+        # Check if response has text content
+        if not content:
+            logger.error(f"No text content in Gemini response for batch request {req.id}")
+            return BatchResponse(
+                id=req.id,
+                success=False,
+                content="",
+                error="Empty response from Gemini API",
+                model=model,
+                latency=latency
+            )
+        
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = response_cache_key(model, user_prompt, req.system_prompt, generation_config)
+        
+        return BatchResponse(
+            id=req.id,
+            success=True,
+            content=content,
+            model=model,
+            latency=latency,
+            cache_key=cache_key
+        )
 
 
 class MockLLMProvider(BaseLLMProvider):
     """Mock LLM provider for testing when real providers are unavailable"""
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None, **kwargs):
         super().__init__("mock_key", "mock_model")
     
     def generate_script(self, topic: str) -> VideoScript:
@@ -0,0 +1,105 @@
+"""
+Process-wide registry of shared API clients, HTTP sessions and prompt assets
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import sys
+from pathlib import Path
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import (
+    GOOGLE_API_KEY, OPENAI_API_KEY, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    MANIM_REF_PATH, STATIC_VALIDATION_ENABLED
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_clients: Dict[Hashable, Any] = {}
+_stats = {"created": 0, "reused": 0}
+
+
+def _shared(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the client registered under key, creating it on first use"""
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+            _stats["created"] += 1
+            logger.info(f"Created shared client {key[0]}")
+        else:
+            _stats["reused"] += 1
+        return client
+
+
+def get_genai_client(api_key: Optional[str] = None, timeout: Optional[float] = None):
+    """Get the shared Gemini client for an API key and request timeout
+
+    google-genai clients are thread-safe and keep their HTTP connections
+    alive, so every provider and job in the process shares one per key.
+    """
+    from google import genai
+    from google.genai import types
+
+    api_key = api_key or GOOGLE_API_KEY
+
+    def create():
+        if timeout is None:
+            return genai.Client(api_key=api_key)
+        return genai.Client(api_key=api_key, http_options=types.HttpOptions(timeout=int(timeout * 1000)))
+
+    return _shared(("genai", api_key, timeout), create)
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """Get the shared OpenAI client for an API key"""
+    from openai import OpenAI
+
+    api_key = api_key or OPENAI_API_KEY
+    return _shared(("openai", api_key), lambda: OpenAI(api_key=api_key))
+
+
+def get_http_session(name: str = "default") -> requests.Session:
+    """Get a shared keep-alive session with a connection pool sized for concurrent jobs"""
+    def create():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    return _shared(("http", name), create)
+
+
+def load_prompt_assets():
+    """Load the Manim reference index and API index once, ahead of the first job"""
+    from src.utils.reference import get_reference_index
+
+    get_reference_index(MANIM_REF_PATH)
+    if STATIC_VALIDATION_ENABLED:
+        from src.utils.scene_validator import get_api_index
+        get_api_index()
+
+
+def get_registry_stats() -> Dict[str, int]:
+    """Get how many shared clients exist and how often they were reused"""
+    with _lock:
+        return dict(_stats, clients=len(_clients))
+
+
+def close_shared_clients():
+    """Close shared HTTP sessions and forget every client (e.g. on server shutdown)"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if isinstance(client, requests.Session) and close:
+            close()
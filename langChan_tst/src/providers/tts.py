@@ -13,11 +13,11 @@ import base64
 import requests
 import json
 import time
+import threading
 
 # Optional imports that might cause issues
 try:
     # Enable Google GenAI import
-    from google import genai
     from google.genai import types
     GOOGLE_GENAI_AVAILABLE = True
     
@@ -65,6 +65,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.core.models import TTSConfig, TTSProvider, BatchRequest, BatchResponse
 
 from config.settings import GOOGLE_API_KEY, OPENAI_API_KEY, DIA_TTS_BASE_URL, DIA_TTS_API_KEY, DIA_TTS_TIMEOUT
+from src.utils.cache import FileCache, get_tts_cache, tts_cache_key
+from src.providers.registry import get_genai_client, get_http_session, get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +74,9 @@ logger = logging.getLogger(__name__)
 class BaseTTSProvider(ABC):
     """Abstract base class for TTS providers with parallel processing support"""
     
+    # Model used when the config does not name one
+    tts_model: Optional[str] = None
+    
     def __init__(self, config: TTSConfig):
         self.config = config
     
@@ -85,6 +90,19 @@ class BaseTTSProvider(ABC):
         """Get provider name"""
         pass
     
+    def get_cache_params(self) -> Dict[str, Any]:
+        """Get the synthesis parameters that change the produced audio"""
+        return {
+            "voice": self.config.voice,
+            "model": self.config.model or self.tts_model,
+            "speed": self.config.speed,
+            "pitch": self.config.pitch
+        }
+    
+    def is_cacheable_output(self, output_path: Path) -> bool:
+        """Check whether the audio last written to output_path came from the real service"""
+        return True
+    
     def synthesize_batch(self, tts_requests: List[Tuple[str, Path]], max_workers: int = 4) -> Dict[str, bool]:
         """Synthesize multiple texts in parallel"""
         logger.info(f"Starting batch TTS synthesis for {len(tts_requests)} requests with {max_workers} workers")
@@ -171,6 +189,8 @@ class BaseTTSProvider(ABC):
 class GeminiTTSProvider(BaseTTSProvider):
     """Gemini TTS provider implementation"""
     
+    tts_model = "gemini-2.5-flash-preview-tts"
+    
     def __init__(self, config: TTSConfig):
         super().__init__(config)
         if not GOOGLE_GENAI_AVAILABLE:
@@ -178,7 +198,7 @@ class GeminiTTSProvider(BaseTTSProvider):
         if not GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY is required for Gemini TTS")
         
-        self.client = genai.Client(api_key=GOOGLE_API_KEY)
+        self.client = get_genai_client(GOOGLE_API_KEY)
     
     def _write_wave_file(self, filename: Path, pcm_data: bytes, channels=1, rate=24000, sample_width=2):
         """Write PCM data to wave file"""
@@ -194,7 +214,7 @@ class GeminiTTSProvider(BaseTTSProvider):
             logger.info(f"Generating TTS with Gemini voice: {self.config.voice}")
             
             response = self.client.models.generate_content(
-                model="gemini-2.5-flash-preview-tts",
+                model=self.tts_model,
                 contents=text,
                 config=types.GenerateContentConfig(
                     response_modalities=["AUDIO"],
@@ -233,6 +253,8 @@ class GeminiTTSProvider(BaseTTSProvider):
 class GeminiBatchTTSProvider(BaseTTSProvider):
     """Gemini Batch TTS provider for cost-effective processing"""
     
+    tts_model = "gemini-2.5-flash-preview-tts"
+    
     def __init__(self, config: TTSConfig):
         super().__init__(config)
         if not GOOGLE_GENAI_AVAILABLE:
@@ -240,7 +262,7 @@ class GeminiBatchTTSProvider(BaseTTSProvider):
         if not GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY is required for Gemini Batch TTS")
         
-        self.client = genai.Client(api_key=GOOGLE_API_KEY)
+        self.client = get_genai_client(GOOGLE_API_KEY)
         self.batch_requests: List[BatchRequest] = []
         self.batch_id: Optional[str] = None
     
@@ -297,7 +319,7 @@ class GeminiBatchTTSProvider(BaseTTSProvider):
             for i, req in enumerate(self.batch_requests):
                 try:
                     response = self.client.models.generate_content(
-                        model="gemini-2.5-flash-preview-tts",
+                        model=self.tts_model,
                         contents=req.user_prompt,
                         config=types.GenerateContentConfig(
                             response_modalities=["AUDIO"],
@@ -391,6 +413,8 @@ class MockTTSProvider(BaseTTSProvider):
 class OpenAITTSProvider(BaseTTSProvider):
     """OpenAI TTS provider implementation"""
     
+    tts_model = "tts-1"
+    
     def __init__(self, config: TTSConfig):
         super().__init__(config)
         if not OPENAI_AVAILABLE:
@@ -398,14 +422,14 @@ class OpenAITTSProvider(BaseTTSProvider):
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is required for OpenAI TTS")
         
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client(OPENAI_API_KEY)
     
     def synthesize(self, text: str, output_path: Path) -> bool:
         """Synthesize text using OpenAI TTS"""
         try:
             logger.info(f"Generating TTS with OpenAI voice: {self.config.voice}")
             
-            model = self.config.model or "tts-1"
+            model = self.config.model or self.tts_model
             response = self.client.audio.speech.create(
                 model=model,
                 voice=self.config.voice,
@@ -437,6 +461,11 @@ class DiaTTSProvider(BaseTTSProvider):
         self.enable_fallback = enable_fallback
         self.use_openai_compatible = use_openai_compatible  # Use /v1/audio/speech endpoint
         self._fallback_provider = None
+        # Outputs written by the mock fallback rather than the Dia server
+        self._fallback_outputs = set()
+        self._fallback_lock = threading.Lock()
+        # Shared keep-alive session, so each request skips connection setup
+        self.session = get_http_session("dia")
         
         # Default configuration based on API specification
         self.default_config = {
@@ -480,6 +509,32 @@ class DiaTTSProvider(BaseTTSProvider):
             self._fallback_provider = MockTTSProvider(fallback_config)
         return self._fallback_provider
     
+    def _mark_fallback_output(self, output_path: Path, used_fallback: bool):
+        """Remember whether output_path holds placeholder audio from the fallback provider"""
+        with self._fallback_lock:
+            if used_fallback:
+                self._fallback_outputs.add(Path(output_path))
+            else:
+                self._fallback_outputs.discard(Path(output_path))
+    
+    def _synthesize_fallback(self, text: str, output_path: Path) -> bool:
+        """Synthesize with the fallback provider and mark the output as placeholder audio"""
+        self._mark_fallback_output(output_path, True)
+        return self._get_fallback_provider().synthesize(text, output_path)
+    
+    def get_cache_params(self) -> Dict[str, Any]:
+        """Get the synthesis parameters that change the produced audio"""
+        params = super().get_cache_params()
+        params["endpoint"] = "openai_compatible" if self.use_openai_compatible else "custom"
+        # The timeout does not affect the audio
+        params["dia"] = {key: value for key, value in self.default_config.items() if key != "timeout"}
+        return params
+    
+    def is_cacheable_output(self, output_path: Path) -> bool:
+        """Mock fallback audio is silence and must never be cached"""
+        with self._fallback_lock:
+            return Path(output_path) not in self._fallback_outputs
+    
     def _choose_extension(self, format_name: str, content_type: str = None) -> str:
         """Choose appropriate file extension based on format"""
         if format_name:
@@ -531,7 +586,7 @@ class DiaTTSProvider(BaseTTSProvider):
             headers["Authorization"] = f"Bearer {self.api_key}"
         
         timeout = config.get("timeout", 60)
-        response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        response = self.session.post(url, headers=headers, json=payload, timeout=timeout)
         
         return response.content, response
     
@@ -573,7 +628,7 @@ class DiaTTSProvider(BaseTTSProvider):
             headers["Authorization"] = f"Bearer {self.api_key}"
         
         timeout = config.get("timeout", 60)
-        response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        response = self.session.post(url, headers=headers, json=payload, timeout=timeout)
         
         return response.content, response
     
@@ -631,6 +686,7 @@ class DiaTTSProvider(BaseTTSProvider):
                 )
                 
                 if success:
+                    self._mark_fallback_output(output_path, False)
                     return True
                 else:
                     logger.warning(f"Dia TTS attempt {retry_count + 1} failed, response indicated error")
@@ -646,16 +702,14 @@ class DiaTTSProvider(BaseTTSProvider):
                     logger.error(f"Dia TTS failed after {max_retries} timeout attempts")
                     if self.enable_fallback:
                         logger.warning("All DiaTTS attempts timed out, falling back to Mock TTS provider")
-                        fallback = self._get_fallback_provider()
-                        return fallback.synthesize(text, output_path)
+                        return self._synthesize_fallback(text, output_path)
                     
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"Dia TTS connection failed: {str(e)}")
                 logger.error(f"Check if TTS server at {self.base_url} is accessible")
                 if self.enable_fallback and retry_count == 0:  # Only try fallback on first connection error
                     logger.warning("Attempting fallback to Mock TTS provider")
-                    fallback = self._get_fallback_provider()
-                    return fallback.synthesize(text, output_path)
+                    return self._synthesize_fallback(text, output_path)
                 break  # Don't retry connection errors
                 
             except requests.exceptions.RequestException as e:
@@ -669,8 +723,7 @@ class DiaTTSProvider(BaseTTSProvider):
                     logger.error(f"Dia TTS failed after {max_retries} request attempts")
                     if self.enable_fallback:
                         logger.warning("All DiaTTS attempts failed, falling back to Mock TTS provider")
-                        fallback = self._get_fallback_provider()
-                        return fallback.synthesize(text, output_path)
+                        return self._synthesize_fallback(text, output_path)
                     
             except Exception as e:
                 logger.error(f"Dia TTS unexpected error: {e}")
@@ -684,10 +737,8 @@ class DiaTTSProvider(BaseTTSProvider):
         
         results = {}
         
-        # Use session for connection pooling
-        session = requests.Session()
-        session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers*2))
-        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers*2))
+        # The shared session pools connections across batches and jobs
+        session = self.session
         
         def synthesize_with_session(request_id: str, text: str, output_path: Path) -> bool:
             """Synthesize single request using shared session"""
@@ -750,6 +801,7 @@ class DiaTTSProvider(BaseTTSProvider):
                     with open(output_path, "wb") as f:
                         f.write(response.content)
                     
+                    self._mark_fallback_output(output_path, False)
                     logger.debug(f"DiaTTS batch request {request_id} successful")
                     return True
                     
@@ -766,30 +818,26 @@ class DiaTTSProvider(BaseTTSProvider):
             logger.error(f"DiaTTS batch request {request_id} failed after all attempts")
             return False
         
-        try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all tasks
-                future_to_id = {}
-                for i, (text, output_path) in enumerate(tts_requests):
-                    request_id = f"dia_batch_{i}"
-                    future = executor.submit(synthesize_with_session, request_id, text, output_path)
-                    future_to_id[future] = request_id
-                
-                # Collect results as they complete
-                for future in concurrent.futures.as_completed(future_to_id, timeout=600):  # 10 minutes total
-                    request_id = future_to_id[future]
-                    try:
-                        success = future.result(timeout=180)  # 3 minutes per request
-                        results[request_id] = success
-                    except concurrent.futures.TimeoutError:
-                        logger.error(f"DiaTTS batch request {request_id} timed out")
-                        results[request_id] = False
-                    except Exception as e:
-                        logger.error(f"DiaTTS batch request {request_id} failed: {e}")
-                        results[request_id] = False
-        
-        finally:
-            session.close()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all tasks
+            future_to_id = {}
+            for i, (text, output_path) in enumerate(tts_requests):
+                request_id = f"dia_batch_{i}"
+                future = executor.submit(synthesize_with_session, request_id, text, output_path)
+                future_to_id[future] = request_id
+            
+            # Collect results as they complete
+            for future in concurrent.futures.as_completed(future_to_id, timeout=600):  # 10 minutes total
+                request_id = future_to_id[future]
+                try:
+                    success = future.result(timeout=180)  # 3 minutes per request
+                    results[request_id] = success
+                except concurrent.futures.TimeoutError:
+                    logger.error(f"DiaTTS batch request {request_id} timed out")
+                    results[request_id] = False
+                except Exception as e:
+                    logger.error(f"DiaTTS batch request {request_id} failed: {e}")
+                    results[request_id] = False
         
         successful = sum(1 for success in results.values() if success)
         logger.info(f"DiaTTS optimized batch synthesis completed: {successful}/{len(tts_requests)} successful")
@@ -807,6 +855,8 @@ class DiaTTSProvider(BaseTTSProvider):
                     failed_requests.append((text, output_path))
             
             if failed_requests:
+                for _, output_path in failed_requests:
+                    self._mark_fallback_output(output_path, True)
                 fallback_results = fallback.synthesize_batch(failed_requests, max_workers=max_workers)
                 # Update results
                 failed_idx = 0
@@ -858,6 +908,102 @@ class DiaTTSProvider(BaseTTSProvider):
         return "dia"
 
 
+class CachedTTSProvider(BaseTTSProvider):
+    """Disk-backed audio cache in front of another TTS provider
+    
+    Audio is keyed on the normalized narration text, the provider name and
+    the provider's synthesis parameters, so unchanged scenes are copied from
+    the cache instead of being voiced again.
+    """
+    
+    def __init__(self, provider: BaseTTSProvider, cache: Optional[FileCache] = None):
+        super().__init__(provider.config)
+        self.provider = provider
+        self.cache = cache or get_tts_cache()
+        self._stats_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        
+        # Keep the engine's optimized batch path available for providers that have one
+        if hasattr(provider, "synthesize_batch_optimized"):
+            self.synthesize_batch_optimized = self._synthesize_batch_optimized
+    
+    def __getattr__(self, name: str):
+        # Only called for attributes the wrapper does not define itself
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+    
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+    
+    def get_cache_params(self) -> Dict[str, Any]:
+        return self.provider.get_cache_params()
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counts for this provider"""
+        with self._stats_lock:
+            return self.cache_stats.copy()
+    
+    def _cache_key(self, text: str) -> str:
+        return tts_cache_key(text, self.provider.get_provider_name(), self.provider.get_cache_params())
+    
+    def _fetch(self, key: str, output_path: Path) -> bool:
+        """Copy cached audio to output_path and count the lookup"""
+        hit = self.cache.fetch(key, output_path)
+        with self._stats_lock:
+            self.cache_stats["hits" if hit else "misses"] += 1
+        if hit:
+            logger.info(f"✓ TTS cache hit: {output_path} ({key[:12]})")
+        return hit
+    
+    def _store(self, key: str, output_path: Path):
+        """Cache freshly synthesized audio unless it is placeholder output"""
+        if not self.provider.is_cacheable_output(output_path):
+            logger.info(f"Not caching fallback audio for {output_path}")
+            return
+        if output_path.exists():
+            self.cache.put(key, output_path)
+    
+    def synthesize(self, text: str, output_path: Path) -> bool:
+        """Synthesize text, reusing cached audio when available"""
+        key = self._cache_key(text)
+        if self._fetch(key, output_path):
+            return True
+        
+        success = self.provider.synthesize(text, output_path)
+        if success:
+            self._store(key, output_path)
+        return success
+    
+    def _synthesize_batch_optimized(self, tts_requests: List[Tuple[str, Path]], max_workers: int = 6) -> Dict[str, bool]:
+        """Serve cached requests directly and send only the misses to the provider's batch path"""
+        results = {}
+        misses = []
+        for i, (text, output_path) in enumerate(tts_requests):
+            key = self._cache_key(text)
+            if self._fetch(key, output_path):
+                results[f"dia_batch_{i}"] = True
+            else:
+                misses.append((i, key, text, output_path))
+        
+        if not misses:
+            return results
+        
+        miss_results = self.provider.synthesize_batch_optimized(
+            [(text, output_path) for _, _, text, output_path in misses],
+            max_workers=max_workers
+        )
+        
+        # Map the provider's request ids back to the caller's positions
+        for j, (i, key, text, output_path) in enumerate(misses):
+            success = miss_results.get(f"dia_batch_{j}", False)
+            results[f"dia_batch_{i}"] = success
+            if success:
+                self._store(key, output_path)
+        
+        return results
+
+
 class TTSProviderFactory:
     """Factory for creating TTS providers"""
     
@@ -876,7 +1022,12 @@ class TTSProviderFactory:
             raise ValueError(f"Unknown TTS provider: {provider_type}")
         
         provider_class = cls._providers[provider_type]
-        return provider_class(config)
+        provider = provider_class(config)
+        
+        # Mock audio is free to produce, so only remote providers are cached
+        if config.use_cache and provider_type != TTSProvider.MOCK:
+            provider = CachedTTSProvider(provider)
+        return provider
     
     @classmethod
     def get_available_providers(cls) -> List[str]:
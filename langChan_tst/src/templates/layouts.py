@@ -17,6 +17,11 @@ class TemplateScene(Scene):
     """
     Base class for video templates. Provides helpers for fitted textboxes and narration display.
     """
+    narration_text = ""
+    audio_duration = 0
+    # Set by the engine when muxing holds the last frame for the rest of the narration
+    external_hold = False
+
     def create_textbox(self, text_str: str, width: float, height: float, font_size: int = 48) -> VGroup:
         text = Text(text_str, font_size=font_size)
         if text.width > width or text.height > height:
@@ -24,7 +29,7 @@ class TemplateScene(Scene):
             text.scale(scale_factor)
         return text
 
-    def display_narration(self, narration_text: str, audio_duration: float) -> None:
+    def display_narration(self, narration_text: str, audio_duration: float, hold: bool = True) -> None:
         narration_box = Rectangle(
             width=self.camera.frame_width * 0.9,
             height=self.camera.frame_height * 0.2,
@@ -39,6 +44,9 @@ class TemplateScene(Scene):
         ).move_to(narration_box.get_center())
         narration_group = VGroup(narration_box, narration_content)
         self.play(FadeIn(narration_group))
+        if not hold:
+            # Leave the narration on screen as the final frame
+            return
         self.wait(audio_duration)
         self.play(FadeOut(narration_group))
 
@@ -50,7 +58,7 @@ class TemplateScene(Scene):
         audio_duration = getattr(self, 'audio_duration', 0)
         self.construct_scene()
         if narration_text and audio_duration > 0:
-            self.display_narration(narration_text, audio_duration)
+            self.display_narration(narration_text, audio_duration, hold=not getattr(self, 'external_hold', False))
         else:
             self.wait(1)
 
@@ -0,0 +1,360 @@
+"""
+Content-addressed caching utilities
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import sys
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import (
+    PROJECT_ROOT, RENDER_CACHE_DIR, RENDER_CACHE_MAX_MB, TTS_CACHE_DIR, TTS_CACHE_MAX_MB,
+    LLM_CACHE_DIR, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_HOURS, LLM_CACHE_MEMORY_ENTRIES
+)
+
+logger = logging.getLogger(__name__)
+
+
+def hash_key(*parts: Any) -> str:
+    """Build a stable sha256 key from an ordered list of parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        # Length-prefix every part so ("ab", "c") and ("a", "bc") differ
+        digest.update(f"{len(data)}:".encode("ascii"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class FileCache:
+    """Content-addressed file store with size-capped LRU eviction
+
+    Entries are plain files named after their key. A hit refreshes the file's
+    mtime, and eviction removes the least recently used files first, so the
+    cache can be shared by several processes without a separate index.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, suffix: str = ""):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def _increment(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            # Touch on hit so LRU eviction sees the access
+            os.utime(path, None)
+        except OSError:
+            self._increment("misses")
+            return None
+
+        self._increment("hits")
+        return path
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        """Copy the cached file for key to destination"""
+        path = self.get(key)
+        if path is None:
+            return False
+
+        try:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, destination)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not copy cache entry {key[:12]} to {destination}: {e}")
+            return False
+
+    def contains(self, key: str) -> bool:
+        """Check for an entry without counting a hit or miss"""
+        return self._entry_path(key).exists()
+
+    def put(self, key: str, source: Path) -> Optional[Path]:
+        """Store a copy of source under key and evict old entries if over the size cap"""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store cache entry {key[:12]} from {source}: {e}")
+            return None
+
+        self._increment("stores")
+        self._evict()
+        return path
+
+    def read_text(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on a miss"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def write_text(self, key: str, text: str) -> Optional[Path]:
+        """Store text under key"""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store cache entry {key[:12]}: {e}")
+            return None
+
+        self._increment("stores")
+        self._evict()
+        return path
+
+    def remove(self, key: str):
+        """Drop the entry for key if present"""
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total_size = 0
+        for path in self.cache_dir.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_bytes:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total_size -= size
+                self._increment("evictions")
+                logger.debug(f"Evicted cache entry: {path.name}")
+            except OSError:
+                continue
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._lock:
+            return self.stats.copy()
+
+
+class ResponseCache:
+    """LLM response cache with an in-memory LRU front and a disk-backed store
+
+    Responses expire ttl_seconds after they were generated; hits do not
+    extend that lifetime, only the LRU position.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, ttl_seconds: float,
+                 memory_entries: int = 256):
+        self.disk = FileCache(cache_dir, max_bytes, suffix=".json")
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0,
+                      "discarded": 0}
+
+    @staticmethod
+    def make_key(model: str, system_prompt: Optional[str], user_prompt: str,
+                 generation_config: Dict[str, Any]) -> str:
+        """Key a response by everything that was sent to the model"""
+        return hash_key("llm-response-v1", model, system_prompt or "", user_prompt, generation_config)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, text: str):
+        # Caller holds self._lock
+        self._memory[key] = (created_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._is_expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        raw = self.disk.read_text(key)
+        if raw is not None:
+            try:
+                payload = json.loads(raw)
+                created_at, text = float(payload["created_at"]), payload["text"]
+            except (ValueError, KeyError, TypeError):
+                created_at, text = 0.0, None
+
+            if text is not None and not self._is_expired(created_at):
+                with self._lock:
+                    self._remember(key, created_at, text)
+                    self.stats["disk_hits"] += 1
+                return text
+
+            self.disk.remove(key)
+            with self._lock:
+                self.stats["expired"] += 1
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, text: str, model: str = ""):
+        """Store a response in memory and on disk"""
+        created_at = time.time()
+        payload = {"created_at": created_at, "model": model, "text": text}
+        with self._lock:
+            self._remember(key, created_at, text)
+            self.stats["stores"] += 1
+        self.disk.write_text(key, json.dumps(payload))
+
+    def discard(self, key: str):
+        """Drop a response whose output turned out to be unusable, so the next request asks the model again"""
+        with self._lock:
+            self._memory.pop(key, None)
+            self.stats["discarded"] += 1
+        self.disk.remove(key)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._lock:
+            return self.stats.copy()
+
+
+# ============================================================================
+# SHARED CACHES
+# ============================================================================
+
+_shared_caches: Dict[str, FileCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+_llm_cache: Optional[ResponseCache] = None
+
+
+def _get_shared_cache(name: str, cache_dir: Path, max_mb: int, suffix: str) -> FileCache:
+    """Get or create a process-wide cache instance"""
+    with _shared_caches_lock:
+        if name not in _shared_caches:
+            _shared_caches[name] = FileCache(cache_dir, max_mb * 1024 * 1024, suffix=suffix)
+        return _shared_caches[name]
+
+
+def get_llm_cache() -> ResponseCache:
+    """Get the process-wide LLM response cache"""
+    global _llm_cache
+    with _shared_caches_lock:
+        if _llm_cache is None:
+            _llm_cache = ResponseCache(
+                LLM_CACHE_DIR,
+                LLM_CACHE_MAX_MB * 1024 * 1024,
+                ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+                memory_entries=LLM_CACHE_MEMORY_ENTRIES
+            )
+        return _llm_cache
+
+
+# ============================================================================
+# RENDER CACHE
+# ============================================================================
+
+RENDER_TEMPLATE_FILES = [
+    PROJECT_ROOT / "src" / "templates" / "layouts.py",
+    PROJECT_ROOT / "manim_layout_manager.py",
+]
+
+
+@lru_cache(maxsize=1)
+def get_manim_version() -> str:
+    """Get the installed Manim version without importing manim"""
+    try:
+        from importlib.metadata import version
+        return version("manim")
+    except Exception:
+        return "unknown"
+
+
+def render_cache_key(scene_code: str, manim_args: List[str]) -> str:
+    """Key a render by its code, render arguments, template sources and Manim version"""
+    template_sources = []
+    for template_file in RENDER_TEMPLATE_FILES:
+        try:
+            template_sources.append(template_file.read_bytes())
+        except OSError:
+            template_sources.append(b"")
+
+    return hash_key("manim-render-v1", scene_code, list(manim_args), *template_sources, get_manim_version())
+
+
+def get_render_cache() -> FileCache:
+    """Get the process-wide render cache"""
+    return _get_shared_cache("render", RENDER_CACHE_DIR, RENDER_CACHE_MAX_MB, ".mp4")
+
+
+# ============================================================================
+# TTS CACHE
+# ============================================================================
+
+def normalize_tts_text(text: str) -> str:
+    """Normalize narration so whitespace-only edits still hit the cache"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def tts_cache_key(text: str, provider_name: str, params: Dict[str, Any]) -> str:
+    """Key synthesized audio by its text, provider and synthesis parameters"""
+    return hash_key("tts-v1", normalize_tts_text(text), provider_name, params)
+
+
+def get_tts_cache() -> FileCache:
+    """Get the process-wide TTS audio cache"""
+    return _get_shared_cache("tts", TTS_CACHE_DIR, TTS_CACHE_MAX_MB, ".audio")
@@ -0,0 +1,304 @@
+"""
+Rule-based fixes for common Manim scene errors, tried before LLM correction
+"""
+
+import ast
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rule-fix rounds allowed per scene before only the LLM is asked
+MAX_RULE_FIXES = 3
+
+# Names that generated code commonly gets wrong, mapped to what Manim exports
+NAME_ALIASES = {
+    "BLUE_C": "BLUE",
+    "GREEN_C": "GREEN",
+    "ORANGE_C": "ORANGE",
+    "RED_C": "RED",
+    "PURPLE_C": "PURPLE",
+    "YELLOW_C": "YELLOW",
+    "ShowCreation": "Create",
+    "TextMobject": "Tex",
+    "TexMobject": "MathTex",
+    "TexText": "Tex",
+    "OldTex": "Tex",
+    "OldTexText": "Tex",
+    "CONFIG_COLOR": "WHITE",
+}
+
+# Module-level names that need an import rather than a rename
+MISSING_IMPORTS = {
+    "np": "import numpy as np",
+    "numpy": "import numpy",
+    "math": "import math",
+    "random": "import random",
+    "itertools": "import itertools",
+}
+
+# Added when a capitalized name is undefined, which usually means Manim was never imported
+MANIM_IMPORT = "from manim import *"
+
+# Text-like mobjects and keyword mistakes made when constructing them
+TEXT_CLASSES = {"Text", "MarkupText", "Tex", "MathTex", "Paragraph", "Title"}
+TEXT_KEYWORD_RENAMES = {
+    "size": "font_size",
+    "fontsize": "font_size",
+    "text_size": "font_size",
+    "text_color": "color",
+    "font_color": "color",
+    "fill": "fill_color",
+}
+
+
+# ============================================================================
+# SOURCE EDITS
+# ============================================================================
+
+@dataclass
+class _Edit:
+    """Replace source between two (line, byte column) positions"""
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+    text: str
+
+
+def _apply_edits(code: str, edits: List[_Edit]) -> str:
+    """Apply position-based edits so untouched code keeps its formatting and comments
+
+    ast columns are UTF-8 byte offsets, so edits are applied to encoded lines.
+    """
+    lines = [line.encode("utf-8") for line in code.split("\n")]
+    for edit in sorted(edits, key=lambda edit: edit.start, reverse=True):
+        (start_line, start_col), (end_line, end_col) = edit.start, edit.end
+        head = lines[start_line - 1][:start_col]
+        tail = lines[end_line - 1][end_col:]
+        lines[start_line - 1:end_line] = (head + edit.text.encode("utf-8") + tail).split(b"\n")
+    return "\n".join(line.decode("utf-8") for line in lines)
+
+
+def _span(node: ast.AST) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    return (node.lineno, node.col_offset), (node.end_lineno, node.end_col_offset)
+
+
+def _insert_import(code: str, tree: ast.Module, statement: str) -> str:
+    """Add an import after the existing top-level imports"""
+    last_import = 0
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            last_import = node.end_lineno
+        elif not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)) and last_import:
+            break
+    lines = code.split("\n")
+    lines.insert(last_import, statement)
+    return "\n".join(lines)
+
+
+# ============================================================================
+# RULE REGISTRY
+# ============================================================================
+
+@dataclass
+class FixResult:
+    """Code rewritten by the rules that fired and the error lines they matched"""
+    code: str
+    rules: List[str]
+    signatures: Dict[str, List[str]]
+
+
+@dataclass
+class FixRule:
+    """A stderr signature and the rewrite that fixes it"""
+    name: str
+    pattern: re.Pattern
+    fix: Callable[[str, ast.Module, re.Match], Optional[str]]
+
+
+_rules: List[FixRule] = []
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def register_fixer(name: str, pattern: str):
+    """Register a fixer for errors matching pattern
+
+    The fixer gets the code, its parsed tree and the match, and returns the
+    rewritten code or None when it does not apply.
+    """
+    def decorator(fix: Callable[[str, ast.Module, re.Match], Optional[str]]):
+        _rules.append(FixRule(name, re.compile(pattern, re.MULTILINE), fix))
+        with _stats_lock:
+            _stats.setdefault(name, {"fired": 0, "resolved": 0, "unresolved": 0})
+        return fix
+    return decorator
+
+
+def get_fix_rules() -> List[FixRule]:
+    return list(_rules)
+
+
+def apply_fixes(code: str, error: str) -> Optional[FixResult]:
+    """Apply every rule whose signature appears in the error output
+
+    Returns None when no rule changed the code. Fixes that would not parse
+    are dropped.
+    """
+    if not error:
+        return None
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    signatures: Dict[str, List[str]] = {}
+    current = code
+    for rule in _rules:
+        for match in rule.pattern.finditer(error):
+            try:
+                fixed = rule.fix(current, tree, match)
+            except Exception as e:
+                logger.debug(f"Fixer {rule.name} failed: {e}")
+                continue
+            if fixed is None or fixed == current:
+                continue
+            try:
+                tree = ast.parse(fixed)
+            except SyntaxError:
+                logger.debug(f"Fixer {rule.name} produced invalid code, skipping")
+                continue
+            current = fixed
+            signatures.setdefault(rule.name, []).append(match.group(0))
+
+    if not signatures:
+        return None
+
+    with _stats_lock:
+        for name in signatures:
+            _stats[name]["fired"] += 1
+    return FixResult(current, list(signatures), signatures)
+
+
+def record_fix_outcome(fix: FixResult, error: Optional[str]) -> Dict[str, bool]:
+    """Record, per rule, whether the error it fired on is gone from the next run
+
+    error is the next failure's output, or None when the next run succeeded.
+    """
+    outcome = {
+        name: error is None or not any(signature in error for signature in signatures)
+        for name, signatures in fix.signatures.items()
+    }
+    with _stats_lock:
+        for name, resolved in outcome.items():
+            _stats[name]["resolved" if resolved else "unresolved"] += 1
+    return outcome
+
+
+def get_fixer_stats() -> Dict[str, Dict[str, int]]:
+    """Per-rule counts of how often each fired and whether that resolved the error"""
+    with _stats_lock:
+        return {name: counts.copy() for name, counts in _stats.items()}
+
+
+def reset_fixer_stats():
+    with _stats_lock:
+        for counts in _stats.values():
+            for key in counts:
+                counts[key] = 0
+
+
+# ============================================================================
+# RULES
+# ============================================================================
+
+@register_fixer("name_alias", r"NameError: name '(\w+)' is not defined")
+def _fix_name_alias(code: str, tree: ast.Module, match: re.Match) -> Optional[str]:
+    """Rename outdated or invented Manim names"""
+    replacement = NAME_ALIASES.get(match.group(1))
+    if replacement is None:
+        return None
+    edits = [
+        _Edit(*_span(node), replacement)
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and node.id == match.group(1)
+    ]
+    return _apply_edits(code, edits) if edits else None
+
+
+@register_fixer("missing_import", r"NameError: name '(\w+)' is not defined")
+def _fix_missing_import(code: str, tree: ast.Module, match: re.Match) -> Optional[str]:
+    """Add the import for a well-known module alias, or Manim itself"""
+    name = match.group(1)
+    imported = {
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    }
+    if name in MISSING_IMPORTS:
+        statement = MISSING_IMPORTS[name]
+    elif name not in NAME_ALIASES and name[:1].isupper():
+        # Capitalized names and constants usually come from Manim's star import
+        statement = MANIM_IMPORT
+    else:
+        return None
+    if statement in imported:
+        return None
+    return _insert_import(code, tree, statement)
+
+
+@register_fixer(
+    "uncalled_method",
+    r"(?:'method'|bound method \w+\.(\w+)|'builtin_function_or_method')"
+)
+def _fix_uncalled_method(code: str, tree: ast.Module, match: re.Match) -> Optional[str]:
+    """Call getter methods that were referenced without parentheses, e.g. obj.get_center + UP"""
+    wanted = match.group(1)
+    # Call targets are already called; call arguments may be intentional callbacks
+    skipped = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            skipped.add(id(node.func))
+            skipped.update(id(argument) for argument in node.args)
+            skipped.update(id(keyword.value) for keyword in node.keywords)
+
+    edits = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load) and id(node) not in skipped
+                and (node.attr == wanted if wanted else node.attr.startswith("get_"))):
+            end = (node.end_lineno, node.end_col_offset)
+            edits.append(_Edit(end, end, "()"))
+    return _apply_edits(code, edits) if edits else None
+
+
+@register_fixer("text_keyword", r"__init__\(\) got an unexpected keyword argument '(\w+)'")
+def _fix_text_keyword(code: str, tree: ast.Module, match: re.Match) -> Optional[str]:
+    """Rename or drop keyword arguments that text mobjects do not accept
+
+    Text forwards unknown keywords up to Mobject, so the error names a base
+    class; any text call carrying the rejected keyword is rewritten.
+    """
+    keyword_name = match.group(1)
+    replacement = TEXT_KEYWORD_RENAMES.get(keyword_name)
+    edits = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TEXT_CLASSES):
+            continue
+        arguments = node.args + node.keywords
+        for keyword in node.keywords:
+            if keyword.arg != keyword_name:
+                continue
+            start = (keyword.lineno, keyword.col_offset)
+            if replacement and replacement not in {other.arg for other in node.keywords}:
+                edits.append(_Edit(start, (keyword.lineno, keyword.col_offset + len(keyword_name)), replacement))
+                continue
+            # Drop the argument together with the comma that separates it from its neighbour
+            position = arguments.index(keyword)
+            if position > 0:
+                previous = arguments[position - 1]
+                edits.append(_Edit((previous.end_lineno, previous.end_col_offset), _span(keyword)[1], ""))
+            elif len(arguments) > 1:
+                edits.append(_Edit(start, (arguments[1].lineno, arguments[1].col_offset), ""))
+            else:
+                edits.append(_Edit(*_span(keyword), ""))
+    return _apply_edits(code, edits) if edits else None
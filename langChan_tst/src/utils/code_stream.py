@@ -0,0 +1,136 @@
+"""
+Early checks on Manim code while it streams from the LLM
+"""
+
+import codeop
+import re
+import textwrap
+import warnings
+from typing import List
+import logging
+
+import sys
+from pathlib import Path
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import CODE_STREAM_MAX_CHARS, CODE_STREAM_REPEAT_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Longest repeated block of lines looked for when detecting runaway output
+MAX_REPEAT_BLOCK_LINES = 8
+
+# Re-parse the streamed prefix after this many new lines
+SYNTAX_CHECK_INTERVAL = 5
+
+_class_pattern = re.compile(r"^\s*class\s+\w+\s*[(:]")
+_scene_method_pattern = re.compile(r"^\s*def\s+(construct|construct_scene)\s*\(")
+
+
+class StreamAborted(Exception):
+    """A streamed response was cut off because it had clearly gone wrong"""
+
+    def __init__(self, reason: str, text: str = ""):
+        super().__init__(reason)
+        self.reason = reason
+        self.text = text
+
+
+class CodeStreamMonitor:
+    """Check streamed code line by line and abort as soon as it goes wrong
+
+    In "body" mode only the body of construct_scene was requested, so a
+    class or scene method definition means the model ignored the template.
+    Every completed line is also checked for syntax errors that no further
+    text could fix (incomplete blocks and indentation quirks are tolerated,
+    since the engine re-indents body code), for runaway repetition and for
+    an overall length cap.
+    """
+
+    def __init__(self, mode: str = "body", max_chars: int = CODE_STREAM_MAX_CHARS,
+                 repeat_limit: int = CODE_STREAM_REPEAT_LIMIT):
+        self.mode = mode
+        self.max_chars = max_chars
+        self.repeat_limit = repeat_limit
+        self.text = ""
+        self._checked_lines = 0
+        self._syntax_checked_lines = 0
+        self._fence_closed = False
+
+    def feed(self, chunk: str):
+        """Consume a chunk; raises StreamAborted when the output should be abandoned"""
+        self.text += chunk
+        if self.max_chars and len(self.text) > self.max_chars:
+            self._abort(f"response exceeded {self.max_chars} characters")
+
+        lines = self.text.split("\n")[:-1]  # The last line is still being written
+        if len(lines) == self._checked_lines:
+            return
+
+        for number in range(self._checked_lines, len(lines)):
+            self._check_line(lines[number], number + 1)
+        self._checked_lines = len(lines)
+
+        if self._fence_closed:
+            return
+        self._check_repetition(lines)
+        if len(lines) - self._syntax_checked_lines >= SYNTAX_CHECK_INTERVAL:
+            self._syntax_checked_lines = len(lines)
+            self._check_syntax(lines)
+
+    def _abort(self, reason: str):
+        logger.warning(f"Aborting streamed code generation: {reason}")
+        raise StreamAborted(reason, self.text)
+
+    def _check_line(self, line: str, number: int):
+        if self._fence_closed:
+            return
+        if line.strip() == "```" and number > 1:
+            # Anything after the closing fence is ignored by the engine
+            self._fence_closed = True
+            return
+        if self.mode == "body":
+            if _class_pattern.match(line):
+                self._abort(f"line {number} defines a class, but only the construct_scene body was requested")
+            if _scene_method_pattern.match(line):
+                self._abort(f"line {number} defines a scene method, but only its body was requested")
+
+    def _check_repetition(self, lines: List[str]):
+        """Detect the same block of lines repeated back to back"""
+        tail = [line.strip() for line in lines[-MAX_REPEAT_BLOCK_LINES * self.repeat_limit:]]
+        for size in range(1, MAX_REPEAT_BLOCK_LINES + 1):
+            span = size * self.repeat_limit
+            if len(tail) < span:
+                return
+            block = tail[-size:]
+            if len("".join(block)) < 4:
+                # Blank lines and lone brackets repeat legitimately
+                continue
+            if all(tail[-span + offset] == block[offset % size] for offset in range(span)):
+                self._abort(f"the last {size} line(s) repeated {self.repeat_limit} times")
+
+    def _code_lines(self, lines: List[str]) -> List[str]:
+        """Drop the opening markdown fence, if any"""
+        if lines and lines[0].lstrip().startswith("```"):
+            return lines[1:]
+        return lines
+
+    def _check_syntax(self, lines: List[str]):
+        source = textwrap.dedent("\n".join(self._code_lines(lines))) + "\n"
+        if not source.strip():
+            return
+        offset = 0
+        if self.mode == "body":
+            # Compile the body inside a method so return and yield are legal
+            source = "def _body(self):\n" + textwrap.indent(source, "    ")
+            offset = 1
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                codeop.compile_command(source, "<streamed>", "exec")
+        except IndentationError:
+            return
+        except (SyntaxError, ValueError, OverflowError) as e:
+            location = f" at line {e.lineno - offset}" if getattr(e, "lineno", None) else ""
+            self._abort(f"syntax error{location}: {getattr(e, 'msg', e)}")
@@ -0,0 +1,73 @@
+"""
+In-process publish/subscribe of job and script events for server-sent event streams
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Hashable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# Events held per subscriber before the oldest are dropped; every event is a
+# full snapshot, so a slow client only misses intermediate states
+MAX_QUEUED_EVENTS = 100
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class EventBroker:
+    """Fan out events published from any thread to asyncio subscribers
+
+    Each subscriber gets its own queue bound to the event loop it subscribed
+    from; publish hands events to that loop thread-safely, so job updates
+    applied by the job pool's listener thread reach open streams directly.
+    """
+
+    def __init__(self, max_queued: int = MAX_QUEUED_EVENTS):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Hashable, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, key: Hashable) -> asyncio.Queue:
+        """Start receiving events for key; call from the event loop that will read the queue"""
+        queue = asyncio.Queue(maxsize=self.max_queued)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, key: Hashable, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = [s for s in self._subscribers.get(key, []) if s[1] is not queue]
+            if subscribers:
+                self._subscribers[key] = subscribers
+            else:
+                self._subscribers.pop(key, None)
+
+    def publish(self, key: Hashable, event: str, data: Any):
+        """Send an event to every subscriber of key"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, []))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has closed; it will never read again
+                self.unsubscribe(key, queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, item: Tuple[str, Any]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
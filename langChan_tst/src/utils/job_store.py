@@ -0,0 +1,356 @@
+"""
+SQLite-backed store for API scripts and generation jobs
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+import sys
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import JOB_STORE_PATH, JOB_STORE_TTL_HOURS
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states are never expired and are failed if the server restarts
+ACTIVE_STATUSES = ("pending", "running")
+
+# Job columns that update_job may set, and those stored as JSON
+JOB_FIELDS = ("status", "progress", "message", "result", "error", "details")
+JSON_FIELDS = ("result", "details")
+
+# Expired rows are purged on a write at most this often
+PURGE_INTERVAL = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scripts (
+    token TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'ready',
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scripts_updated_at ON scripts (updated_at);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    token TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    details TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+CREATE INDEX IF NOT EXISTS jobs_token ON jobs (token);
+"""
+
+# Columns added after the first release of the store: (table, column, definition)
+_ADDED_COLUMNS = [
+    ("jobs", "details", "TEXT"),
+    ("scripts", "status", "TEXT NOT NULL DEFAULT 'ready'"),
+    ("scripts", "error", "TEXT"),
+]
+
+
+_UPSERT_SCRIPT = (
+    "INSERT INTO scripts (token, data, status, error, created_at, updated_at) "
+    "VALUES (?, ?, 'ready', NULL, ?, ?) "
+    "ON CONFLICT (token) DO UPDATE SET data = excluded.data, status = 'ready', error = NULL, "
+    "updated_at = excluded.updated_at"
+)
+
+
+def _job_row(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    for name in JSON_FIELDS:
+        if job[name] is not None:
+            job[name] = json.loads(job[name])
+    return job
+
+
+class JobStore:
+    """Scripts and jobs in a WAL-mode SQLite database
+
+    Each thread gets its own connection, and every write is a single
+    transaction, so the API, its job update listener and other processes
+    can write concurrently. Listing and lookups go through indexes on
+    created_at, (status, created_at) and the primary keys. Scripts and
+    finished jobs expire ttl_seconds after their last update.
+    """
+
+    def __init__(self, db_path: Path = JOB_STORE_PATH,
+                 ttl_seconds: float = JOB_STORE_TTL_HOURS * 3600):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        for table, column, definition in _ADDED_COLUMNS:
+            if column not in {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connect())
+
+    def _cutoff(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.ttl_seconds
+
+    def _maybe_purge(self):
+        if time.time() - self._last_purge >= PURGE_INTERVAL:
+            self.purge_expired()
+
+    # ------------------------------------------------------------------
+    # Scripts
+    # ------------------------------------------------------------------
+
+    def put_script(self, token: str, data: Dict[str, Any]):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(_UPSERT_SCRIPT, (token, json.dumps(data), now, now))
+        self._maybe_purge()
+
+    def reserve_script(self, token: str):
+        """Register a token whose script is still being generated"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO scripts (token, data, status, created_at, updated_at) "
+                "VALUES (?, 'null', 'pending', ?, ?)",
+                (token, now, now)
+            )
+        self._maybe_purge()
+
+    def complete_script(self, token: str, data: Dict[str, Any]) -> bool:
+        """Store the generated script for a pending token
+
+        Returns False if the token is no longer pending, e.g. because the
+        user saved their own script first; that script is kept.
+        """
+        with self._transaction() as conn:
+            return bool(conn.execute(
+                "UPDATE scripts SET data = ?, status = 'ready', updated_at = ? "
+                "WHERE token = ? AND status = 'pending'",
+                (json.dumps(data), time.time(), token)
+            ).rowcount)
+
+    def fail_script(self, token: str, error: str) -> bool:
+        """Record that a pending token's script could not be generated"""
+        with self._transaction() as conn:
+            return bool(conn.execute(
+                "UPDATE scripts SET status = 'failed', error = ?, updated_at = ? "
+                "WHERE token = ? AND status = 'pending'",
+                (error, time.time(), token)
+            ).rowcount)
+
+    def get_script(self, token: str) -> Optional[Dict[str, Any]]:
+        """The script for token, or None if it is unknown, expired or not ready"""
+        row = self._connect().execute(
+            "SELECT data FROM scripts WHERE token = ? AND status = 'ready' AND updated_at >= ?",
+            (token, self._cutoff())
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_script_status(self, token: str) -> Optional[Dict[str, Any]]:
+        """Status ("pending", "ready" or "failed"), error and script for token, or None if unknown"""
+        row = self._connect().execute(
+            "SELECT status, error, data FROM scripts WHERE token = ? AND updated_at >= ?",
+            (token, self._cutoff())
+        ).fetchone()
+        if row is None:
+            return None
+        return {"token": token, "status": row["status"], "error": row["error"],
+                "script": json.loads(row["data"]) if row["status"] == "ready" else None}
+
+    def update_script(self, token: str,
+                      merge: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Replace a script with merge(current) atomically
+
+        current is None for a new, expired or not yet generated token; the
+        merged script then takes the place of the pending generation. An
+        exception from merge leaves the stored script unchanged.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM scripts WHERE token = ? AND status = 'ready' AND updated_at >= ?",
+                (token, self._cutoff(now))
+            ).fetchone()
+            data = merge(json.loads(row["data"]) if row else None)
+            conn.execute(_UPSERT_SCRIPT, (token, json.dumps(data), now, now))
+        return data
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def create_job(self, job_id: str, status: str = "pending", message: str = "",
+                   token: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, token, status, progress, message, created_at, updated_at) "
+                "VALUES (?, ?, ?, 0, ?, ?, ?)",
+                (job_id, token, status, message, now, now)
+            )
+        self._maybe_purge()
+        return self.get_job(job_id)
+
+    def update_job(self, job_id: str, **updates) -> Optional[Dict[str, Any]]:
+        """Set job fields in one statement and return the updated job, or None if it does not exist"""
+        unknown = set(updates) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        for name in JSON_FIELDS:
+            if updates.get(name) is not None:
+                updates[name] = json.dumps(updates[name])
+
+        columns = ", ".join(f"{name} = ?" for name in updates)
+        assignments = f"{columns}, updated_at = ?" if columns else "updated_at = ?"
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                (*updates.values(), time.time(), job_id)
+            )
+            if not cursor.rowcount:
+                return None
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _job_row(row)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _job_row(row) if row else None
+
+    def list_jobs(self, limit: int = 50, status: Optional[str] = None,
+                  token: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent jobs first, optionally only those with a given status or script token"""
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if token is not None:
+            conditions.append("token = ?")
+            params.append(token)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM jobs {where}ORDER BY created_at DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [_job_row(row) for row in rows]
+
+    def count_jobs(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self._connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)
+        ).fetchone()[0]
+
+    def delete_job(self, job_id: str) -> bool:
+        with self._transaction() as conn:
+            return bool(conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def fail_interrupted_jobs(self) -> int:
+        """Fail jobs left pending or running by a previous server process"""
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._transaction() as conn:
+            count = conn.execute(
+                f"UPDATE jobs SET status = 'failed', progress = 100, message = ?, error = ?, "
+                f"updated_at = ? WHERE status IN ({placeholders})",
+                ("Interrupted by server restart", "Server restarted before the job finished",
+                 time.time(), *ACTIVE_STATUSES)
+            ).rowcount
+        if count:
+            logger.warning(f"Marked {count} interrupted job(s) as failed")
+        return count
+
+    def fail_interrupted_scripts(self) -> int:
+        """Fail script generations left pending by a previous server process"""
+        with self._transaction() as conn:
+            count = conn.execute(
+                "UPDATE scripts SET status = 'failed', error = ?, updated_at = ? WHERE status = 'pending'",
+                ("Server restarted before the script was generated", time.time())
+            ).rowcount
+        if count:
+            logger.warning(f"Marked {count} interrupted script generation(s) as failed")
+        return count
+
+    def purge_expired(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Delete scripts and finished jobs not updated within the TTL"""
+        cutoff = self._cutoff(now)
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with self._transaction() as conn:
+            scripts = conn.execute("DELETE FROM scripts WHERE updated_at < ?", (cutoff,)).rowcount
+            jobs = conn.execute(
+                f"DELETE FROM jobs WHERE updated_at < ? AND status NOT IN ({placeholders})",
+                (cutoff, *ACTIVE_STATUSES)
+            ).rowcount
+        self._last_purge = time.time()
+        if scripts or jobs:
+            logger.info(f"Purged {scripts} expired script(s) and {jobs} expired job(s)")
+        return {"scripts": scripts, "jobs": jobs}
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Transaction:
+    """Write transaction around a block, rolling back if it raises
+
+    BEGIN IMMEDIATE takes the write lock up front, so a read-modify-write
+    such as update_script cannot interleave with another writer.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Get the process-wide job store, opening the database on first use"""
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobStore()
+        return _job_store
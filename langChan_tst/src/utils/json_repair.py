@@ -0,0 +1,233 @@
+"""
+Local repair of malformed script JSON returned by the LLM
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from pydantic import ValidationError
+
+import sys
+from pathlib import Path
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.core.models import Scene, VideoScript
+from src.utils.json_stream import JSONArrayStreamParser
+
+logger = logging.getLogger(__name__)
+
+# Characters that may legally follow a backslash inside a JSON string
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_COMMAND_NAME = re.compile(r"[A-Za-z]+")
+# LaTeX commands that start with a JSON control escape letter; any other
+# \b, \f, \n, \r or \t is a real escape, even before a word
+_LATEX_COMMANDS = frozenset({
+    "backslash", "bar", "begin", "beta", "bf", "big", "bigcap", "bigcup", "bigl", "bigr", "binom",
+    "bmod", "boldsymbol", "bot", "bullet",
+    "flat", "forall", "frac", "frown",
+    "nabla", "ne", "nearrow", "neg", "neq", "newline", "nexists", "ni", "nmid", "not", "notin", "nu",
+    "rangle", "rbrace", "rceil", "rfloor", "rho", "right", "rightarrow", "rm", "rvert",
+    "tan", "tanh", "tau", "text", "textbf", "textit", "tfrac", "therefore", "theta", "tilde", "times",
+    "to", "top", "triangle", "tt",
+})
+_LITERALS = ("true", "false", "null")
+_title_pattern = re.compile(r'"title"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+@dataclass
+class ScriptParse:
+    """A script recovered from a response, with the repairs that were needed"""
+    script: VideoScript
+    repairs: List[str] = field(default_factory=list)
+    dropped_scenes: int = 0
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.repairs or self.dropped_scenes)
+
+    def report(self, retries: int = 0) -> Dict[str, Any]:
+        """Counters for the processing summary"""
+        return {
+            "repaired": self.repaired,
+            "repairs": list(self.repairs),
+            "dropped_scenes": self.dropped_scenes,
+            "retries": retries
+        }
+
+
+def _starts_value(text: str, index: int) -> bool:
+    """Check whether a JSON value (or the end of a container) starts at index"""
+    if index >= len(text):
+        return True
+    char = text[index]
+    if char in '"{[]}-' or char.isdigit():
+        return True
+    return text.startswith(_LITERALS, index)
+
+
+def _next_non_space(text: str, index: int) -> int:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def _closes_string(text: str, index: int) -> bool:
+    """Decide whether the quote at index ends its string or is an unescaped inner quote
+
+    A closing quote is followed by a colon, comma or bracket that leads into
+    more JSON; narration such as 'say "hi" to' continues with plain words.
+    """
+    after = _next_non_space(text, index + 1)
+    if after >= len(text) or text[after] in "}]":
+        return True
+    if text[after] in ",:":
+        return _starts_value(text, _next_non_space(text, after + 1))
+    return False
+
+
+def sanitize_json(text: str) -> Tuple[str, List[str]]:
+    """Fix trailing commas, unescaped quotes and raw control characters in strings
+
+    Returns the rewritten text and the names of the repairs applied.
+    """
+    out = []
+    repairs = set()
+    in_string = False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            if char == "\\":
+                following = text[index + 1:index + 2]
+                # Control escapes that spell a LaTeX command (\beta, \frac,
+                # \theta, \nabla, \rho) are LaTeX, and \u needs four hex digits
+                latex = following in "bfnrt" and \
+                    _COMMAND_NAME.match(text, index + 1).group() in _LATEX_COMMANDS
+                if following == "u":
+                    latex = not _HEX4.fullmatch(text[index + 2:index + 6])
+                if following and following in _VALID_ESCAPES and not latex:
+                    out.append(text[index:index + 2])
+                    index += 2
+                    continue
+                # A lone backslash, e.g. from LaTeX in narration
+                out.append("\\\\")
+                repairs.add("invalid_escapes")
+            elif char == '"':
+                if _closes_string(text, index):
+                    in_string = False
+                    out.append(char)
+                else:
+                    out.append('\\"')
+                    repairs.add("unescaped_quotes")
+            elif char in _CONTROL_ESCAPES:
+                out.append(_CONTROL_ESCAPES[char])
+                repairs.add("control_characters")
+            else:
+                out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char == "," and _next_non_space(text, index + 1) < len(text) \
+                and text[_next_non_space(text, index + 1)] in "}]":
+            repairs.add("trailing_commas")
+        else:
+            out.append(char)
+        index += 1
+    return "".join(out), sorted(repairs)
+
+
+def _document_body(text: str) -> Tuple[str, List[str]]:
+    """Cut the response down to the JSON object, dropping fences and surrounding prose"""
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("No JSON object in response")
+    repairs = []
+    preamble = text[:start].strip()
+    if preamble and not re.fullmatch(r"```(?:json)?", preamble, re.IGNORECASE):
+        repairs.append("leading_text")
+    return text[start:].rstrip(), repairs
+
+
+def _decode(body: str) -> Tuple[Any, str]:
+    """Decode the leading JSON value, returning it and whatever text follows"""
+    data, end = json.JSONDecoder().raw_decode(body)
+    return data, body[end:].strip()
+
+
+def _salvage_truncated(body: str) -> Optional[Dict[str, Any]]:
+    """Recover the title and every complete scene from a cut-off response"""
+    parser = JSONArrayStreamParser("scenes")
+    scenes = parser.feed(body)
+    if not scenes:
+        return None
+    match = _title_pattern.search(body)
+    title = json.loads(match.group(1)) if match else ""
+    return {"title": title, "scenes": scenes}
+
+
+def parse_script(text: str) -> ScriptParse:
+    """Parse a script response, repairing common LLM mistakes locally
+
+    Handles markdown fences and surrounding prose, trailing commas,
+    unescaped quotes, invalid escapes and raw newlines inside strings, and
+    responses cut off mid-scene (every complete scene is kept). Scenes that
+    do not validate against the Scene model are dropped. Raises ValueError
+    when no usable script can be recovered, which is the only case that
+    warrants asking the LLM again.
+    """
+    if not text or not text.strip():
+        raise ValueError("Empty response")
+    body, repairs = _document_body(text)
+
+    try:
+        data, trailing = _decode(body)
+    except json.JSONDecodeError:
+        body, fixes = sanitize_json(body)
+        repairs.extend(fixes)
+        try:
+            data, trailing = _decode(body)
+        except json.JSONDecodeError as e:
+            data, trailing = _salvage_truncated(body), ""
+            if data is None:
+                raise ValueError(f"Unrepairable JSON: {e}")
+            repairs.append("truncated")
+
+    if trailing and not re.fullmatch(r"```", trailing):
+        repairs.append("trailing_text")
+    if not isinstance(data, dict) or not isinstance(data.get("scenes"), list):
+        raise ValueError("Response has no scenes list")
+
+    scenes = []
+    for scene_data in data["scenes"]:
+        try:
+            scenes.append(Scene(**scene_data))
+        except (ValidationError, TypeError) as e:
+            logger.warning(f"✗ Dropping invalid scene from script: {e}")
+    if not scenes:
+        raise ValueError("Response contains no valid scenes")
+
+    try:
+        script = VideoScript(title=data.get("title") or "", scenes=scenes)
+    except ValidationError as e:
+        raise ValueError(f"Script does not match the VideoScript model: {e}")
+
+    parsed = ScriptParse(script, repairs, len(data["scenes"]) - len(scenes))
+    if parsed.repaired:
+        logger.info(f"✓ Repaired script JSON locally ({', '.join(repairs) or 'invalid scenes'}; "
+                    f"{parsed.dropped_scenes} scene(s) dropped)")
+    return parsed
+
+
+def is_repairable_script(text: str) -> bool:
+    """Check whether parse_script can recover a script from text"""
+    try:
+        parse_script(text)
+        return True
+    except ValueError:
+        return False
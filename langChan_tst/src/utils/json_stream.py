@@ -0,0 +1,102 @@
+"""
+Incremental extraction of array items from streamed JSON text
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStreamParser:
+    """Yield the objects of one top-level array field as soon as each one closes
+
+    Text is fed in arbitrary chunks. The parser tracks string and nesting
+    state character by character, so braces inside strings are handled and
+    anything before the opening brace (such as a ```json fence) is skipped.
+    Only the field named array_key of the top-level object is extracted;
+    the complete document is still available from text once streaming ends.
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self.text = ""
+        self._position = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._in_target = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of text and return any array items it completed"""
+        self.text += chunk
+        items = []
+        text = self.text
+
+        while self._position < len(text):
+            index = self._position
+            char = text[index]
+            self._position += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_string = self._decode(text[self._string_start:index + 1])
+                continue
+
+            if not self._stack and char != "{":
+                # Preamble before the document, e.g. a markdown fence
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char == ":" and len(self._stack) == 1:
+                self._pending_key = self._last_string
+            elif char == "," and len(self._stack) == 1:
+                self._pending_key = None
+            elif char in "{[":
+                if (char == "[" and self._stack == ["{"] and self._pending_key == self.array_key):
+                    self._in_target = True
+                elif char == "{" and self._in_target and len(self._stack) == 2:
+                    self._item_start = index
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if char == "}" and self._in_target and len(self._stack) == 2 and self._item_start is not None:
+                    item = self._decode(text[self._item_start:index + 1])
+                    if isinstance(item, dict):
+                        items.append(item)
+                    self._item_start = None
+                elif char == "]" and self._in_target and len(self._stack) == 1:
+                    self._in_target = False
+
+        return items
+
+    def _decode(self, fragment: str) -> Any:
+        """Decode a fragment, leaving malformed ones to be repaired from the full document"""
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.debug(f"Skipping malformed fragment in streamed JSON: {e}")
+            return None
+
+    def document(self) -> Dict[str, Any]:
+        """Parse the complete document received so far"""
+        start = self.text.find("{")
+        end = self.text.rfind("}")
+        if start < 0 or end < start:
+            raise json.JSONDecodeError("No JSON object in response", self.text, 0)
+        return json.loads(self.text[start:end + 1])
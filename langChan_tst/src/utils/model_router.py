@@ -0,0 +1,127 @@
+"""
+Routing of Manim code generation between a fast model and a stronger one
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+import sys
+from pathlib import Path
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import (
+    MANIM_CASCADE_ENABLED, MANIM_FAST_MODEL, MANIM_FAST_THINKING_BUDGET, MANIM_ESCALATE_AFTER,
+    MANIM_FAST_MIN_SUCCESS_RATE, MANIM_FAST_MIN_SAMPLES, MANIM_FAST_LAYOUTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A model and the thinking budget it is called with"""
+    model: str
+    thinking_budget: Optional[int] = None
+
+    def generation_config(self, temperature: float, max_output_tokens: int) -> Dict[str, Any]:
+        config = {"temperature": temperature, "max_output_tokens": max_output_tokens}
+        if self.thinking_budget is not None:
+            config["thinking_budget"] = self.thinking_budget
+        return config
+
+
+def update_model_stats(stats: Dict[str, Dict[str, Any]], model: str,
+                       latency: Optional[float] = None, success: Optional[bool] = None):
+    """Add a request latency and/or a checked outcome to per-model stats
+
+    A request is counted when its latency is recorded; success or failure
+    is recorded separately once the code it produced has been validated,
+    dry-run or rendered.
+    """
+    entry = stats.setdefault(model, {
+        "requests": 0, "successes": 0, "failures": 0,
+        "success_rate": None, "total_latency": 0.0, "avg_latency": None
+    })
+    if latency is not None:
+        entry["requests"] += 1
+        entry["total_latency"] = round(entry["total_latency"] + latency, 3)
+        entry["avg_latency"] = round(entry["total_latency"] / entry["requests"], 3)
+    if success is not None:
+        entry["successes" if success else "failures"] += 1
+        entry["success_rate"] = round(entry["successes"] / (entry["successes"] + entry["failures"]), 3)
+
+
+class ModelRouter:
+    """Pick the model for each code generation or correction request
+
+    Scenes start on the first (cheapest) tier and move up one tier every
+    escalate_after failed checks. Layouts outside fast_layouts start on the
+    strongest tier, and so does everything once the fast tier's observed
+    success rate drops below min_success_rate over at least min_samples
+    checked outcomes.
+    """
+
+    def __init__(self, tiers: List[ModelTier], escalate_after: int = MANIM_ESCALATE_AFTER,
+                 min_success_rate: float = MANIM_FAST_MIN_SUCCESS_RATE,
+                 min_samples: int = MANIM_FAST_MIN_SAMPLES,
+                 fast_layouts: Optional[Iterable[str]] = MANIM_FAST_LAYOUTS):
+        if not tiers:
+            raise ValueError("ModelRouter needs at least one model tier")
+        self.tiers = tiers
+        self.escalate_after = max(1, escalate_after)
+        self.min_success_rate = min_success_rate
+        self.min_samples = min_samples
+        self.fast_layouts = set(fast_layouts) if fast_layouts is not None else None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_settings(cls, model: str, thinking_budget: Optional[int] = None,
+                      cascade: bool = MANIM_CASCADE_ENABLED, fast_model: str = MANIM_FAST_MODEL,
+                      fast_thinking_budget: int = MANIM_FAST_THINKING_BUDGET) -> "ModelRouter":
+        """Build a two-tier cascade ending at model, or a single tier when the cascade is disabled"""
+        tiers = [ModelTier(model, thinking_budget)]
+        if cascade and fast_model and fast_model != model:
+            tiers.insert(0, ModelTier(fast_model, fast_thinking_budget))
+        return cls(tiers)
+
+    def select(self, failures: int = 0, layout: Optional[str] = None) -> ModelTier:
+        """Choose the tier for a scene that has failed its checks failures times"""
+        layout = getattr(layout, "value", layout)
+        start = 0
+        if len(self.tiers) > 1:
+            if layout is not None and self.fast_layouts is not None and layout not in self.fast_layouts:
+                start = len(self.tiers) - 1
+            elif self._underperforming(self.tiers[0].model):
+                start = 1
+        return self.tiers[min(start + failures // self.escalate_after, len(self.tiers) - 1)]
+
+    def is_escalation(self, from_model: Optional[str], tier: ModelTier) -> bool:
+        """Check whether moving from from_model to tier goes up the cascade"""
+        models = [t.model for t in self.tiers]
+        if from_model not in models:
+            return False
+        return models.index(tier.model) > models.index(from_model)
+
+    def _underperforming(self, model: str) -> bool:
+        with self._lock:
+            entry = self._stats.get(model)
+            if not entry or entry["successes"] + entry["failures"] < self.min_samples:
+                return False
+            return entry["success_rate"] < self.min_success_rate
+
+    def record_request(self, model: str, latency: float):
+        with self._lock:
+            update_model_stats(self._stats, model, latency=latency)
+
+    def record_outcome(self, model: str, success: bool):
+        with self._lock:
+            update_model_stats(self._stats, model, success=success)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model stats accumulated by this router"""
+        with self._lock:
+            return {model: dict(entry) for model, entry in self._stats.items()}
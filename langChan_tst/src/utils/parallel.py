@@ -4,6 +4,7 @@ Parallel processing utilities for video generation pipeline
 
 import asyncio
 import concurrent.futures
+import contextlib
 import threading
 import time
 from pathlib import Path
@@ -47,8 +48,12 @@ class ParallelProcessor:
             "avg_task_time": 0.0
         }
     
-    def process_tasks_threaded(self, tasks: List[Tuple[str, Callable, tuple, dict]]) -> Dict[str, TaskResult]:
-        """Process tasks using ThreadPoolExecutor (I/O bound operations)"""
+    def process_tasks_threaded(self, tasks: List[Tuple[str, Callable, tuple, dict]],
+                               on_result: Optional[Callable[[TaskResult], None]] = None) -> Dict[str, TaskResult]:
+        """Process tasks using ThreadPoolExecutor (I/O bound operations)
+        
+        on_result, if given, is called with each task's result as soon as it completes.
+        """
         results = {}
         start_time = time.time()
         
@@ -82,6 +87,8 @@ class ParallelProcessor:
                     logger.error(f"Task {task_id} failed: {e}")
                     results[task_id] = TaskResult(task_id, False, error=str(e))
                     self.stats["failed_tasks"] += 1
+                if on_result:
+                    on_result(results[task_id])
         
         self.stats["total_tasks"] = len(tasks)
         self.stats["total_time"] = time.time() - start_time
@@ -257,6 +264,24 @@ class ParallelProcessor:
         return self.stats.copy()
 
 
+@contextlib.contextmanager
+def render_slot(slots=None, cancel: Optional[threading.Event] = None):
+    """Hold one of the render slots shared with other jobs, if a budget is set
+
+    Waiting stops with concurrent.futures.CancelledError once cancel is set.
+    """
+    if slots is None:
+        yield
+        return
+    while not slots.acquire(timeout=0.2):
+        if cancel is not None and cancel.is_set():
+            raise concurrent.futures.CancelledError()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
 class TTSParallelProcessor:
     """Specialized parallel processor for TTS operations"""
     
@@ -304,15 +329,28 @@ class TTSParallelProcessor:
 class ManimParallelProcessor:
     """Specialized parallel processor for Manim rendering operations"""
     
-    def __init__(self, max_workers: int = 2):
+    def __init__(self, max_workers: int = 2, render_backend: str = "subprocess", render_slots=None):
+        self.render_backend = render_backend
+        # Semaphore bounding concurrent renders across every job in the server
+        self.render_slots = render_slots
         self.processor = ParallelProcessor(ParallelConfig(
             max_workers=max_workers,
             timeout_per_task=600.0,  # 10 minutes per render
-            use_threading=False  # Manim rendering is CPU bound
+            # Manim rendering is CPU bound, but it runs in the manim CLI or a warm
+            # pool worker, so threads only wait on it and can hold render slots
+            use_threading=True
         ))
     
-    def render_scenes_batch(self, render_tasks: List[Dict]) -> Dict[str, Path]:
-        """Render multiple Manim scenes in parallel"""
+    def render_scenes_batch(self, render_tasks: List[Dict],
+                            on_scene_done: Optional[Callable[[Dict, Optional[Path]], None]] = None,
+                            render_scene: Optional[Callable[[Dict], Path]] = None) -> Dict[str, Path]:
+        """Render multiple Manim scenes in parallel
+        
+        on_scene_done, if given, is called with each render task and its video
+        (None if the render failed) as soon as that scene finishes. render_scene
+        replaces the plain render of each task, e.g. with the engine's checked
+        and self-correcting render.
+        """
         logger.info(f"Starting parallel Manim rendering for {len(render_tasks)} scenes")
         
         # Log task details
@@ -328,14 +366,23 @@ class ManimParallelProcessor:
         for task in render_tasks:
             tasks.append((
                 task["task_id"],
-                self._render_single_scene,
+                render_scene or self._render_single_scene,
                 (task,),
                 {}
             ))
         
         # Process tasks
-        logger.info(f"Submitting {len(tasks)} tasks to process pool")
-        results = self.processor.process_tasks_multiprocess(tasks)
+        if self.render_backend == "pool":
+            logger.info(f"Submitting {len(tasks)} tasks to the warm render pool")
+        else:
+            logger.info(f"Submitting {len(tasks)} tasks to manim subprocesses")
+        on_result = None
+        if on_scene_done:
+            tasks_by_id = {task["task_id"]: task for task in render_tasks}
+            
+            def on_result(result: TaskResult):
+                on_scene_done(tasks_by_id[result.task_id], result.result if result.success else None)
+        results = self.processor.process_tasks_threaded(tasks, on_result)
         
         # Convert results to expected format
         scene_videos = {}
@@ -364,7 +411,6 @@ class ManimParallelProcessor:
     
     def _render_single_scene(self, task: Dict) -> Path:
         """Render a single Manim scene"""
-        import subprocess
         from pathlib import Path
         from src.core.models import QualityPreset, RenderConfig
         from src.utils.file_ops import ensure_directory
@@ -380,9 +426,10 @@ class ManimParallelProcessor:
         logger.info(f"Scene sequence: {scene_obj.seq}")
         logger.info(f"Quality: {quality}")
         
-        # Create proper output directory structure (similar to sequential renderer)
+        # Create proper output directory structure (similar to sequential renderer);
+        # the engine passes per-run directories so concurrent jobs never share paths
         from config.settings import RENDERS_DIR, TMP_DIR
-        output_dir = RENDERS_DIR / "video" / f"scene_{scene_obj.seq}"
+        output_dir = task.get("output_dir") or RENDERS_DIR / "video" / f"scene_{scene_obj.seq}"
         ensure_directory(output_dir)
         logger.info(f"Output directory: {output_dir}")
         
@@ -395,73 +442,48 @@ class ManimParallelProcessor:
         logger.info(f"Manim args: {manim_args}")
         
         # Create scene script file in tmp directory
-        script_path = TMP_DIR / f"scene_{class_name}.py"
+        script_path = (task.get("script_dir") or TMP_DIR) / f"scene_{class_name}.py"
         logger.info(f"Script path: {script_path}")
         
+        # Clean and validate the scene code before writing
+        scene_code = self._clean_scene_code(scene_code)
+        
+        # Identical code and render settings always produce the same clip
+        render_cache = None
+        cache_key = None
+        if task.get("use_cache", render_config.use_cache):
+            from src.utils.cache import get_render_cache, render_cache_key
+            render_cache = get_render_cache()
+            cache_key = render_cache_key(scene_code, manim_args)
+            cached_video = output_dir / f"{class_name}_cached.mp4"
+            if render_cache.fetch(cache_key, cached_video):
+                logger.info(f"✓ Render cache hit for {class_name} ({cache_key[:12]})")
+                return cached_video
+        
         try:
-            # Clean and validate the scene code before writing
-            scene_code = self._clean_scene_code(scene_code)
             script_path.write_text(scene_code, encoding="utf-8")
             logger.info(f"✓ Scene script written successfully")
             logger.debug(f"Script content preview: {scene_code[:200]}...")
         except Exception as e:
             logger.error(f"Failed to write scene script: {e}")
             raise
-    
-    def _clean_scene_code(self, scene_code: str) -> str:
-        """Clean common issues in scene code"""
-        # Remove markdown formatting
-        cleaned = scene_code.strip()
-        if cleaned.startswith('```python'):
-            cleaned = cleaned[9:]
-        if cleaned.startswith('```'):
-            cleaned = cleaned[3:]
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
-        
-        # Fix invalid color constants
-        color_fixes = {
-            'BLUE_C': 'BLUE',
-            'GREEN_C': 'GREEN', 
-            'ORANGE_C': 'ORANGE',
-            'RED_C': 'RED',
-            'PURPLE_C': 'PURPLE',
-            'YELLOW_C': 'YELLOW'
-        }
-        
-        for invalid, valid in color_fixes.items():
-            cleaned = cleaned.replace(invalid, valid)
-        
-        # Remove duplicate construct_scene definitions
-        lines = cleaned.split('\n')
-        result_lines = []
-        found_construct_scene = False
-        skip_nested_function = False
-        nested_indent_level = 0
         
-        for line in lines:
-            if 'def construct_scene(self):' in line:
-                if found_construct_scene:
-                    # This is a duplicate - skip it and its body
-                    skip_nested_function = True
-                    nested_indent_level = len(line) - len(line.lstrip())
-                    continue
-                else:
-                    found_construct_scene = True
-                    result_lines.append(line)
-            elif skip_nested_function:
-                # Skip lines that are part of the nested function
-                current_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                if line.strip() and current_indent <= nested_indent_level:
-                    # End of nested function
-                    skip_nested_function = False
-                    nested_indent_level = 0
-                    result_lines.append(line)
-                # Otherwise skip the line (it's part of the nested function)
-            else:
-                result_lines.append(line)
+        with render_slot(self.render_slots):
+            return self._render_script(script_path, class_name, manim_args, output_dir,
+                                       render_cache, cache_key)
+    
+    def _render_script(self, script_path: Path, class_name: str, manim_args: List[str],
+                       output_dir: Path, render_cache=None, cache_key: Optional[str] = None) -> Path:
+        """Render a written scene script with the configured backend"""
+        import subprocess
         
-        return '\n'.join(result_lines)
+        if self.render_backend == "pool":
+            from src.utils.render_pool import get_render_pool
+            video_path = get_render_pool().render(script_path, class_name, manim_args, output_dir, timeout=600)
+            logger.info(f"✓ Pooled Manim render successful for {class_name}: {video_path}")
+            if render_cache:
+                render_cache.put(cache_key, video_path)
+            return video_path
         
         try:
             # Build Manim command (similar to the sequential renderer)
@@ -498,6 +520,8 @@ class ManimParallelProcessor:
                 if mp4_candidates:
                     logger.info(f"✓ Parallel Manim render successful for {class_name}")
                     logger.info(f"Generated video: {mp4_candidates[0]}")
+                    if render_cache:
+                        render_cache.put(cache_key, mp4_candidates[0])
                     return mp4_candidates[0]
                 else:
                     logger.error(f"No mp4 files found in output directory: {output_dir}")
@@ -537,6 +561,166 @@ class ManimParallelProcessor:
             import traceback
             logger.error(f"Full traceback: {traceback.format_exc()}")
             raise
+    
+    def _clean_scene_code(self, scene_code: str) -> str:
+        """Clean common issues in scene code"""
+        # Remove markdown formatting
+        cleaned = scene_code.strip()
+        if cleaned.startswith('```python'):
+            cleaned = cleaned[9:]
+        if cleaned.startswith('```'):
+            cleaned = cleaned[3:]
+        if cleaned.endswith('```'):
+            cleaned = cleaned[:-3]
+        
+        # Fix invalid color constants
+        color_fixes = {
+            'BLUE_C': 'BLUE',
+            'GREEN_C': 'GREEN', 
+            'ORANGE_C': 'ORANGE',
+            'RED_C': 'RED',
+            'PURPLE_C': 'PURPLE',
+            'YELLOW_C': 'YELLOW'
+        }
+        
+        for invalid, valid in color_fixes.items():
+            cleaned = cleaned.replace(invalid, valid)
+        
+        # Remove duplicate construct_scene definitions
+        lines = cleaned.split('\n')
+        result_lines = []
+        found_construct_scene = False
+        skip_nested_function = False
+        nested_indent_level = 0
+        
+        for line in lines:
+            if 'def construct_scene(self):' in line:
+                if found_construct_scene:
+                    # This is a duplicate - skip it and its body
+                    skip_nested_function = True
+                    nested_indent_level = len(line) - len(line.lstrip())
+                    continue
+                else:
+                    found_construct_scene = True
+                    result_lines.append(line)
+            elif skip_nested_function:
+                # Skip lines that are part of the nested function
+                current_indent = len(line) - len(line.lstrip()) if line.strip() else 0
+                if line.strip() and current_indent <= nested_indent_level:
+                    # End of nested function
+                    skip_nested_function = False
+                    nested_indent_level = 0
+                    result_lines.append(line)
+                # Otherwise skip the line (it's part of the nested function)
+            else:
+                result_lines.append(line)
+        
+        return '\n'.join(result_lines)
+
+
+class StagedPipeline:
+    """Per-item stage pipeline with a bounded worker pool for every stage
+
+    Each item is driven through its own chain of stages; an item only waits on
+    its own upstream results, so a slow item never holds back the others.
+    """
+
+    def __init__(self, stage_workers: Dict[str, int]):
+        self.stage_workers = dict(stage_workers)
+        self.executors = {
+            stage: concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, workers),
+                thread_name_prefix=f"pipeline_{stage}"
+            )
+            for stage, workers in self.stage_workers.items()
+        }
+        # Drivers only block on stage futures, so they get their own unbounded pool
+        self.driver_executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="pipeline_driver")
+        self._lock = threading.Lock()
+        self.stats = {
+            stage: {"tasks": 0, "failed": 0, "total_time": 0.0, "max_time": 0.0}
+            for stage in self.stage_workers
+        }
+
+    def submit(self, stage: str, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """Run func on the given stage's pool"""
+        if stage not in self.executors:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        return self.executors[stage].submit(self._run_stage, stage, func, args, kwargs)
+
+    def drive(self, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """Start a driver that chains stage submissions for one item"""
+        return self.driver_executor.submit(func, *args, **kwargs)
+
+    def _run_stage(self, stage: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Execute a stage task and record its timing"""
+        start_time = time.time()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration = time.time() - start_time
+            with self._lock:
+                stage_stats = self.stats[stage]
+                stage_stats["tasks"] += 1
+                stage_stats["failed"] += int(failed)
+                stage_stats["total_time"] += duration
+                stage_stats["max_time"] = max(stage_stats["max_time"], duration)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-stage statistics"""
+        with self._lock:
+            return {stage: stats.copy() for stage, stats in self.stats.items()}
+
+    def shutdown(self, wait: bool = True):
+        """Shut down drivers first, then the stage pools they feed"""
+        self.driver_executor.shutdown(wait=wait)
+        for executor in self.executors.values():
+            executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "StagedPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=True)
+
+
+def first_success(tasks: List[Tuple[str, Callable[[threading.Event], Any]]],
+                  max_workers: Optional[int] = None) -> Tuple[Optional[TaskResult], List[TaskResult]]:
+    """Run tasks concurrently and return as soon as one of them succeeds
+
+    Every task is called with a shared threading.Event that is set once a
+    winner is found (or all tasks finished), so the others can abandon their
+    work, e.g. cancel a render. Returns the winning TaskResult (None if every
+    task failed) and the results of all tasks that finished before that. A
+    failed task's exception is kept in its result field.
+    """
+    cancel = threading.Event()
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers or max(1, len(tasks)), thread_name_prefix="race"
+    )
+    started = time.time()
+    finished: List[TaskResult] = []
+    try:
+        futures = {executor.submit(func, cancel): task_id for task_id, func in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            task_id = futures[future]
+            duration = time.time() - started
+            try:
+                result = TaskResult(task_id, True, future.result(), duration=duration)
+            except Exception as e:
+                finished.append(TaskResult(task_id, False, e, str(e), duration))
+                continue
+            finished.append(result)
+            return result, finished
+        return None, finished
+    finally:
+        cancel.set()
+        # Losers stop at their next cancellation check; nobody waits for them
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def parallel_decorator(processor_config: ParallelConfig = None):
@@ -0,0 +1,164 @@
+"""
+Fast dry-run of scene code to catch runtime errors before the real render
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+# Add project root to path for config and template imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+logger = logging.getLogger(__name__)
+
+# Run construct without writing files, at a tiny resolution and frame rate
+PREFLIGHT_CONFIG = {
+    "dry_run": True,
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "pixel_width": 256,
+    "pixel_height": 144,
+    "frame_rate": 5,
+    "progress_bar": "none",
+    "verbosity": "ERROR",
+}
+
+# Marks the JSON result line among anything the scene prints
+RESULT_MARKER = "PREFLIGHT_RESULT "
+
+# Exit code when Manim itself could not be imported, as opposed to a scene error
+EXIT_ENVIRONMENT_ERROR = 2
+
+
+@dataclass
+class PreflightResult:
+    """Outcome of a dry-run; error is None when construct ran to completion
+
+    inconclusive is set when the dry-run itself could not run (no Manim,
+    timeout, crashed worker), so the scene should go on to the real render.
+    """
+    ok: bool
+    error: Optional[str] = None
+    inconclusive: bool = False
+    mobjects: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def offscreen(self) -> List[Dict[str, Any]]:
+        return [mobject for mobject in self.mobjects if mobject.get("offscreen")]
+
+
+def _describe_mobjects(scene, frame_width: float, frame_height: float) -> List[Dict[str, Any]]:
+    """Bounding boxes of the mobjects left on screen when construct returns"""
+    boxes = []
+    for mobject in scene.mobjects:
+        try:
+            center = [round(float(value), 3) for value in mobject.get_center()[:2]]
+            width, height = float(mobject.width), float(mobject.height)
+        except Exception:
+            continue
+        offscreen = (
+            abs(center[0]) + width / 2 > frame_width / 2 + 1e-3
+            or abs(center[1]) + height / 2 > frame_height / 2 + 1e-3
+        )
+        boxes.append({
+            "type": type(mobject).__name__,
+            "center": center,
+            "width": round(width, 3),
+            "height": round(height, 3),
+            "offscreen": offscreen,
+        })
+    return boxes
+
+
+def run_scene_preflight(script_path: Path, class_name: str) -> Dict[str, Any]:
+    """Execute a scene's construct in dry-run mode in this process
+
+    Raises whatever the scene raises; returns the final mobject bounding boxes.
+    """
+    from manim import config, tempconfig
+
+    script_path = Path(script_path)
+    module_name = f"_preflight_scene_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+        scene_class = getattr(module, class_name)
+
+        with tempconfig(PREFLIGHT_CONFIG):
+            scene = scene_class()
+            scene.render()
+            return {"mobjects": _describe_mobjects(scene, config.frame_width, config.frame_height)}
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def preflight_scene(script_path: Path, class_name: str, timeout: float = 60,
+                    use_pool: bool = False) -> PreflightResult:
+    """Dry-run a scene script in a subprocess or a warm render worker"""
+    if use_pool:
+        from src.utils.render_pool import RenderError, SceneError, get_render_pool
+        try:
+            payload = get_render_pool().preflight(script_path, class_name, timeout=timeout)
+        except SceneError as e:
+            return PreflightResult(ok=False, error=e.stderr)
+        except (RenderError, TimeoutError, RuntimeError) as e:
+            logger.warning(f"Preflight of {class_name} was inconclusive: {e}")
+            return PreflightResult(ok=False, error=str(e), inconclusive=True)
+        return PreflightResult(ok=True, mobjects=payload["mobjects"])
+
+    cmd = [sys.executable, "-m", "src.utils.preflight", str(Path(script_path).absolute()), class_name]
+    try:
+        completed = subprocess.run(
+            cmd, cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Preflight of {class_name} timed out after {timeout}s")
+        return PreflightResult(ok=False, error=f"Preflight timed out after {timeout}s", inconclusive=True)
+
+    if completed.returncode == EXIT_ENVIRONMENT_ERROR:
+        logger.warning(f"Preflight unavailable: {completed.stderr.strip().splitlines()[-1:]}")
+        return PreflightResult(ok=False, error=completed.stderr, inconclusive=True)
+    if completed.returncode != 0:
+        return PreflightResult(ok=False, error=completed.stderr.strip() or f"Exit code {completed.returncode}")
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            payload = json.loads(line[len(RESULT_MARKER):])
+            return PreflightResult(ok=True, mobjects=payload["mobjects"])
+    return PreflightResult(ok=False, error="Preflight produced no result", inconclusive=True)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2:
+        print("usage: python -m src.utils.preflight <script.py> <SceneClass>", file=sys.stderr)
+        return EXIT_ENVIRONMENT_ERROR
+
+    try:
+        import manim  # noqa: F401
+    except Exception:
+        traceback.print_exc()
+        return EXIT_ENVIRONMENT_ERROR
+
+    try:
+        result = run_scene_preflight(Path(argv[0]), argv[1])
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+    print(RESULT_MARKER + json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,191 @@
+"""
+Media probing with in-process WAV parsing and a metadata cache
+"""
+
+import json
+import subprocess
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_PROBE_WORKERS = 8
+MAX_CACHED_PROBES = 4096
+
+_probe_cache: "OrderedDict[Tuple[str, int, int], dict]" = OrderedDict()
+_probe_cache_lock = threading.Lock()
+_probe_stats = {"hits": 0, "wav_header": 0, "ffprobe": 0, "failed": 0}
+
+
+def _cache_key(media_file: Path) -> Optional[Tuple[str, int, int]]:
+    """Key a probe by path, size and mtime so rewritten files are probed again"""
+    try:
+        stat = media_file.stat()
+    except OSError:
+        return None
+    return str(media_file.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """Convert an ffprobe rational such as '60/1' to a float"""
+    try:
+        numerator, _, denominator = (rate or "0/1").partition("/")
+        return float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _increment(stat: str):
+    with _probe_cache_lock:
+        _probe_stats[stat] += 1
+
+
+def read_wav_info(audio_file: Path) -> Optional[dict]:
+    """Read duration and format from a PCM WAV header without spawning ffprobe"""
+    try:
+        with wave.open(str(audio_file), "rb") as wav:
+            frames = wav.getnframes()
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+        size = audio_file.stat().st_size
+    except (wave.Error, EOFError, OSError):
+        return None
+
+    # Streaming writers leave a placeholder data size; let ffprobe measure those
+    if rate <= 0 or frames * channels * sample_width > size:
+        return None
+
+    return {
+        "duration": frames / rate,
+        "size": size,
+        "format": "wav",
+        "audio_codec": f"pcm_s{sample_width * 8}le" if sample_width > 1 else "pcm_u8",
+        "sample_rate": str(rate),
+        "channel_layout": {1: "mono", 2: "stereo"}.get(channels, f"{channels} channels")
+    }
+
+
+def run_ffprobe(media_file: Path) -> Optional[dict]:
+    """Probe a media file with ffprobe"""
+    try:
+        result = subprocess.run([
+            "ffprobe", "-v", "quiet",
+            "-print_format", "json",
+            "-show_format",
+            "-show_streams",
+            str(media_file)
+        ], capture_output=True, text=True, check=True)
+
+        info = json.loads(result.stdout)
+        media_info = {
+            "duration": float(info["format"]["duration"]),
+            "size": int(info["format"].get("size", 0)),
+            "format": info["format"].get("format_name", "unknown")
+        }
+
+        # Get info from the first video and audio streams
+        for stream in info.get("streams", []):
+            if stream.get("codec_type") == "video" and "codec" not in media_info:
+                media_info.update({
+                    "width": stream.get("width", 0),
+                    "height": stream.get("height", 0),
+                    "fps": _parse_rate(stream.get("r_frame_rate")),
+                    "frame_rate": stream.get("r_frame_rate"),
+                    "time_base": stream.get("time_base"),
+                    "pix_fmt": stream.get("pix_fmt"),
+                    "profile": stream.get("profile"),
+                    "codec": stream.get("codec_name", "unknown")
+                })
+            elif stream.get("codec_type") == "audio" and "audio_codec" not in media_info:
+                media_info.update({
+                    "audio_codec": stream.get("codec_name", "unknown"),
+                    "sample_rate": stream.get("sample_rate"),
+                    "channel_layout": stream.get("channel_layout")
+                })
+
+        return media_info
+
+    except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+        logger.warning(f"ffprobe failed for {media_file}: {e}")
+        return None
+
+
+def _probe_uncached(media_file: Path) -> Optional[dict]:
+    if media_file.suffix.lower() == ".wav":
+        info = read_wav_info(media_file)
+        if info is not None:
+            _increment("wav_header")
+            return info
+
+    info = run_ffprobe(media_file)
+    _increment("ffprobe" if info is not None else "failed")
+    return info
+
+
+def probe_media_batch(media_files: Iterable[Path]) -> Dict[Path, Optional[dict]]:
+    """Probe many files at once, answering from the cache and running ffprobe concurrently
+
+    Returns a mapping of each path to a copy of its info dict, or None if the
+    file is missing or could not be probed.
+    """
+    results: Dict[Path, Optional[dict]] = {}
+    pending: Dict[Path, Tuple[str, int, int]] = {}
+
+    for media_file in media_files:
+        media_file = Path(media_file)
+        if media_file in results or media_file in pending:
+            continue
+
+        key = _cache_key(media_file)
+        if key is None:
+            results[media_file] = None
+            continue
+
+        with _probe_cache_lock:
+            cached = _probe_cache.get(key)
+            if cached is not None:
+                _probe_cache.move_to_end(key)
+                _probe_stats["hits"] += 1
+                results[media_file] = dict(cached)
+                continue
+        pending[media_file] = key
+
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(pending))) as executor:
+            probed = dict(zip(pending, executor.map(_probe_uncached, pending)))
+    else:
+        probed = {media_file: _probe_uncached(media_file) for media_file in pending}
+
+    for media_file, info in probed.items():
+        results[media_file] = dict(info) if info is not None else None
+        if info is None:
+            continue
+        with _probe_cache_lock:
+            _probe_cache[pending[media_file]] = info
+            while len(_probe_cache) > MAX_CACHED_PROBES:
+                _probe_cache.popitem(last=False)
+
+    return results
+
+
+def probe_media(media_file: Path) -> Optional[dict]:
+    """Probe a single file; see probe_media_batch"""
+    return probe_media_batch([media_file])[Path(media_file)]
+
+
+def get_probe_stats() -> Dict[str, int]:
+    """Get probe statistics"""
+    with _probe_cache_lock:
+        return _probe_stats.copy()
+
+
+def clear_probe_cache():
+    """Forget all cached probe results"""
+    with _probe_cache_lock:
+        _probe_cache.clear()
@@ -0,0 +1,177 @@
+"""
+Section-level BM25 retrieval over the Manim reference
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Headings up to this depth start a new section; deeper ones stay with their parent
+MAX_SECTION_LEVEL = 3
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with", "you", "your", "use", "can"
+}
+
+_heading_pattern = re.compile(r"^(#{1,6})\s+(.*)$")
+_word_pattern = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+_camel_pattern = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for prompt budgeting (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, also splitting CamelCase and snake_case identifiers"""
+    terms = []
+    for word in _word_pattern.findall(text):
+        lowered = word.lower()
+        if lowered not in STOPWORDS:
+            terms.append(lowered)
+        parts = [part.lower() for chunk in word.split("_") for part in _camel_pattern.findall(chunk)]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if part not in STOPWORDS and len(part) > 1)
+    return terms
+
+
+@dataclass
+class ReferenceSection:
+    """A heading-delimited slice of the reference document"""
+    title: str
+    text: str
+    position: int
+    terms: Counter = field(default_factory=Counter)
+    length: int = 0
+    tokens: int = 0
+
+
+def split_sections(markdown: str) -> List[ReferenceSection]:
+    """Split markdown into sections at headings, ignoring '#' comments inside code fences"""
+    sections = []
+    trail: List[str] = []
+    current: List[str] = []
+    in_code = False
+
+    def flush():
+        text = "\n".join(current).strip()
+        if text:
+            title = " > ".join(trail) or "Introduction"
+            sections.append(ReferenceSection(title=title, text=text, position=len(sections)))
+
+    for line in markdown.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+
+        match = None if in_code else _heading_pattern.match(line)
+        if match and len(match.group(1)) <= MAX_SECTION_LEVEL:
+            flush()
+            current = []
+            level = len(match.group(1))
+            trail = trail[:level - 1] + [match.group(2).strip()]
+        current.append(line)
+
+    flush()
+
+    for section in sections:
+        terms = tokenize(section.text)
+        section.terms = Counter(terms)
+        section.length = len(terms)
+        section.tokens = estimate_tokens(section.text)
+    return sections
+
+
+class ReferenceIndex:
+    """BM25 keyword index over reference sections"""
+
+    def __init__(self, sections: List[ReferenceSection], k1: float = 1.5, b: float = 0.75):
+        self.sections = sections
+        self.k1 = k1
+        self.b = b
+        self.average_length = sum(section.length for section in sections) / max(1, len(sections))
+
+        document_frequency = Counter()
+        for section in sections:
+            document_frequency.update(section.terms.keys())
+        self.idf = {
+            term: math.log(1 + (len(sections) - count + 0.5) / (count + 0.5))
+            for term, count in document_frequency.items()
+        }
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ReferenceIndex":
+        """Build an index from a markdown file; a missing file gives an empty index"""
+        try:
+            markdown = Path(path).read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not load Manim reference: {e}")
+            markdown = ""
+        index = cls(split_sections(markdown))
+        logger.info(f"Indexed {len(index.sections)} reference sections "
+                    f"(~{index.total_tokens} tokens) from {path}")
+        return index
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(section.tokens for section in self.sections)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """Score every section against the query"""
+        query_terms = set(tokenize(query))
+        scores = {}
+        for section in self.sections:
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * section.length / max(1.0, self.average_length))
+            for term in query_terms:
+                frequency = section.terms.get(term, 0)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores[section.position] = score
+        return scores
+
+    def select(self, query: str, token_budget: int) -> List[ReferenceSection]:
+        """Pick the best matching sections that fit token_budget, in document order
+
+        A budget of zero or less selects the whole reference.
+        """
+        if token_budget <= 0:
+            return list(self.sections)
+
+        scores = self.score(query)
+        ranked = sorted(
+            (section for section in self.sections if scores[section.position] > 0),
+            key=lambda section: scores[section.position],
+            reverse=True
+        )
+
+        selected = []
+        used = 0
+        for section in ranked:
+            if used + section.tokens > token_budget:
+                continue
+            selected.append(section)
+            used += section.tokens
+
+        return sorted(selected, key=lambda section: section.position)
+
+
+_reference_indexes: Dict[Path, ReferenceIndex] = {}
+_reference_indexes_lock = threading.Lock()
+
+
+def get_reference_index(path: Path) -> ReferenceIndex:
+    """Get the process-wide index for a reference file, building it on first use"""
+    path = Path(path)
+    with _reference_indexes_lock:
+        if path not in _reference_indexes:
+            _reference_indexes[path] = ReferenceIndex.from_file(path)
+        return _reference_indexes[path]
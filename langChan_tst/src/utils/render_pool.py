@@ -0,0 +1,476 @@
+"""
+Warm Manim render worker pool that renders scenes in-process
+"""
+
+import atexit
+import concurrent.futures
+import importlib.util
+import multiprocessing
+import multiprocessing.connection
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+# Add project root to path for config and template imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import RENDER_POOL_WORKERS, RENDER_POOL_MAX_TASKS, RENDER_POOL_MAX_MEMORY_MB
+
+logger = logging.getLogger(__name__)
+
+# Stop replacing workers after this many consecutive start-up failures
+MAX_STARTUP_FAILURES = 3
+
+# Manim CLI quality flags and the equivalent config values
+QUALITY_FLAGS = {
+    "-ql": "low_quality",
+    "-qm": "medium_quality",
+    "-qh": "high_quality",
+    "-qp": "production_quality",
+    "-qk": "fourk_quality",
+}
+
+
+class RenderError(Exception):
+    """A scene failed to render; stderr holds the worker traceback"""
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(message)
+        self.stderr = stderr or message
+
+
+class SceneError(RenderError):
+    """The scene code itself raised; stderr holds its traceback"""
+
+
+def manim_args_to_config(manim_args: List[str]) -> Dict[str, Any]:
+    """Translate RenderConfig.get_manim_args() output to Manim config values"""
+    config = {}
+    args = list(manim_args)
+    while args:
+        arg = args.pop(0)
+        if arg in QUALITY_FLAGS:
+            config["quality"] = QUALITY_FLAGS[arg]
+        elif arg == "--format" and args:
+            config["format"] = args.pop(0)
+        else:
+            raise ValueError(f"Unsupported Manim argument for pooled rendering: {arg}")
+    return config
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+def _peak_memory_mb() -> float:
+    """Peak resident memory of this process in MB, or 0 where unsupported"""
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except (ImportError, AttributeError):
+        return 0.0
+
+
+def _render_task(task: Dict[str, Any]) -> Any:
+    """Render one scene module with Manim's Python API and return the output path
+
+    Preflight tasks dry-run the scene instead and return its mobject bounding boxes.
+    """
+    if task.get("preflight"):
+        from src.utils.preflight import run_scene_preflight
+        return run_scene_preflight(Path(task["script_path"]), task["class_name"])
+
+    from manim import tempconfig
+
+    script_path = Path(task["script_path"])
+    module_name = f"_pooled_scene_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+        scene_class = getattr(module, task["class_name"])
+
+        render_config = {
+            "media_dir": task["media_dir"],
+            # input_file drives the videos/<module>/ folder, matching the CLI layout
+            "input_file": str(script_path),
+            "progress_bar": "none",
+            "verbosity": "WARNING",
+        }
+        render_config.update(task["config"])
+        if task.get("output_file"):
+            render_config["output_file"] = task["output_file"]
+
+        with tempconfig(render_config):
+            scene = scene_class()
+            scene.render()
+            file_writer = scene.renderer.file_writer
+            if render_config.get("format") == "gif":
+                return str(file_writer.gif_file_path)
+            return str(file_writer.movie_file_path)
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def _worker_main(conn, max_tasks: int, max_memory_mb: float):
+    """Worker loop: import Manim and the templates once, then render tasks until retired"""
+    try:
+        import manim  # noqa: F401
+        import src.templates.layouts  # noqa: F401
+        try:
+            import manim_layout_manager  # noqa: F401
+        except ImportError:
+            pass
+    except Exception:
+        conn.send(("startup_failed", traceback.format_exc()))
+        return
+
+    conn.send(("ready", None))
+    tasks_done = 0
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        try:
+            result = ("ok", _render_task(task))
+        except BaseException:
+            result = ("error", traceback.format_exc())
+
+        tasks_done += 1
+        memory_mb = _peak_memory_mb()
+        retiring = tasks_done >= max_tasks or (max_memory_mb and memory_mb > max_memory_mb)
+        conn.send(("done", {"result": result, "retiring": retiring, "memory_mb": memory_mb}))
+        if retiring:
+            return
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class _PoolWorker:
+    """Parent-side handle for one worker process"""
+
+    def __init__(self, context, max_tasks: int, max_memory_mb: float):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, max_tasks, max_memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.future: Optional[concurrent.futures.Future] = None
+        self.deadline: Optional[float] = None
+
+    @property
+    def idle(self) -> bool:
+        return self.ready and self.future is None
+
+    def stop(self, kill: bool = False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ManimRenderPool:
+    """Pool of long-lived worker processes that render Manim scene modules
+
+    Workers import manim, the layout templates and the layout manager once
+    and then render scene files through manim's Python API, so a render no
+    longer pays interpreter and library start-up. A worker is replaced after
+    max_tasks_per_worker renders, when its peak memory passes max_memory_mb,
+    when it crashes, or when a render exceeds its timeout.
+    """
+
+    def __init__(self, max_workers: int = RENDER_POOL_WORKERS,
+                 max_tasks_per_worker: int = RENDER_POOL_MAX_TASKS,
+                 max_memory_mb: float = RENDER_POOL_MAX_MEMORY_MB):
+        self.max_workers = max_workers
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_memory_mb = max_memory_mb
+        # Spawn rather than fork: the parent may be a threaded API server
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._workers: List[_PoolWorker] = []
+        # Workers taken out of service, and how many replacements are owed;
+        # the manager thread stops and starts them without holding the lock
+        self._retired: List[Tuple[_PoolWorker, bool]] = []
+        self._starting = 0
+        self._closed = False
+        self._startup_failures = 0
+        self.stats = {"tasks": 0, "failed": 0, "timeouts": 0, "crashes": 0, "recycled": 0, "cancelled": 0}
+
+        for _ in range(max_workers):
+            self._workers.append(self._start_worker())
+
+        self._manager = threading.Thread(target=self._manage, name="manim-render-pool", daemon=True)
+        self._manager.start()
+        logger.info(f"Manim render pool started with {max_workers} workers")
+
+    def _start_worker(self) -> _PoolWorker:
+        return _PoolWorker(self._context, self.max_tasks_per_worker, self.max_memory_mb)
+
+    def submit(self, script_path: Path, class_name: str, manim_args: List[str],
+               media_dir: Path, timeout: float = 600, output_file: Optional[str] = None) -> concurrent.futures.Future:
+        """Queue a scene render; the future resolves to the output video path"""
+        task = {
+            "script_path": str(Path(script_path).absolute()),
+            "class_name": class_name,
+            "media_dir": str(Path(media_dir).absolute()),
+            "config": manim_args_to_config(manim_args),
+            "output_file": output_file,
+        }
+        return self._enqueue(task, timeout)
+
+    def _enqueue(self, task: Dict[str, Any], timeout: float) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Render pool is shut down")
+            if not self._workers and not self._starting:
+                raise RenderError("No render workers available")
+            self._pending.append((task, future, timeout))
+        return future
+
+    def render(self, script_path: Path, class_name: str, manim_args: List[str],
+               media_dir: Path, timeout: float = 600, output_file: Optional[str] = None) -> Path:
+        """Render a scene and wait for the output video path"""
+        future = self.submit(script_path, class_name, manim_args, media_dir, timeout, output_file)
+        return future.result()
+
+    def cancel(self, future: concurrent.futures.Future) -> bool:
+        """Cancel a queued or running render; a running render's worker is killed and replaced"""
+        if future.cancel():
+            return True
+        with self._lock:
+            for worker in self._workers:
+                if worker.future is future:
+                    logger.info(f"Cancelling render in worker {worker.process.pid}")
+                    self.stats["cancelled"] += 1
+                    worker.future = None
+                    future.set_exception(concurrent.futures.CancelledError("Render cancelled"))
+                    self._replace_worker(worker, crashed=False, kill=True)
+                    return True
+        return False
+
+    def preflight(self, script_path: Path, class_name: str, timeout: float = 60) -> Dict[str, Any]:
+        """Dry-run a scene in a warm worker and wait for its mobject bounding boxes"""
+        task = {
+            "script_path": str(Path(script_path).absolute()),
+            "class_name": class_name,
+            "preflight": True,
+        }
+        return self._enqueue(task, timeout).result()
+
+    def _manage(self):
+        """Dispatch pending tasks, collect results and replace dead or retired workers"""
+        while True:
+            self._restart_workers()
+            with self._lock:
+                if self._closed:
+                    return
+                if not self._workers and not self._starting:
+                    self._fail_pending(RenderError("No render workers available"))
+                self._dispatch()
+                waitables = {}
+                for worker in self._workers:
+                    waitables[worker.conn] = worker
+                    waitables[worker.process.sentinel] = worker
+
+            if not waitables:
+                time.sleep(0.2)
+                continue
+            ready = multiprocessing.connection.wait(list(waitables), timeout=0.2)
+
+            with self._lock:
+                if self._closed:
+                    return
+                handled = set()
+                for handle in ready:
+                    worker = waitables[handle]
+                    if id(worker) in handled:
+                        continue
+                    handled.add(id(worker))
+                    self._handle_worker_event(worker)
+                self._check_deadlines()
+
+    def _dispatch(self):
+        # Caller holds self._lock
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.idle:
+                task, future, timeout = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    worker.conn.send(task)
+                except (OSError, BrokenPipeError) as e:
+                    future.set_exception(RenderError(f"Render worker unavailable: {e}"))
+                    continue
+                worker.future = future
+                worker.deadline = time.monotonic() + timeout
+                self.stats["tasks"] += 1
+
+    def _handle_worker_event(self, worker: _PoolWorker):
+        # Caller holds self._lock
+        try:
+            message = worker.conn.recv() if worker.conn.poll() else None
+        except (EOFError, OSError):
+            message = None
+
+        if message is None:
+            if not worker.process.is_alive():
+                self._replace_worker(worker, crashed=True)
+            return
+
+        kind, payload = message
+        if kind == "ready":
+            worker.ready = True
+            self._startup_failures = 0
+        elif kind == "startup_failed":
+            logger.error(f"Render worker failed to import Manim:\n{payload}")
+            self._startup_failures += 1
+            self._replace_worker(worker, crashed=False)
+            if not self._workers and not self._starting:
+                self._fail_pending(RenderError("Render worker could not import Manim", payload))
+        elif kind == "done":
+            status, value = payload["result"]
+            future, worker.future, worker.deadline = worker.future, None, None
+            if future is not None:
+                if status == "ok":
+                    future.set_result(Path(value) if isinstance(value, str) else value)
+                else:
+                    self.stats["failed"] += 1
+                    future.set_exception(SceneError("Manim render failed", value))
+            if payload["retiring"]:
+                logger.info(f"Recycling render worker {worker.process.pid} "
+                            f"(peak memory {payload['memory_mb']:.0f} MB)")
+                self.stats["recycled"] += 1
+                self._replace_worker(worker, crashed=False)
+
+    def _check_deadlines(self):
+        # Caller holds self._lock
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.future is not None and worker.deadline is not None and now > worker.deadline:
+                logger.error(f"Render worker {worker.process.pid} timed out, killing it")
+                self.stats["timeouts"] += 1
+                future, worker.future = worker.future, None
+                future.set_exception(TimeoutError("Manim render timed out in worker pool"))
+                self._replace_worker(worker, crashed=False, kill=True)
+
+    def _replace_worker(self, worker: _PoolWorker, crashed: bool, kill: bool = False):
+        # Caller holds self._lock
+        if crashed:
+            self.stats["crashes"] += 1
+            logger.error(f"Render worker {worker.process.pid} exited unexpectedly "
+                         f"(exit code {worker.process.exitcode})")
+            if worker.future is not None:
+                self.stats["failed"] += 1
+                worker.future.set_exception(RenderError(
+                    "Render worker crashed",
+                    f"Render worker exited with code {worker.process.exitcode}"
+                ))
+                worker.future = None
+
+        if crashed and not worker.ready:
+            self._startup_failures += 1
+
+        self._workers.remove(worker)
+        self._retired.append((worker, kill or crashed))
+        if self._startup_failures >= MAX_STARTUP_FAILURES:
+            logger.error(f"Render workers failed to start {self._startup_failures} times in a row, not restarting")
+        elif not self._closed:
+            self._starting += 1
+
+    def _restart_workers(self):
+        """Stop retired workers and start their replacements
+
+        Runs on the manager thread without the lock: stopping a worker can
+        wait up to 10 s for it to exit, which must not block submit or cancel.
+        """
+        with self._lock:
+            retired, self._retired = self._retired, []
+            starting = self._starting
+        for worker, kill in retired:
+            worker.stop(kill=kill)
+        for _ in range(starting):
+            worker = self._start_worker()
+            with self._lock:
+                self._starting -= 1
+                if not self._closed:
+                    self._workers.append(worker)
+                    continue
+            worker.stop()
+
+    def _fail_pending(self, error: Exception):
+        # Caller holds self._lock
+        while self._pending:
+            _, future, _ = self._pending.popleft()
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool statistics"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats["workers"] = len(self._workers)
+            stats["pending"] = len(self._pending)
+            return stats
+
+    def shutdown(self):
+        """Stop all workers and fail any queued renders"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._fail_pending(RuntimeError("Render pool shut down"))
+            workers, self._workers = self._workers, []
+            retired, self._retired = self._retired, []
+
+        self._manager.join(timeout=5)
+        for worker in workers:
+            if worker.future is not None:
+                worker.future.set_exception(RuntimeError("Render pool shut down"))
+            worker.stop(kill=worker.future is not None)
+        for worker, kill in retired:
+            worker.stop(kill=kill)
+
+
+_render_pool: Optional[ManimRenderPool] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> ManimRenderPool:
+    """Get the process-wide render pool, starting it on first use"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ManimRenderPool()
+            atexit.register(_render_pool.shutdown)
+        return _render_pool
@@ -0,0 +1,388 @@
+"""
+Static validation of generated Manim scene code
+"""
+
+import ast
+import builtins
+import importlib
+import inspect
+import json
+import textwrap
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+
+import sys
+from pathlib import Path
+# Add project root to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import API_INDEX_DIR
+from src.utils.cache import FileCache, RENDER_TEMPLATE_FILES, get_manim_version, hash_key
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = "api-index-v1"
+
+# Modules generated scenes import names from
+INDEXED_MODULES = ["manim", "src.templates.layouts", "manim_layout_manager"]
+
+BUILTIN_NAMES = set(dir(builtins)) | {"__name__", "__file__"}
+
+
+# ============================================================================
+# API INDEX
+# ============================================================================
+
+def _signature_params(function) -> Tuple[Optional[List[str]], bool]:
+    """Get keyword-usable parameter names and whether **kwargs is accepted"""
+    try:
+        signature = inspect.signature(function)
+    except (TypeError, ValueError):
+        return None, True
+
+    params = []
+    accepts_kwargs = False
+    for name, param in signature.parameters.items():
+        if param.kind == param.VAR_KEYWORD:
+            accepts_kwargs = True
+        elif param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY) and name != "self":
+            params.append(name)
+    return params, accepts_kwargs
+
+
+def _constructor_params(cls) -> Tuple[Optional[List[str]], bool]:
+    """Collect constructor keywords along the MRO while each __init__ forwards **kwargs"""
+    params: List[str] = []
+    for klass in cls.__mro__:
+        if klass is object:
+            break
+        if "__init__" not in vars(klass):
+            continue
+        own_params, accepts_kwargs = _signature_params(vars(klass)["__init__"])
+        if own_params is None:
+            return None, True
+        params.extend(param for param in own_params if param not in params)
+        if not accepts_kwargs:
+            return params, False
+    # Nothing in the chain closes the keyword set, so any keyword may be valid
+    return params, True
+
+
+def _instance_attributes(cls) -> Set[str]:
+    """Find attributes assigned on self anywhere in the class hierarchy's source"""
+    attributes = set()
+    for klass in cls.__mro__:
+        if klass is object:
+            break
+        try:
+            tree = ast.parse(textwrap.dedent(inspect.getsource(klass)))
+        except (OSError, TypeError, SyntaxError):
+            continue
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                    and node.value.id == "self" and isinstance(node.ctx, ast.Store)):
+                attributes.add(node.attr)
+    return attributes
+
+
+def _describe(obj: Any) -> Dict[str, Any]:
+    """Summarize one exported object for the index"""
+    if inspect.isclass(obj):
+        params, accepts_kwargs = _constructor_params(obj)
+        entry = {
+            "kind": "class",
+            "params": params,
+            "accepts_kwargs": accepts_kwargs,
+            "attributes": sorted(
+                {name for name in dir(obj) if not name.startswith("__")} | _instance_attributes(obj)
+            )
+        }
+        # Generated code calls scene methods through self, so keep their signatures
+        if any(klass.__name__ == "Scene" for klass in obj.__mro__):
+            methods = {}
+            for name in dir(obj):
+                member = getattr(obj, name, None)
+                if not name.startswith("_") and inspect.isfunction(member):
+                    method_params, method_kwargs = _signature_params(member)
+                    if method_params is not None:
+                        methods[name] = {"params": method_params, "accepts_kwargs": method_kwargs}
+            entry["methods"] = methods
+        return entry
+
+    if inspect.ismodule(obj):
+        return {"kind": "module"}
+
+    if callable(obj):
+        params, accepts_kwargs = _signature_params(obj)
+        return {"kind": "function", "params": params, "accepts_kwargs": accepts_kwargs}
+
+    return {"kind": "constant"}
+
+
+class ApiIndex:
+    """Exported names and signatures of the modules generated scenes build on"""
+
+    def __init__(self, symbols: Dict[str, Dict[str, Any]], modules: Dict[str, List[str]],
+                 complete: bool):
+        self.symbols = symbols
+        self.modules = {name: set(names) for name, names in modules.items()}
+        self.complete = complete
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ApiIndex":
+        return cls(data["symbols"], data["modules"], data["complete"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbols": self.symbols,
+            "modules": {name: sorted(names) for name, names in self.modules.items()},
+            "complete": self.complete
+        }
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.symbols.get(name)
+
+
+def build_api_index(module_names: List[str] = None) -> ApiIndex:
+    """Import the indexed modules and record their public names and signatures
+
+    The index is only complete when every module could be imported; an
+    incomplete index disables the checks that would otherwise flag names
+    from the missing modules.
+    """
+    symbols: Dict[str, Dict[str, Any]] = {}
+    modules: Dict[str, List[str]] = {}
+    complete = True
+
+    for module_name in module_names or INDEXED_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            logger.warning(f"Could not index {module_name} for static validation: {e}")
+            complete = False
+            continue
+
+        names = [name for name in dir(module) if not name.startswith("_")]
+        modules[module_name] = names
+        for name in names:
+            if name not in symbols:
+                try:
+                    symbols[name] = _describe(getattr(module, name))
+                except Exception as e:
+                    logger.debug(f"Could not describe {module_name}.{name}: {e}")
+
+    return ApiIndex(symbols, modules, complete)
+
+
+_api_index: Optional[ApiIndex] = None
+_api_index_lock = threading.Lock()
+
+
+def get_api_index() -> ApiIndex:
+    """Get the API index, loading it from disk when Manim and the templates are unchanged"""
+    global _api_index
+    with _api_index_lock:
+        if _api_index is not None:
+            return _api_index
+
+        template_sources = []
+        for template_file in RENDER_TEMPLATE_FILES:
+            try:
+                template_sources.append(template_file.read_bytes())
+            except OSError:
+                template_sources.append(b"")
+        key = hash_key(INDEX_FORMAT_VERSION, get_manim_version(), *template_sources)
+
+        cache = FileCache(API_INDEX_DIR, 64 * 1024 * 1024, suffix=".json")
+        cached = cache.read_text(key)
+        if cached is not None:
+            try:
+                _api_index = ApiIndex.from_dict(json.loads(cached))
+                return _api_index
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable API index cache: {e}")
+
+        logger.info("Building Manim API index for static validation")
+        _api_index = build_api_index()
+        if _api_index.complete:
+            cache.write_text(key, json.dumps(_api_index.to_dict()))
+        return _api_index
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+@dataclass
+class ValidationIssue:
+    """A problem found in generated scene code"""
+    line: int
+    kind: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.message}"
+
+
+def format_issues(issues: List[ValidationIssue]) -> str:
+    """Format issues for logs and the correction prompt"""
+    return "\n".join(str(issue) for issue in issues)
+
+
+def _bound_names(tree: ast.AST) -> Set[str]:
+    """Every name the module binds anywhere; scopes are not distinguished"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.alias) and node.name != "*":
+            names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+    return names
+
+
+class _SceneChecker(ast.NodeVisitor):
+    """Walk a scene module and record API misuse"""
+
+    def __init__(self, index: ApiIndex, tree: ast.Module):
+        self.index = index
+        self.issues: List[ValidationIssue] = []
+        self.known_names = BUILTIN_NAMES | _bound_names(tree)
+        self.check_names = index.complete
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and any(alias.name == "*" for alias in node.names):
+                if node.module in index.modules:
+                    self.known_names |= index.modules[node.module]
+                else:
+                    # Names from an unindexed star import cannot be checked
+                    self.check_names = False
+
+        self.class_stack: List[Optional[Dict[str, Any]]] = []
+
+    def _add(self, node: ast.AST, kind: str, message: str):
+        self.issues.append(ValidationIssue(getattr(node, "lineno", 0), kind, message))
+
+    def _symbol(self, node: ast.AST) -> Optional[Dict[str, Any]]:
+        """Resolve a bare name to its index entry if it comes from an indexed module"""
+        if isinstance(node, ast.Name) and node.id in self.index.symbols:
+            return self.index.symbols[node.id]
+        return None
+
+    # -- scene classes -----------------------------------------------------
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        bases = [self._symbol(base) for base in node.bases]
+        scope = None
+        if bases and all(base and base["kind"] == "class" for base in bases):
+            attributes = set()
+            methods = {}
+            for base in bases:
+                attributes.update(base.get("attributes", []))
+                methods.update(base.get("methods", {}))
+            for child in ast.walk(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    attributes.add(child.name)
+                    methods.pop(child.name, None)
+                elif (isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name)
+                        and child.value.id == "self" and isinstance(child.ctx, ast.Store)):
+                    attributes.add(child.attr)
+                elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    attributes.add(child.id)
+            scope = {"name": node.name, "attributes": attributes, "methods": methods}
+
+        self.class_stack.append(scope)
+        self.generic_visit(node)
+        self.class_stack.pop()
+
+    def _scene_scope(self) -> Optional[Dict[str, Any]]:
+        return self.class_stack[-1] if self.class_stack else None
+
+    def visit_Attribute(self, node: ast.Attribute):
+        scope = self._scene_scope()
+        if (scope and isinstance(node.value, ast.Name) and node.value.id == "self"
+                and isinstance(node.ctx, ast.Load) and node.attr not in scope["attributes"]):
+            self._add(node, "unknown_attribute", f"{scope['name']} has no attribute 'self.{node.attr}'")
+        self.generic_visit(node)
+
+    # -- names and calls ---------------------------------------------------
+
+    def visit_Name(self, node: ast.Name):
+        if self.check_names and isinstance(node.ctx, ast.Load) and node.id not in self.known_names:
+            self._add(node, "unknown_name", f"'{node.id}' is not defined or imported")
+
+    def visit_Expr(self, node: ast.Expr):
+        target = node.value
+        if isinstance(target, ast.Name):
+            symbol = self._symbol(target)
+            if symbol and symbol["kind"] in ("class", "function"):
+                self._add(node, "missing_call", f"'{target.id}' is referenced but never called; add ()")
+        elif isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self":
+            scope = self._scene_scope()
+            if scope and target.attr in scope["methods"]:
+                self._add(node, "missing_call", f"'self.{target.attr}' is referenced but never called; add ()")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        symbol = self._symbol(func)
+        name = func.id if isinstance(func, ast.Name) else None
+
+        if symbol and symbol["kind"] == "constant":
+            self._add(node, "not_callable", f"'{name}' is a constant and cannot be called")
+        elif symbol and symbol["kind"] in ("class", "function"):
+            self._check_keywords(node, name, symbol)
+
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+            scope = self._scene_scope()
+            method = scope["methods"].get(func.attr) if scope else None
+            if method:
+                self._check_keywords(node, f"self.{func.attr}", method)
+
+            if func.attr == "play":
+                for argument in node.args:
+                    argument_symbol = self._symbol(argument)
+                    if argument_symbol and argument_symbol["kind"] == "class":
+                        self._add(argument, "missing_call",
+                                  f"'{argument.id}' is passed to self.play without being called; "
+                                  f"use {argument.id}(mobject)")
+
+        self.generic_visit(node)
+
+    def _check_keywords(self, node: ast.Call, name: str, signature: Dict[str, Any]):
+        params = signature.get("params")
+        if params is None or signature.get("accepts_kwargs", True):
+            return
+        for keyword in node.keywords:
+            if keyword.arg is not None and keyword.arg not in params:
+                self._add(keyword.value, "unknown_argument",
+                          f"{name}() got an unexpected keyword argument '{keyword.arg}' "
+                          f"(accepted: {', '.join(params) or 'none'})")
+
+
+def validate_scene_source(scene_code: str, index: Optional[ApiIndex] = None) -> List[ValidationIssue]:
+    """Statically check scene code against the Manim and template APIs"""
+    try:
+        tree = ast.parse(scene_code)
+    except SyntaxError as e:
+        return [ValidationIssue(e.lineno or 0, "syntax", f"Syntax error: {e.msg}")]
+
+    checker = _SceneChecker(index or get_api_index(), tree)
+    checker.visit(tree)
+
+    # Report each distinct problem once
+    unique = {}
+    for issue in checker.issues:
+        unique.setdefault((issue.kind, issue.message), issue)
+    return sorted(unique.values(), key=lambda issue: issue.line)
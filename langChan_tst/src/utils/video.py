@@ -5,49 +5,60 @@ Video processing utilities
 import subprocess
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from src.utils.probe import probe_media, probe_media_batch
 
 logger = logging.getLogger(__name__)
 
+# Audio format every segment is converted to before concatenation
+AUDIO_SAMPLE_RATE = 48000
+AUDIO_CHANNEL_LAYOUT = "stereo"
 
-def get_audio_duration(audio_file: Path) -> float:
-    """Get audio duration using ffprobe"""
-    try:
-        result = subprocess.run([
-            "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-            "-of", "csv=p=0", str(audio_file)
-        ], capture_output=True, text=True, check=True)
-        
-        duration = float(result.stdout.strip())
+# Canonical encoding profile; clips that share it can be concatenated without re-encoding
+ENCODE_ARGS = [
+    "-c:v", "libx264",
+    "-profile:v", "high",
+    "-pix_fmt", "yuv420p",
+    "-video_track_timescale", "90000",
+    "-c:a", "aac",
+    "-ar", str(AUDIO_SAMPLE_RATE),
+    "-ac", "2",
+    "-movflags", "+faststart",
+]
+
+# Stream properties that must match for concat demuxer stream copy
+CONCAT_SIGNATURE_FIELDS = [
+    "codec", "profile", "width", "height", "frame_rate", "time_base", "pix_fmt",
+    "audio_codec", "sample_rate", "channel_layout"
+]
+
+
+def get_media_duration(media_file: Path) -> Optional[float]:
+    """Get media duration, or None if the file cannot be probed"""
+    info = probe_media(media_file)
+    if info is None:
+        logger.warning(f"Could not get duration for {media_file}")
+        return None
+    return info["duration"]
+
+
+def get_audio_duration(audio_file: Path) -> Optional[float]:
+    """Get audio duration, or None if the file cannot be probed"""
+    duration = get_media_duration(audio_file)
+    if duration is not None:
         logger.debug(f"Audio duration for {audio_file}: {duration}s")
-        return duration
-        
-    except (subprocess.CalledProcessError, ValueError) as e:
-        logger.warning(f"Could not get audio duration for {audio_file}: {e}")
-        return 5.0  # Default fallback
+    return duration
 
 
 def combine_audio_video(video_path: Path, audio_path: Path, output_path: Path, 
-                       extend_video: bool = True) -> bool:
+                       extend_video: bool = True, padding_duration: float = 0.0) -> bool:
     """Combine audio and video using ffmpeg"""
     try:
-        audio_duration = get_audio_duration(audio_path)
-        
         if extend_video:
-            # Extend video to match audio duration by holding last frame
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", str(video_path),
-                "-i", str(audio_path),
-                "-c:v", "libx264",
-                "-c:a", "aac",
-                "-filter_complex", 
-                f"[0:v]tpad=stop_mode=clone:stop_duration={audio_duration}[v]",
-                "-map", "[v]",
-                "-map", "1:a",
-                "-shortest",
-                str(output_path)
-            ]
+            # Hold the last frame under the narration and emit the canonical profile
+            logger.info(f"Combining audio and video: {video_path.name} + {audio_path.name}")
+            return encode_scene_clip(video_path, audio_path, output_path, padding_duration)
         else:
             # Simple combination without extending
             cmd = [
@@ -74,52 +85,79 @@ def combine_audio_video(video_path: Path, audio_path: Path, output_path: Path,
         return False
 
 
+def _concat_signature(info: Optional[dict]) -> Optional[Tuple]:
+    if not info or "codec" not in info:
+        return None
+    return tuple(info.get(field) for field in CONCAT_SIGNATURE_FIELDS)
+
+
+def get_concat_signature(video_path: Path) -> Optional[Tuple]:
+    """Get the stream properties that decide whether clips can be stream-copied together"""
+    return _concat_signature(probe_media(video_path))
+
+
+def can_stream_copy(video_paths: List[Path]) -> bool:
+    """Check that all clips share one encoding profile and carry an audio track"""
+    signatures = {_concat_signature(info) for info in probe_media_batch(video_paths).values()}
+    if len(signatures) != 1:
+        return False
+    
+    signature = signatures.pop()
+    return signature is not None and signature[CONCAT_SIGNATURE_FIELDS.index("audio_codec")] is not None
+
+
 def concatenate_videos(video_paths: List[Path], output_path: Path, 
                       add_padding: bool = True, padding_duration: float = 3.0) -> bool:
-    """Concatenate multiple videos using ffmpeg"""
+    """Concatenate multiple videos, stream-copying when they share one encoding profile
+    
+    Padding is baked into a re-encoded copy of the last clip only. Clips with
+    mismatched formats fall back to a single re-encode via assemble_final_video.
+    """
+    concat_file = output_path.parent / f".{output_path.stem}_concat_list.txt"
+    padded_tail = output_path.parent / f".{output_path.stem}_tail.mp4"
+    
     try:
         if not video_paths:
             logger.error("No video paths provided for concatenation")
             return False
         
-        # Create temporary concat file
-        concat_file = output_path.parent / "concat_list.txt"
+        for video_path in video_paths:
+            if not video_path.exists():
+                logger.error(f"Video file not found: {video_path}")
+                return False
+        
+        padding = padding_duration if add_padding else 0.0
+        clips = list(video_paths)
+        
+        stream_copy = can_stream_copy(clips)
+        if stream_copy and padding > 0:
+            stream_copy = (
+                encode_scene_clip(clips[-1], None, padded_tail, padding)
+                and get_concat_signature(padded_tail) == get_concat_signature(clips[0])
+            )
+            clips[-1] = padded_tail
+        
+        if not stream_copy:
+            logger.info(f"Scene clips do not share an encoding profile, re-encoding {len(video_paths)} videos")
+            return assemble_final_video([(video_path, None) for video_path in video_paths], output_path, padding)
         
         with open(concat_file, 'w') as f:
-            for video_path in video_paths:
-                if not video_path.exists():
-                    logger.error(f"Video file not found: {video_path}")
-                    return False
+            for video_path in clips:
                 f.write(f"file '{video_path.absolute()}'\n")
         
-        if add_padding:
-            # Add padding between videos
-            cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", str(concat_file),
-                "-vf", f"tpad=stop_mode=clone:stop_duration={padding_duration}",
-                "-c:a", "copy",
-                str(output_path)
-            ]
-        else:
-            # Simple concatenation
-            cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", str(concat_file),
-                "-c", "copy",
-                str(output_path)
-            ]
+        cmd = [
+            "ffmpeg", "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(concat_file),
+            "-c", "copy",
+            "-movflags", "+faststart",
+            str(output_path)
+        ]
         
-        logger.info(f"Concatenating {len(video_paths)} videos")
+        logger.info(f"Concatenating {len(clips)} videos without re-encoding")
         subprocess.run(cmd, check=True, capture_output=True)
         
-        # Clean up
-        concat_file.unlink()
-        
         logger.info(f"✓ Video concatenation successful: {output_path}")
         return True
         
@@ -131,8 +169,126 @@ def concatenate_videos(video_paths: List[Path], output_path: Path,
         return False
     finally:
         # Ensure cleanup
-        if 'concat_file' in locals() and concat_file.exists():
-            concat_file.unlink()
+        for temporary_file in (concat_file, padded_tail):
+            if temporary_file.exists():
+                temporary_file.unlink()
+
+
+def encode_scene_clip(video_path: Path, audio_path: Optional[Path], output_path: Path,
+                      padding_duration: float = 0.0) -> bool:
+    """Encode one scene in the canonical profile, holding its last frame for narration and padding"""
+    return assemble_final_video([(video_path, audio_path)], output_path, padding_duration)
+
+
+def assemble_final_video(segments: List[Tuple[Path, Optional[Path]]], output_path: Path,
+                         padding_duration: float = 3.0) -> bool:
+    """Mux, pad and concatenate raw scene renders in a single ffmpeg encode
+    
+    Each segment is a (video, audio) pair. When audio is None the clip's own
+    audio track is used, or silence if it has none. A segment lasts as long
+    as the longer of its two streams: the last video frame is held while
+    narration runs on, and silence fills the gap when the animation is
+    longer. The final segment is extended by padding_duration.
+    Every clip is scaled to the first clip's size and frame rate so scenes
+    from different quality presets or cache entries can be mixed.
+    """
+    try:
+        if not segments:
+            logger.error("No segments provided for assembly")
+            return False
+        
+        # Probe every input in one batch; scene WAVs are read from their headers
+        media_info = probe_media_batch([path for segment in segments for path in segment if path])
+        
+        first_info = media_info[Path(segments[0][0])]
+        if not first_info or not first_info.get("width"):
+            logger.error(f"Could not read video format of {segments[0][0]}")
+            return False
+        
+        width, height = first_info["width"], first_info["height"]
+        fps = first_info.get("fps") or 30
+        
+        inputs = []
+        filters = []
+        concat_pads = []
+        
+        for index, (video_path, audio_path) in enumerate(segments):
+            video_info = media_info[Path(video_path)]
+            if not video_info or "codec" not in video_info:
+                logger.error(f"Video file not readable: {video_path}")
+                return False
+            
+            inputs.extend(["-i", str(video_path)])
+            video_input = len(inputs) // 2 - 1
+            video_duration = video_info["duration"]
+            
+            audio_input = None
+            audio_duration = 0.0
+            if audio_path is None and video_info.get("audio_codec"):
+                audio_input = video_input
+                audio_duration = video_info["duration"]
+            elif audio_path and audio_path.exists():
+                audio_info = media_info[Path(audio_path)]
+                if audio_info is None:
+                    logger.error(f"Audio file not readable: {audio_path}")
+                    return False
+                audio_duration = audio_info["duration"]
+                inputs.extend(["-i", str(audio_path)])
+                audio_input = len(inputs) // 2 - 1
+            
+            duration = max(video_duration, audio_duration)
+            if index == len(segments) - 1:
+                duration += padding_duration
+            hold = duration - video_duration
+            
+            filters.append(
+                f"[{video_input}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p,"
+                f"tpad=stop_mode=clone:stop_duration={hold:.3f},"
+                f"trim=duration={duration:.3f},setpts=PTS-STARTPTS[v{index}]"
+            )
+            
+            if audio_input is not None:
+                filters.append(
+                    f"[{audio_input}:a]aresample={AUDIO_SAMPLE_RATE},"
+                    f"aformat=sample_fmts=fltp:channel_layouts={AUDIO_CHANNEL_LAYOUT},"
+                    f"apad=whole_dur={duration:.3f},atrim=duration={duration:.3f},"
+                    f"asetpts=PTS-STARTPTS[a{index}]"
+                )
+            else:
+                filters.append(
+                    f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl={AUDIO_CHANNEL_LAYOUT},"
+                    f"atrim=duration={duration:.3f}[a{index}]"
+                )
+            
+            concat_pads.append(f"[v{index}][a{index}]")
+        
+        filters.append(f"{''.join(concat_pads)}concat=n={len(segments)}:v=1:a=1[catv][outa]")
+        # Re-apply the scene rate after concat so the encoder does not fall back to 25 fps
+        filters.append(f"[catv]fps={fps}[outv]")
+        
+        cmd = [
+            "ffmpeg", "-y",
+            *inputs,
+            "-filter_complex", ";".join(filters),
+            "-map", "[outv]",
+            "-map", "[outa]",
+            *ENCODE_ARGS,
+            str(output_path)
+        ]
+        
+        logger.info(f"Assembling {len(segments)} segments in a single pass")
+        subprocess.run(cmd, check=True, capture_output=True)
+        
+        logger.info(f"✓ Video assembly successful: {output_path}")
+        return True
+        
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Video assembly failed: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error in video assembly: {e}")
+        return False
 
 
 def convert_video_format(input_path: Path, output_path: Path, 
@@ -205,44 +361,11 @@ def extract_audio_from_video(video_path: Path, audio_path: Path) -> bool:
 
 
 def get_video_info(video_path: Path) -> Optional[dict]:
-    """Get video information using ffprobe"""
-    try:
-        cmd = [
-            "ffprobe", "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            str(video_path)
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
-        import json
-        info = json.loads(result.stdout)
-        
-        # Extract useful information
-        video_info = {
-            "duration": float(info["format"].get("duration", 0)),
-            "size": int(info["format"].get("size", 0)),
-            "format": info["format"].get("format_name", "unknown")
-        }
-        
-        # Get video stream info
-        for stream in info.get("streams", []):
-            if stream.get("codec_type") == "video":
-                video_info.update({
-                    "width": stream.get("width", 0),
-                    "height": stream.get("height", 0),
-                    "fps": eval(stream.get("r_frame_rate", "0/1")),
-                    "codec": stream.get("codec_name", "unknown")
-                })
-                break
-        
-        return video_info
-        
-    except (subprocess.CalledProcessError, json.JSONDecodeError, Exception) as e:
-        logger.error(f"Could not get video info for {video_path}: {e}")
-        return None
+    """Get video information, cached by path, size and mtime"""
+    info = probe_media(video_path)
+    if info is None:
+        logger.error(f"Could not get video info for {video_path}")
+    return info
 
 
 def create_video_thumbnail(video_path: Path, thumbnail_path: Path, 
@@ -138,10 +138,10 @@ def test_video_utils():
         with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
             temp_path = Path(temp_audio.name)
         
-        # This should return default fallback duration
+        # Unreadable audio is reported instead of guessed
         duration = get_audio_duration(temp_path)
-        assert duration == 5.0  # Default fallback
-        print("Audio duration fallback: ✓")
+        assert duration is None
+        print("Audio duration failure: ✓")
         
         # Clean up
         temp_path.unlink(missing_ok=True)
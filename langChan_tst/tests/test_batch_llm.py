@@ -0,0 +1,173 @@
+"""
+Tests for concurrent batch Manim code generation
+"""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.providers.llm import BatchManimLLM
+from src.utils.model_router import ModelRouter, ModelTier
+
+
+class RateLimitError(Exception):
+    """Stand-in for a 429 API error"""
+
+    code = 429
+
+
+class LatencyModels:
+    """Stand-in for client.models that injects per-scene latency and failures"""
+
+    def __init__(self, latency=None, failures=None, responses=None):
+        self.latency = latency or {}
+        self.failures = failures or {}
+        self.responses = responses or {}
+        self.calls = []
+        self.models_used = []
+        self.prompts = []
+        self.chunks_sent = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, model, contents, config):
+        prompt = contents[-1].parts[0].text
+        scene = next(seq for seq in range(1, 10) if f"Scene Number: {seq}\n" in prompt)
+        with self.lock:
+            self.calls.append(scene)
+            self.models_used.append(model)
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failures = self.failures.get(scene, [])
+            error = failures.pop(0) if failures else None
+            responses = self.responses.get(scene, [])
+            text = responses.pop(0) if responses else f"self.wait({scene})"
+        try:
+            time.sleep(self.latency.get(scene, 0.01))
+            if error is not None:
+                raise error
+            return SimpleNamespace(text=text, candidates=[])
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def generate_content_stream(self, model, contents, config):
+        text = self.generate_content(model, contents, config).text
+        for start in range(0, len(text), 16):
+            with self.lock:
+                self.chunks_sent += 1
+            yield SimpleNamespace(text=text[start:start + 16])
+
+
+class TestBatchManimLLM(unittest.TestCase):
+    """Test the concurrent fan-out in BatchManimLLM"""
+
+    def _batch(self, models: LatencyModels, scenes: int, **kwargs) -> BatchManimLLM:
+        kwargs.setdefault("retry_base_delay", 0.01)
+        batch = BatchManimLLM(client=SimpleNamespace(models=models), **kwargs)
+        for seq in range(1, scenes + 1):
+            batch.add_to_batch({"seq": seq, "text": "t", "anim": "a"}, "title_and_main_content", f"scene_{seq}")
+        return batch
+
+    def test_responses_are_yielded_as_they_complete(self):
+        """A slow request does not hold back the others, and in-flight calls stay bounded"""
+        models = LatencyModels(latency={1: 0.4})
+        batch = self._batch(models, 5, max_concurrency=2)
+
+        order = [response.id for response in batch.iter_batch()]
+
+        self.assertEqual(sorted(order), [f"scene_{seq}" for seq in range(1, 6)])
+        self.assertEqual(order[-1], "scene_1")
+        self.assertEqual(models.peak, 2)
+        self.assertEqual(batch.batch_requests, [])
+
+    def test_rate_limited_request_is_retried(self):
+        models = LatencyModels(failures={2: [RateLimitError("RESOURCE_EXHAUSTED")]})
+        results = self._batch(models, 2).process_batch()
+
+        self.assertTrue(all(result.success for result in results.values()))
+        self.assertEqual(models.calls.count(2), 2)
+
+    def test_non_retryable_error_fails_immediately(self):
+        models = LatencyModels(failures={1: [ValueError("bad request")]})
+        results = self._batch(models, 1).process_batch()
+
+        self.assertFalse(results["scene_1"].success)
+        self.assertEqual(models.calls, [1])
+
+    def test_slow_request_times_out(self):
+        models = LatencyModels(latency={1: 2.0})
+        started = time.monotonic()
+        results = self._batch(models, 2, request_timeout=0.2).process_batch()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertFalse(results["scene_1"].success)
+        self.assertIn("Timed out", results["scene_1"].error)
+        self.assertTrue(results["scene_2"].success)
+
+    def test_class_definition_is_cancelled_and_retried(self):
+        """A body request answered with a class is cut off early and retried with a note"""
+        runaway = "class Scene1(TitleAndMainContent):\n" + "    x = 1\n" * 2000
+        models = LatencyModels(responses={1: [runaway]})
+        batch = self._batch(models, 1)
+        results = batch.process_batch()
+
+        self.assertTrue(results["scene_1"].success)
+        self.assertEqual(results["scene_1"].content, "self.wait(1)")
+        self.assertEqual(models.calls, [1, 1])
+        self.assertIn("defines a class", models.prompts[1])
+        self.assertLess(models.chunks_sent, 10)
+        self.assertEqual(batch.stream_aborts, 1)
+
+    def test_runaway_repetition_gives_up_after_max_aborts(self):
+        repeated = "self.play(Write(text))\n" * 100
+        models = LatencyModels(responses={1: [repeated] * 3})
+        results = self._batch(models, 1, max_stream_aborts=1).process_batch()
+
+        self.assertFalse(results["scene_1"].success)
+        self.assertIn("repeated", results["scene_1"].error)
+        self.assertEqual(models.calls, [1, 1])
+
+    def test_unrecoverable_syntax_error_is_cancelled(self):
+        broken = "title = self.create_textbox('Hi', 4, 1)\nself.play(Write(title)))\n" + "self.wait(1)\n" * 40
+        models = LatencyModels(responses={1: [broken]})
+        results = self._batch(models, 1).process_batch()
+
+        self.assertTrue(results["scene_1"].success)
+        self.assertIn("syntax error", models.prompts[1])
+
+    def test_body_with_early_return_is_not_cancelled(self):
+        body = ("title = self.create_textbox('Hi', 4, 1)\nif title is None:\n    return\n"
+                + "".join(f"self.play(Write(title), run_time={n})\n" for n in range(10)))
+        models = LatencyModels(responses={1: [body]})
+        batch = self._batch(models, 1)
+        results = batch.process_batch()
+
+        self.assertTrue(results["scene_1"].success)
+        self.assertEqual(models.calls, [1])
+        self.assertEqual(batch.stream_aborts, 0)
+
+    def test_router_picks_the_model_per_layout(self):
+        router = ModelRouter([ModelTier("fast", 256), ModelTier("strong")], fast_layouts=["split_screen"])
+        models = LatencyModels()
+        batch = self._batch(models, 1, router=router, stream=False)
+        batch.add_to_batch({"seq": 2, "text": "t", "anim": "a"}, "split_screen", "scene_2")
+
+        results = {result.id: result for result in batch.iter_batch()}
+        self.assertEqual(results["scene_1"].model, "strong")
+        self.assertEqual(results["scene_2"].model, "fast")
+        self.assertEqual(sorted(models.models_used), ["fast", "strong"])
+        self.assertEqual(router.stats()["fast"]["requests"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
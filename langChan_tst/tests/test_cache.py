@@ -0,0 +1,220 @@
+"""
+Tests for the content-addressed cache utilities
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models import TTSConfig, TTSProvider
+from src.providers.llm import generate_text, response_cache_key
+from src.providers.tts import BaseTTSProvider, CachedTTSProvider
+from src.utils.cache import FileCache, ResponseCache, hash_key, render_cache_key
+
+
+class TestFileCache(unittest.TestCase):
+    """Test the size-capped file cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _make_file(self, name: str, size: int) -> Path:
+        path = self.root / name
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_put_then_fetch(self):
+        """A stored file can be copied back out and counts as a hit"""
+        cache = FileCache(self.root / "cache", max_bytes=1024, suffix=".mp4")
+        source = self._make_file("clip.mp4", 100)
+        key = hash_key("clip")
+
+        self.assertFalse(cache.fetch(key, self.root / "miss.mp4"))
+        cache.put(key, source)
+        destination = self.root / "out" / "clip.mp4"
+        self.assertTrue(cache.fetch(key, destination))
+        self.assertEqual(destination.read_bytes(), source.read_bytes())
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stores"]), (1, 1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Going over the size cap removes the entry that was used longest ago"""
+        cache = FileCache(self.root / "cache", max_bytes=250)
+        keys = [hash_key(name) for name in ("a", "b", "c")]
+
+        cache.put(keys[0], self._make_file("a", 100))
+        cache.put(keys[1], self._make_file("b", 100))
+        # Age both entries, then touch the first so the second is the LRU one
+        for key in keys[:2]:
+            os.utime(cache._entry_path(key), (time.time() - 60, time.time() - 60))
+        cache.get(keys[0])
+        cache.put(keys[2], self._make_file("c", 100))
+
+        self.assertTrue(cache.contains(keys[0]))
+        self.assertFalse(cache.contains(keys[1]))
+        self.assertTrue(cache.contains(keys[2]))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_render_key_depends_on_code_and_args(self):
+        base = render_cache_key("class A: pass", ["-qh"])
+        self.assertEqual(base, render_cache_key("class A: pass", ["-qh"]))
+        self.assertNotEqual(base, render_cache_key("class B: pass", ["-qh"]))
+        self.assertNotEqual(base, render_cache_key("class A: pass", ["-ql"]))
+
+
+class CountingTTSProvider(BaseTTSProvider):
+    """Fake provider that records every remote call"""
+
+    def __init__(self, config: TTSConfig, placeholder: bool = False):
+        super().__init__(config)
+        self.calls = []
+        self.placeholder = placeholder
+
+    def synthesize(self, text: str, output_path: Path) -> bool:
+        self.calls.append(text)
+        output_path.write_bytes(text.encode("utf-8"))
+        return True
+
+    def is_cacheable_output(self, output_path: Path) -> bool:
+        return not self.placeholder
+
+    def get_provider_name(self) -> str:
+        return "counting"
+
+
+class TestCachedTTSProvider(unittest.TestCase):
+    """Test the TTS cache wrapper"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.cache = FileCache(self.root / "cache", max_bytes=1024 * 1024)
+        self.config = TTSConfig(provider=TTSProvider.MOCK, voice="Kore", use_cache=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repeated_text_is_served_from_cache(self):
+        """Whitespace-only edits reuse the audio and are counted as hits"""
+        inner = CountingTTSProvider(self.config)
+        provider = CachedTTSProvider(inner, cache=self.cache)
+
+        self.assertTrue(provider.synthesize("Hello  world", self.root / "a.wav"))
+        self.assertTrue(provider.synthesize("Hello world\n", self.root / "b.wav"))
+
+        self.assertEqual(inner.calls, ["Hello  world"])
+        self.assertEqual((self.root / "b.wav").read_bytes(), b"Hello  world")
+        self.assertEqual(provider.get_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_voice_change_misses(self):
+        inner = CountingTTSProvider(self.config)
+        CachedTTSProvider(inner, cache=self.cache).synthesize("Hello", self.root / "a.wav")
+
+        other_voice = CountingTTSProvider(self.config.copy(update={"voice": "Puck"}))
+        CachedTTSProvider(other_voice, cache=self.cache).synthesize("Hello", self.root / "b.wav")
+
+        self.assertEqual(other_voice.calls, ["Hello"])
+
+    def test_placeholder_audio_is_not_cached(self):
+        """Fallback output must not be replayed once the real service is back"""
+        inner = CountingTTSProvider(self.config, placeholder=True)
+        provider = CachedTTSProvider(inner, cache=self.cache)
+
+        provider.synthesize("Hello", self.root / "a.wav")
+        provider.synthesize("Hello", self.root / "b.wav")
+
+        self.assertEqual(len(inner.calls), 2)
+        self.assertEqual(self.cache.get_stats()["stores"], 0)
+
+
+class FakeModels:
+    """Stand-in for client.models that counts generate_content calls"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text=self.text, candidates=[])
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the LLM response cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cache(self, ttl_seconds: float = 3600) -> ResponseCache:
+        return ResponseCache(self.root / "llm", max_bytes=1024 * 1024, ttl_seconds=ttl_seconds, memory_entries=2)
+
+    def test_identical_prompt_is_memoized(self):
+        client = SimpleNamespace(models=FakeModels("code"))
+        cache = self._cache()
+        config = {"temperature": 0.3, "max_output_tokens": 100}
+
+        for _ in range(2):
+            self.assertEqual(generate_text(client, "m", "prompt", "system", config, response_cache=cache), "code")
+        generate_text(client, "m", "prompt", "system", dict(config, temperature=0.1), response_cache=cache)
+
+        self.assertEqual(client.models.calls, 2)
+        self.assertEqual(cache.get_stats()["memory_hits"], 1)
+
+    def test_bypass_skips_lookup_but_refreshes(self):
+        client = SimpleNamespace(models=FakeModels("first"))
+        cache = self._cache()
+        generate_text(client, "m", "prompt", response_cache=cache)
+
+        client.models.text = "second"
+        self.assertEqual(generate_text(client, "m", "prompt", response_cache=cache, bypass_cache=True), "second")
+        self.assertEqual(generate_text(client, "m", "prompt", response_cache=cache), "second")
+        self.assertEqual(client.models.calls, 2)
+
+    def test_disk_tier_survives_restart_and_expires(self):
+        key = ResponseCache.make_key("m", None, "prompt", {})
+        self._cache().put(key, "answer")
+
+        self.assertEqual(self._cache().get(key), "answer")
+        time.sleep(0.05)
+        expired = self._cache(ttl_seconds=0.01)
+        self.assertIsNone(expired.get(key))
+        self.assertEqual(expired.get_stats()["expired"], 1)
+
+    def test_discarded_response_is_requested_again(self):
+        client = SimpleNamespace(models=FakeModels("broken code"))
+        cache = self._cache()
+        generate_text(client, "m", "prompt", "system", response_cache=cache)
+
+        cache.discard(response_cache_key("m", "prompt", "system"))
+        self.assertIsNone(self._cache().get(response_cache_key("m", "prompt", "system")))
+        generate_text(client, "m", "prompt", "system", response_cache=cache)
+        self.assertEqual(client.models.calls, 2)
+        self.assertEqual(cache.get_stats()["discarded"], 1)
+
+    def test_rejected_responses_are_not_cached(self):
+        client = SimpleNamespace(models=FakeModels("not json"))
+        cache = self._cache()
+        for _ in range(2):
+            generate_text(client, "m", "prompt", response_cache=cache, validate=lambda text: False)
+        self.assertEqual(client.models.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for rule-based scene error fixes
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import code_fixers
+from src.utils.code_fixers import apply_fixes, get_fixer_stats, record_fix_outcome
+
+SCENE_HEADER = "from manim import *\n\nclass Scene1(Scene):\n    def construct(self):\n"
+
+
+def _scene(body: str) -> str:
+    return SCENE_HEADER + body
+
+
+class TestCodeFixers(unittest.TestCase):
+    """Test each fix rule against the error it targets"""
+
+    def setUp(self):
+        code_fixers.reset_fixer_stats()
+
+    def test_name_alias_is_renamed(self):
+        code = _scene("        c = Circle(color=BLUE_C)  # keep this comment\n        self.play(ShowCreation(c))\n")
+        fix = apply_fixes(code, "NameError: name 'ShowCreation' is not defined\n")
+
+        self.assertEqual(fix.rules, ["name_alias"])
+        self.assertIn("self.play(Create(c))", fix.code)
+        self.assertIn("# keep this comment", fix.code)
+
+    def test_missing_import_is_added(self):
+        code = "from manim import *\n\nclass Scene1(Scene):\n    def construct(self):\n        x = np.array([1, 0, 0])\n"
+        fix = apply_fixes(code, "NameError: name 'np' is not defined")
+
+        self.assertEqual(fix.code.splitlines()[:2], ["from manim import *", "import numpy as np"])
+
+    def test_missing_manim_import(self):
+        code = "class Scene1(Scene):\n    def construct(self):\n        pass\n"
+        fix = apply_fixes(code, "NameError: name 'Scene' is not defined")
+        self.assertTrue(fix.code.startswith("from manim import *\n"))
+
+    def test_uncalled_method_is_called(self):
+        code = _scene("        dot = Dot(circle.get_center + UP)\n        self.add(always_redraw(circle.get_top))\n")
+        fix = apply_fixes(code, "TypeError: unsupported operand type(s) for +: 'method' and 'ndarray'")
+
+        self.assertIn("Dot(circle.get_center() + UP)", fix.code)
+        self.assertIn("always_redraw(circle.get_top)", fix.code)
+
+    def test_text_keyword_is_renamed_or_dropped(self):
+        code = _scene('        t = Text("Hi", size=36)\n        u = Text("Yo", weight=BOLD, align="left")\n')
+        fix = apply_fixes(code, "TypeError: Mobject.__init__() got an unexpected keyword argument 'size'")
+        self.assertIn('Text("Hi", font_size=36)', fix.code)
+
+        fix = apply_fixes(code, "TypeError: Mobject.__init__() got an unexpected keyword argument 'align'")
+        self.assertIn('Text("Yo", weight=BOLD)', fix.code)
+
+    def test_no_matching_rule_escalates(self):
+        self.assertIsNone(apply_fixes(_scene("        pass\n"), "ValueError: latex error converting to dvi"))
+        self.assertIsNone(apply_fixes(_scene("        pass\n"), "NameError: name 'mystery' is not defined"))
+
+    def test_outcomes_are_counted_per_rule(self):
+        code = _scene("        self.play(ShowCreation(Circle()))\n")
+        error = "NameError: name 'ShowCreation' is not defined"
+        record_fix_outcome(apply_fixes(code, error), None)
+        record_fix_outcome(apply_fixes(code, error), error)
+
+        self.assertEqual(get_fixer_stats()["name_alias"], {"fired": 2, "resolved": 1, "unresolved": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the job and script event broker
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.events import EventBroker, format_sse
+
+
+class TestEventBroker(unittest.TestCase):
+    """Test fan-out of events to asyncio subscribers"""
+
+    def test_events_published_from_threads_reach_subscribers(self):
+        broker = EventBroker()
+
+        async def scenario():
+            first = broker.subscribe(("job", "a"))
+            second = broker.subscribe(("job", "a"))
+            other = broker.subscribe(("job", "b"))
+            thread = threading.Thread(target=broker.publish, args=(("job", "a"), "job", {"progress": 50}))
+            thread.start()
+            thread.join()
+            received = [await asyncio.wait_for(q.get(), timeout=1) for q in (first, second)]
+            self.assertTrue(other.empty())
+
+            broker.unsubscribe(("job", "a"), first)
+            self.assertEqual(broker.subscriber_count(), 2)
+            return received
+
+        self.assertEqual(asyncio.run(scenario()), [("job", {"progress": 50})] * 2)
+
+    def test_slow_subscriber_keeps_latest_events(self):
+        broker = EventBroker(max_queued=2)
+
+        async def scenario():
+            queue = broker.subscribe("key")
+            for progress in range(5):
+                broker.publish("key", "job", progress)
+            await asyncio.sleep(0)
+            return [queue.get_nowait()[1] for _ in range(queue.qsize())]
+
+        self.assertEqual(asyncio.run(scenario()), [3, 4])
+
+    def test_format_sse(self):
+        message = format_sse("job", {"status": "running"})
+        self.assertTrue(message.startswith("event: job\ndata: "))
+        self.assertTrue(message.endswith("\n\n"))
+        self.assertEqual(json.loads(message.split("data: ", 1)[1]), {"status": "running"})
+
+
+if __name__ == "__main__":
+    unittest.main()
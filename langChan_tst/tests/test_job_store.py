@@ -0,0 +1,159 @@
+"""
+Tests for the SQLite job and script store
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.job_store import JobStore
+
+SCRIPT = {"title": "Circles", "scenes": [{"seq": 1, "text": "Hi", "anim": "Circle"}]}
+
+
+class TestJobStore(unittest.TestCase):
+    """Test script and job persistence"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "store.db"
+        self.store = JobStore(self.path, ttl_seconds=3600)
+        self.addCleanup(self.store.close)
+
+    def test_scripts_round_trip_and_survive_reopen(self):
+        self.store.put_script("tok", SCRIPT)
+        self.assertEqual(self.store.get_script("tok"), SCRIPT)
+        self.assertIsNone(self.store.get_script("missing"))
+
+        reopened = JobStore(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get_script("tok"), SCRIPT)
+        self.assertEqual(reopened._connect().execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_failed_merge_leaves_script_unchanged(self):
+        self.store.put_script("tok", SCRIPT)
+
+        def bad_merge(existing):
+            raise ValueError("invalid")
+
+        with self.assertRaises(ValueError):
+            self.store.update_script("tok", bad_merge)
+        self.assertEqual(self.store.get_script("tok"), SCRIPT)
+
+        merged = self.store.update_script("tok", lambda existing: dict(existing, title="Squares"))
+        self.assertEqual(merged["title"], "Squares")
+        self.assertEqual(self.store.get_script("tok")["title"], "Squares")
+
+    def test_concurrent_script_merges_are_not_lost(self):
+        self.store.put_script("tok", {"title": "T", "scenes": []})
+
+        def add_scene(seq):
+            def merge(existing):
+                time.sleep(0.01)
+                return dict(existing, scenes=existing["scenes"] + [seq])
+            self.store.update_script("tok", merge)
+
+        threads = [threading.Thread(target=add_scene, args=(seq,)) for seq in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(self.store.get_script("tok")["scenes"]), list(range(8)))
+
+    def test_pending_script_lifecycle(self):
+        self.store.reserve_script("tok")
+        self.assertEqual(self.store.get_script_status("tok")["status"], "pending")
+        self.assertIsNone(self.store.get_script("tok"))
+
+        self.assertTrue(self.store.complete_script("tok", SCRIPT))
+        status = self.store.get_script_status("tok")
+        self.assertEqual((status["status"], status["script"]), ("ready", SCRIPT))
+        self.assertEqual(self.store.get_script("tok"), SCRIPT)
+        # Only pending tokens are completed or failed
+        self.assertFalse(self.store.fail_script("tok", "late error"))
+        self.assertIsNone(self.store.get_script_status("missing"))
+
+    def test_failed_script_generation(self):
+        self.store.reserve_script("tok")
+        self.assertTrue(self.store.fail_script("tok", "LLM unavailable"))
+        status = self.store.get_script_status("tok")
+        self.assertEqual((status["status"], status["error"]), ("failed", "LLM unavailable"))
+        self.assertIsNone(self.store.get_script("tok"))
+
+    def test_user_script_wins_over_pending_generation(self):
+        self.store.reserve_script("tok")
+        edited = dict(SCRIPT, title="Mine")
+        self.store.update_script("tok", lambda existing: self.assertIsNone(existing) or edited)
+        self.assertFalse(self.store.complete_script("tok", SCRIPT))
+        self.assertEqual(self.store.get_script("tok"), edited)
+
+    def test_interrupted_script_generations_fail_on_restart(self):
+        self.store.reserve_script("pending")
+        self.store.put_script("ready", SCRIPT)
+        self.assertEqual(self.store.fail_interrupted_scripts(), 1)
+        self.assertEqual(self.store.get_script_status("pending")["status"], "failed")
+        self.assertEqual(self.store.get_script_status("ready")["status"], "ready")
+
+    def test_job_updates_and_listing(self):
+        for index, job_id in enumerate(("a", "b", "c")):
+            self.store.create_job(job_id, message="queued", token="tok")
+            time.sleep(0.002 * (index + 1))
+        job = self.store.update_job("b", status="completed", progress=100, result={"success": True})
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["result"], {"success": True})
+        self.assertEqual(job["token"], "tok")
+        self.assertIsNone(self.store.update_job("missing", status="failed"))
+        with self.assertRaises(ValueError):
+            self.store.update_job("a", created_at=0)
+
+        self.assertEqual([j["job_id"] for j in self.store.list_jobs()], ["c", "b", "a"])
+        self.assertEqual([j["job_id"] for j in self.store.list_jobs(limit=1)], ["c"])
+        self.assertEqual([j["job_id"] for j in self.store.list_jobs(status="pending")], ["c", "a"])
+        self.assertEqual(self.store.count_jobs(), 3)
+        self.assertEqual(self.store.count_jobs("completed"), 1)
+
+        self.assertTrue(self.store.delete_job("a"))
+        self.assertFalse(self.store.delete_job("a"))
+
+    def test_listing_uses_indexes(self):
+        plan = self.store._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+            ("pending", 10)
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("jobs_status_created_at", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    def test_expiry_keeps_active_jobs(self):
+        self.store.put_script("tok", SCRIPT)
+        self.store.create_job("done")
+        self.store.update_job("done", status="completed")
+        self.store.create_job("running", status="running")
+
+        later = time.time() + 7200
+        self.assertEqual(self.store.purge_expired(now=later), {"scripts": 1, "jobs": 1})
+        self.assertIsNone(self.store.get_script("tok"))
+        self.assertIsNone(self.store.get_job("done"))
+        self.assertIsNotNone(self.store.get_job("running"))
+
+    def test_interrupted_jobs_fail_on_restart(self):
+        self.store.create_job("queued")
+        self.store.create_job("running", status="running")
+        self.store.create_job("done")
+        self.store.update_job("done", status="completed")
+
+        self.assertEqual(self.store.fail_interrupted_jobs(), 2)
+        self.assertEqual(self.store.get_job("running")["status"], "failed")
+        self.assertEqual(self.store.get_job("done")["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+"""
+Tests for the API job worker pool
+"""
+
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core import engine as engine_module
+from src.core import jobs
+from src.core.engine import VideoGenerationEngine
+from src.core.jobs import JobWorkerPool, report_progress
+
+
+def _stepped_job(job_id, steps):
+    for step in steps:
+        report_progress(job_id, progress=step)
+    report_progress(job_id, status="completed", progress=100)
+
+
+def _crashing_job(job_id):
+    os._exit(1)
+
+
+def _crashing_render_job(job_id):
+    """Die while holding a render slot"""
+    jobs._render_slots.acquire()
+    os._exit(1)
+
+
+def _render_job(job_id, hold):
+    """Hold a render slot for a while and report when it was held"""
+    with jobs._render_slots:
+        start = time.time()
+        time.sleep(hold)
+        report_progress(job_id, status="completed", result={"start": start, "end": time.time()})
+
+
+class TestJobWorkerPool(unittest.TestCase):
+    """Test job execution in worker processes"""
+
+    def setUp(self):
+        self.updates = {}
+        self.done = threading.Condition()
+
+    def _on_update(self, job_id, **updates):
+        with self.done:
+            self.updates.setdefault(job_id, []).append(updates)
+            self.done.notify_all()
+
+    def _wait_for(self, job_ids, timeout=30):
+        def finished():
+            return all(
+                any(u.get("status") in ("completed", "failed") for u in self.updates.get(job_id, []))
+                for job_id in job_ids
+            )
+        with self.done:
+            self.assertTrue(self.done.wait_for(finished, timeout=timeout), self.updates)
+
+    def _pool(self, **kwargs) -> JobWorkerPool:
+        pool = JobWorkerPool(on_update=self._on_update, log_level="WARNING", **kwargs)
+        self.addCleanup(pool.shutdown, True)
+        return pool
+
+    def test_updates_arrive_in_order(self):
+        pool = self._pool(max_jobs=2)
+        for job_id in ("a", "b", "c"):
+            pool.submit(job_id, _stepped_job, [10, 20, 30])
+        self._wait_for(["a", "b", "c"])
+        for job_id in ("a", "b", "c"):
+            self.assertEqual([u["progress"] for u in self.updates[job_id]], [10, 20, 30, 100])
+        # The final update can arrive just before the job's future resolves
+        deadline = time.time() + 5
+        while pool.get_stats()["finished"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        stats = pool.get_stats()
+        self.assertEqual(stats["submitted"], 3)
+        self.assertEqual(stats["running"] + stats["pending"], 0)
+
+    def test_crashed_worker_fails_job_and_pool_recovers(self):
+        pool = self._pool(max_jobs=1)
+        pool.submit("crash", _crashing_job)
+        self._wait_for(["crash"])
+        self.assertEqual(self.updates["crash"][-1]["status"], "failed")
+        self.assertEqual(pool.get_stats()["crashed"], 1)
+
+        pool.submit("after", _stepped_job, [50])
+        self._wait_for(["after"])
+        self.assertEqual(self.updates["after"][-1]["status"], "completed")
+
+    def test_queued_jobs_are_resubmitted_after_a_crash(self):
+        pool = self._pool(max_jobs=1, render_budget=1)
+        pool.submit("crash", _crashing_render_job)
+        pool.submit("queued", _render_job, 0)
+        self._wait_for(["crash", "queued"])
+        self.assertEqual(self.updates["crash"][-1]["status"], "failed")
+        # The queued job ran in the new executor with a fresh render slot
+        self.assertEqual(self.updates["queued"][-1]["status"], "completed")
+        stats = pool.get_stats()
+        self.assertEqual((stats["crashed"], stats["requeued"]), (1, 1))
+
+    def test_render_budget_is_shared_across_jobs(self):
+        pool = self._pool(max_jobs=2, render_budget=1)
+        pool.submit("a", _render_job, 0.5)
+        pool.submit("b", _render_job, 0.5)
+        self._wait_for(["a", "b"])
+        first, second = sorted((self.updates[j][-1]["result"] for j in ("a", "b")),
+                               key=lambda r: r["start"])
+        self.assertGreaterEqual(second["start"], first["end"])
+
+
+class TestRunDirectories(unittest.TestCase):
+    """Test that concurrent jobs render into their own directories"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name in ("TMP_DIR", "RENDERS_DIR"):
+            self.addCleanup(setattr, engine_module, name, getattr(engine_module, name))
+            setattr(engine_module, name, Path(self.tmp.name) / name.lower())
+
+    def _engine(self, run_id, both_rendering):
+        engine = object.__new__(VideoGenerationEngine)
+        engine.run_id = run_id
+        engine.tmp_dir, engine.scene_renders_dir = engine_module.run_directories(run_id)
+        engine.tmp_dir.mkdir(parents=True)
+        engine.render_slots = None
+        engine.llm_cache = None
+        engine._summary_lock = threading.Lock()
+        engine._scene_models = {}
+        engine._scene_cache_keys = {}
+        engine.render_config = SimpleNamespace(use_cache=False, preflight=False,
+                                               get_manim_args=lambda: ["-ql"])
+
+        def render(script_path, class_name, manim_args, output_dir, cancel=None):
+            # Both jobs write scene 1 before either render finishes
+            both_rendering.wait(timeout=5)
+            video = output_dir / "Scene1.mp4"
+            video.write_text(script_path.read_text())
+            return video
+
+        engine._run_manim = render
+        return engine
+
+    def test_two_jobs_render_the_same_scene_in_parallel(self):
+        both_rendering = threading.Barrier(2)
+        codes = {
+            run_id: f"from manim import *\n\nclass Scene1(Scene):\n    def construct(self):\n        self.wait()  # {run_id}\n"
+            for run_id in ("job_a", "job_b")
+        }
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                run_id: executor.submit(self._engine(run_id, both_rendering)._save_and_render_manim,
+                                        code, "Scene1", 1)
+                for run_id, code in codes.items()
+            }
+            videos = {run_id: future.result(timeout=10) for run_id, future in futures.items()}
+
+        self.assertNotEqual(videos["job_a"], videos["job_b"])
+        for run_id, video in videos.items():
+            self.assertIn(run_id, video.parts)
+            self.assertIn(f"# {run_id}", video.read_text())
+
+    def test_run_directories_are_removed(self):
+        engine = self._engine("job_a", threading.Barrier(1))
+        engine.scene_renders_dir.mkdir(parents=True)
+        engine._remove_run_directories()
+        self.assertFalse(engine.tmp_dir.exists())
+        self.assertFalse(engine.scene_renders_dir.exists())
+
+
+class TestRenderSlot(unittest.TestCase):
+    """Test the engine's wait for a shared render slot"""
+
+    def _engine(self, slots):
+        engine = object.__new__(VideoGenerationEngine)
+        engine.render_slots = slots
+        return engine
+
+    def test_no_budget_does_not_block(self):
+        with self._engine(None)._render_slot():
+            pass
+
+    def test_cancel_while_waiting_for_slot(self):
+        slots = threading.BoundedSemaphore(1)
+        engine = self._engine(slots)
+        cancel = threading.Event()
+        with engine._render_slot(cancel):
+            cancel.set()
+            with self.assertRaises(concurrent.futures.CancelledError):
+                with engine._render_slot(cancel):
+                    pass
+        # The slot is released once the holder finishes
+        self.assertTrue(slots.acquire(blocking=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
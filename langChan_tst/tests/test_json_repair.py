@@ -0,0 +1,97 @@
+"""
+Tests for local repair of script JSON
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.json_repair import parse_script, sanitize_json
+
+SCRIPT = {
+    "title": "Sorting",
+    "scenes": [
+        {"seq": 1, "text": "Intro", "anim": "Show a list", "layout": "title_and_main_content"},
+        {"seq": 2, "text": "Swap", "anim": "Swap two bars", "layout": "split_screen"},
+        {"seq": 3, "text": "Done", "anim": "Sorted list", "layout": "custom"},
+    ]
+}
+VALID = json.dumps(SCRIPT, indent=2)
+
+
+class TestParseScript(unittest.TestCase):
+    """Test repairs of common LLM JSON mistakes"""
+
+    def test_valid_response_needs_no_repair(self):
+        parsed = parse_script("```json\n" + VALID + "\n```")
+        self.assertEqual(parsed.script.get_scene_count(), 3)
+        self.assertFalse(parsed.repaired)
+
+    def test_trailing_commas_and_fence(self):
+        text = VALID.replace('"custom"', '"custom",').replace("  ]\n}", "  ],\n}") + "\n```"
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.get_scene_count(), 3)
+        self.assertEqual(parsed.repairs, ["trailing_commas"])
+
+    def test_unescaped_quotes_in_narration(self):
+        text = VALID.replace('"Swap"', '"We call this a "swap", then move on"')
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.scenes[1].text, 'We call this a "swap", then move on')
+        self.assertIn("unescaped_quotes", parsed.repairs)
+
+    def test_raw_newlines_and_latex_backslashes(self):
+        text = VALID.replace('"Intro"', '"Line one\nand \\frac{a}{b} \\alpha"')
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.scenes[0].text, "Line one\nand \\frac{a}{b} \\alpha")
+        self.assertEqual(parsed.repairs, ["control_characters", "invalid_escapes"])
+
+    def test_latex_commands_that_look_like_escapes(self):
+        narration = r"\theta \times \tau \nabla \neq \nu \rho \underline{x} \underbrace{y} \beta"
+        text = VALID.replace('"Intro"', '"' + narration + '"')
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.scenes[0].text, narration)
+        self.assertEqual(parsed.repairs, ["invalid_escapes"])
+
+    def test_real_escapes_are_kept(self):
+        text = VALID.replace('"Intro"', r'"caf\u00e9\n\t42 \u2192 end"')
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.scenes[0].text, "caf\u00e9\n\t42 \u2192 end")
+        self.assertFalse(parsed.repaired)
+
+    def test_newline_before_a_word_survives_other_repairs(self):
+        text = VALID.replace('"Intro"', r'"Line one\nNext line \tTabbed \frac{1}{2}"')
+        text = text.replace('"custom"', '"custom",')
+        parsed = parse_script(text)
+        self.assertEqual(parsed.script.scenes[0].text, "Line one\nNext line \tTabbed \\frac{1}{2}")
+        self.assertEqual(parsed.repairs, ["invalid_escapes", "trailing_commas"])
+
+    def test_truncated_response_keeps_complete_scenes(self):
+        text = "```json\n" + VALID[:VALID.index('"Done"')]
+        parsed = parse_script(text)
+        self.assertEqual([scene.seq for scene in parsed.script.scenes], [1, 2])
+        self.assertEqual(parsed.script.title, "Sorting")
+        self.assertIn("truncated", parsed.repairs)
+
+    def test_invalid_scenes_are_dropped(self):
+        data = json.loads(VALID)
+        del data["scenes"][1]["anim"]
+        parsed = parse_script(json.dumps(data))
+        self.assertEqual([scene.seq for scene in parsed.script.scenes], [1, 3])
+        self.assertEqual(parsed.report(retries=1)["dropped_scenes"], 1)
+
+    def test_unrepairable_response_raises(self):
+        for text in ["", "Sorry, I can't help with that.", VALID[:VALID.index('"seq": 1')], '{"title": "x"}']:
+            with self.assertRaises(ValueError):
+                parse_script(text)
+
+    def test_sanitize_leaves_valid_json_alone(self):
+        self.assertEqual(sanitize_json(VALID), (VALID, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the Manim code generation model cascade
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models import LayoutType
+from src.utils.model_router import ModelRouter, ModelTier, update_model_stats
+
+FAST = ModelTier("fast-model", 512)
+STRONG = ModelTier("strong-model", 6000)
+
+
+class TestModelRouter(unittest.TestCase):
+    """Test tier selection and escalation"""
+
+    def _router(self, **kwargs) -> ModelRouter:
+        kwargs.setdefault("fast_layouts", ["title_and_main_content", "split_screen"])
+        return ModelRouter([FAST, STRONG], **kwargs)
+
+    def test_scenes_start_fast_and_escalate_on_failure(self):
+        router = self._router(escalate_after=2)
+        self.assertEqual(router.select(0, "title_and_main_content"), FAST)
+        self.assertEqual(router.select(1, "title_and_main_content"), FAST)
+        self.assertEqual(router.select(2, "title_and_main_content"), STRONG)
+        self.assertEqual(router.select(5, "title_and_main_content"), STRONG)
+        self.assertTrue(router.is_escalation(FAST.model, STRONG))
+        self.assertFalse(router.is_escalation(STRONG.model, STRONG))
+        self.assertFalse(router.is_escalation(None, STRONG))
+
+    def test_complex_layouts_start_on_the_strong_model(self):
+        router = self._router()
+        self.assertEqual(router.select(0, LayoutType.CUSTOM), STRONG)
+        self.assertEqual(router.select(0, LayoutType.SPLIT_SCREEN), FAST)
+
+    def test_underperforming_fast_model_is_skipped(self):
+        router = self._router(min_success_rate=0.5, min_samples=4)
+        for success in (False, False, True):
+            router.record_outcome(FAST.model, success)
+        self.assertEqual(router.select(0, "split_screen"), FAST)  # Too few samples yet
+
+        router.record_outcome(FAST.model, False)
+        self.assertEqual(router.select(0, "split_screen"), STRONG)
+
+    def test_disabled_cascade_uses_one_model(self):
+        router = ModelRouter.from_settings("strong-model", 6000, cascade=False)
+        self.assertEqual(router.tiers, [STRONG])
+        self.assertEqual(router.select(3, "title_and_main_content"), STRONG)
+
+    def test_stats_track_success_rate_and_latency(self):
+        stats = {}
+        update_model_stats(stats, "m", latency=1.0)
+        update_model_stats(stats, "m", latency=3.0)
+        update_model_stats(stats, "m", success=True)
+        update_model_stats(stats, "m", success=False)
+        update_model_stats(stats, "m", success=True)
+
+        self.assertEqual(stats["m"]["requests"], 2)
+        self.assertEqual(stats["m"]["avg_latency"], 2.0)
+        self.assertEqual(stats["m"]["success_rate"], 0.667)
+
+    def test_thinking_budget_is_passed_only_when_set(self):
+        self.assertEqual(FAST.generation_config(0.1, 100)["thinking_budget"], 512)
+        self.assertNotIn("thinking_budget", ModelTier("m").generation_config(0.1, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for the parallel processing utilities
+"""
+
+import concurrent.futures
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.parallel import ManimParallelProcessor, StagedPipeline, first_success
+
+
+class TestStagedPipeline(unittest.TestCase):
+    """Test the per-item stage pipeline"""
+
+    def test_items_do_not_wait_for_slow_siblings(self):
+        """A fast item finishes while a slow item is still in its first stage"""
+        finished = []
+
+        def first(item):
+            time.sleep(0.3 if item == "slow" else 0.01)
+            return item
+
+        def second(item):
+            finished.append(item)
+            return f"{item}-done"
+
+        def driver(pipeline, item):
+            value = pipeline.submit("first", first, item).result()
+            return pipeline.submit("second", second, value).result()
+
+        with StagedPipeline({"first": 2, "second": 1}) as pipeline:
+            slow = pipeline.drive(driver, pipeline, "slow")
+            fast = pipeline.drive(driver, pipeline, "fast")
+            self.assertEqual(fast.result(timeout=5), "fast-done")
+            self.assertFalse(slow.done())
+            self.assertEqual(slow.result(timeout=5), "slow-done")
+
+        self.assertEqual(finished, ["fast", "slow"])
+
+    def test_stage_concurrency_is_bounded(self):
+        """No more than the configured number of workers run a stage at once"""
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def work():
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+
+        with StagedPipeline({"render": 2}) as pipeline:
+            futures = [pipeline.submit("render", work) for _ in range(6)]
+            for future in futures:
+                future.result(timeout=5)
+            stats = pipeline.get_stats()
+
+        self.assertEqual(active["peak"], 2)
+        self.assertEqual(stats["render"]["tasks"], 6)
+        self.assertEqual(stats["render"]["failed"], 0)
+
+    def test_failures_are_counted_and_propagated(self):
+        """Stage exceptions reach the caller and show up in the stats"""
+        def boom():
+            raise RuntimeError("render failed")
+
+        with StagedPipeline({"render": 1}) as pipeline:
+            future = pipeline.submit("render", boom)
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+            self.assertEqual(pipeline.get_stats()["render"]["failed"], 1)
+
+    def test_unknown_stage_is_rejected(self):
+        with StagedPipeline({"tts": 1}) as pipeline:
+            with self.assertRaises(ValueError):
+                pipeline.submit("mux", lambda: None)
+
+
+class TestFirstSuccess(unittest.TestCase):
+    """Test racing tasks for the first success"""
+
+    def test_first_success_wins_and_cancels_the_rest(self):
+        cancelled = threading.Event()
+
+        def slow(cancel):
+            cancel.wait(5)
+            cancelled.set()
+            return "slow"
+
+        def failing(cancel):
+            raise ValueError("broken")
+
+        def fast(cancel):
+            time.sleep(0.05)
+            return "fast"
+
+        started = time.time()
+        winner, finished = first_success([("slow", slow), ("failing", failing), ("fast", fast)])
+        self.assertEqual((winner.task_id, winner.result), ("fast", "fast"))
+        self.assertLess(time.time() - started, 2)
+        self.assertEqual([result.task_id for result in finished], ["failing", "fast"])
+        self.assertIsInstance(finished[0].result, ValueError)
+        self.assertTrue(cancelled.wait(2))
+
+    def test_all_failures_return_no_winner(self):
+        def failing(cancel):
+            raise RuntimeError("nope")
+
+        winner, finished = first_success([("a", failing), ("b", failing)])
+        self.assertIsNone(winner)
+        self.assertEqual(sorted(result.error for result in finished), ["nope", "nope"])
+
+
+class TestManimParallelProcessor(unittest.TestCase):
+    """Test batch renders from concurrent jobs"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.lock = threading.Lock()
+        self.active = {"now": 0, "peak": 0}
+
+    def _fake_manim(self, cmd, **kwargs):
+        with self.lock:
+            self.active["now"] += 1
+            self.active["peak"] = max(self.active["peak"], self.active["now"])
+        time.sleep(0.05)
+        media_dir = Path(cmd[cmd.index("--media_dir") + 1])
+        (media_dir / "Scene1.mp4").write_text(Path(cmd[1]).read_text())
+        with self.lock:
+            self.active["now"] -= 1
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    def _tasks(self, job_id):
+        return [{
+            "task_id": f"render_scene_{seq}",
+            "scene": SimpleNamespace(seq=seq),
+            "scene_code": f"class Scene1:\n    job = '{job_id}'\n",
+            "class_name": "Scene1",
+            "quality": "low",
+            "use_cache": False,
+            "script_dir": self._directory(job_id, "tmp"),
+            "output_dir": self._directory(job_id, f"scene_{seq}")
+        } for seq in (1, 2)]
+
+    def _directory(self, job_id, name):
+        directory = self.tmp / job_id / name
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def test_concurrent_jobs_share_the_render_budget(self):
+        slots = threading.BoundedSemaphore(1)
+        with patch("subprocess.run", self._fake_manim):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                batches = {
+                    job_id: executor.submit(ManimParallelProcessor(max_workers=2, render_slots=slots)
+                                            .render_scenes_batch, self._tasks(job_id))
+                    for job_id in ("job_a", "job_b")
+                }
+                results = {job_id: batch.result(timeout=10) for job_id, batch in batches.items()}
+
+        self.assertEqual(self.active["peak"], 1)
+        for job_id, videos in results.items():
+            self.assertEqual(len(videos), 2)
+            for video in videos.values():
+                self.assertIn(f"job = '{job_id}'", video.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
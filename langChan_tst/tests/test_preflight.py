@@ -0,0 +1,108 @@
+"""
+Tests for the dry-run scene preflight
+"""
+
+import importlib.util
+import subprocess
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import preflight
+
+MANIM_AVAILABLE = importlib.util.find_spec("manim") is not None
+
+SCENE_CODE = """
+from manim import *
+
+class PreflightScene(Scene):
+    def construct(self):
+        self.play(Create(Circle()))
+        self.add(Square().shift(RIGHT * 10))
+"""
+
+BROKEN_SCENE_CODE = """
+from manim import *
+
+class PreflightScene(Scene):
+    def construct(self):
+        self.play(Create(Circle(radius=1, fill=BLUE)))
+"""
+
+
+def _completed(returncode: int, stdout: str = "", stderr: str = "") -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess([], returncode, stdout=stdout, stderr=stderr)
+
+
+class TestPreflightResult(unittest.TestCase):
+    """Test how subprocess outcomes are interpreted"""
+
+    def _run(self, completed) -> preflight.PreflightResult:
+        with mock.patch.object(preflight.subprocess, "run", return_value=completed):
+            return preflight.preflight_scene(Path("scene.py"), "Scene1")
+
+    def test_scene_error_carries_traceback(self):
+        result = self._run(_completed(1, stderr="Traceback ...\nTypeError: unexpected keyword 'fill'\n"))
+        self.assertFalse(result.ok)
+        self.assertFalse(result.inconclusive)
+        self.assertIn("unexpected keyword 'fill'", result.error)
+
+    def test_missing_manim_is_inconclusive(self):
+        result = self._run(_completed(preflight.EXIT_ENVIRONMENT_ERROR, stderr="No module named 'manim'"))
+        self.assertTrue(result.inconclusive)
+
+    def test_timeout_is_inconclusive(self):
+        with mock.patch.object(preflight.subprocess, "run", side_effect=subprocess.TimeoutExpired("manim", 1)):
+            self.assertTrue(preflight.preflight_scene(Path("scene.py"), "Scene1", timeout=1).inconclusive)
+
+    def test_result_line_is_parsed(self):
+        stdout = ("scene output\n" + preflight.RESULT_MARKER +
+                  '{"mobjects": [{"type": "Square", "center": [10, 0], "width": 2, "height": 2, "offscreen": true}]}\n')
+        result = self._run(_completed(0, stdout=stdout))
+        self.assertTrue(result.ok)
+        self.assertEqual([mobject["type"] for mobject in result.offscreen], ["Square"])
+
+    def test_offscreen_boxes(self):
+        def mobject(x, width):
+            return SimpleNamespace(get_center=lambda: [x, 0.0, 0.0], width=width, height=1.0)
+
+        scene = SimpleNamespace(mobjects=[mobject(0.0, 2.0), mobject(7.0, 2.0)])
+        boxes = preflight._describe_mobjects(scene, frame_width=14.2, frame_height=8.0)
+        self.assertEqual([box["offscreen"] for box in boxes], [False, True])
+
+
+@unittest.skipUnless(MANIM_AVAILABLE, "manim is not installed")
+class TestScenePreflight(unittest.TestCase):
+    """Dry-run real scenes"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.script = Path(self.tmp.name) / "scene_preflight.py"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_valid_scene_reports_bounding_boxes(self):
+        self.script.write_text(SCENE_CODE)
+        result = preflight.preflight_scene(self.script, "PreflightScene")
+        self.assertTrue(result.ok, result.error)
+        self.assertEqual([mobject["type"] for mobject in result.offscreen], ["Square"])
+        self.assertEqual(list(Path(self.tmp.name).rglob("*.mp4")), [])
+
+    def test_runtime_error_is_reported(self):
+        self.script.write_text(BROKEN_SCENE_CODE)
+        result = preflight.preflight_scene(self.script, "PreflightScene")
+        self.assertFalse(result.ok)
+        self.assertFalse(result.inconclusive)
+        self.assertIn("scene_preflight.py", result.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for media probing
+"""
+
+import os
+import tempfile
+import unittest
+import wave
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import probe
+from src.utils.video import get_audio_duration
+
+
+class TestProbe(unittest.TestCase):
+    """Test WAV header probing and the probe cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        probe.clear_probe_cache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_wav(self, name: str, seconds: float, rate: int = 24000) -> Path:
+        path = self.root / name
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(b"\x00\x00" * int(seconds * rate))
+        return path
+
+    def test_wav_duration_is_read_without_ffprobe(self):
+        audio_file = self._write_wav("narration.wav", 1.5)
+        with mock.patch.object(probe, "run_ffprobe", side_effect=AssertionError("ffprobe called")):
+            info = probe.probe_media(audio_file)
+
+        self.assertAlmostEqual(info["duration"], 1.5)
+        self.assertEqual((info["sample_rate"], info["channel_layout"]), ("24000", "mono"))
+
+    def test_results_are_memoized_until_the_file_changes(self):
+        audio_file = self._write_wav("narration.wav", 1.0)
+        before = probe.get_probe_stats()
+
+        probe.probe_media(audio_file)
+        probe.probe_media(audio_file)
+        self.assertEqual(probe.get_probe_stats()["hits"] - before["hits"], 1)
+
+        self._write_wav("narration.wav", 2.0)
+        os.utime(audio_file, ns=(0, 10 ** 9))
+        self.assertAlmostEqual(probe.probe_media(audio_file)["duration"], 2.0)
+
+    def test_batch_returns_every_path(self):
+        first, second = self._write_wav("a.wav", 1.0), self._write_wav("b.wav", 0.5)
+        results = probe.probe_media_batch([first, second, first, self.root / "missing.wav"])
+
+        self.assertEqual(set(results), {first, second, self.root / "missing.wav"})
+        self.assertIsNone(results[self.root / "missing.wav"])
+        self.assertAlmostEqual(results[second]["duration"], 0.5)
+
+    def test_unreadable_audio_has_no_duration(self):
+        """A failed probe is reported instead of silently becoming 5 seconds"""
+        broken = self.root / "broken.wav"
+        broken.write_bytes(b"not audio")
+        with mock.patch.object(probe, "run_ffprobe", return_value=None):
+            self.assertIsNone(get_audio_duration(broken))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for generating a video from an existing script
+"""
+
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.engine import STAGE_PROGRESS, VideoGenerationEngine
+from src.core.models import ProcessingSummary, Scene, VideoScript
+
+
+def _engine(pipeline_mode=False, stream_script=True):
+    """Engine with every stage after the script replaced by fakes"""
+    engine = object.__new__(VideoGenerationEngine)
+    engine.pipeline_mode = pipeline_mode
+    engine.stream_script = stream_script
+    engine.progress_callback = None
+    engine.run_id = None
+    engine._summary_lock = threading.Lock()
+    engine.llm_provider = MagicMock()
+    engine.process_logger = MagicMock()
+    engine.stats_logger = MagicMock()
+    engine.processed = []
+    engine._setup_archive = lambda topic: Path("/tmp/archive")
+    engine._save_script = lambda script, archive_dir: None
+    engine._get_tts_cache_stats = lambda: {}
+    engine._record_tts_cache_stats = lambda before, summary: None
+    engine._process_scenes = lambda script, archive_dir, summary: engine.processed.extend(script.scenes) or []
+    engine._create_final_video = lambda videos, topic, archive_dir, summary: Path("/tmp/final.mp4")
+    engine._archive_results = lambda archive_dir, final_video, summary: None
+    engine._cleanup_temporary_files = lambda: None
+    return engine
+
+
+class TestProvidedScript(unittest.TestCase):
+    """Test that a provided script skips the script LLM"""
+
+    def setUp(self):
+        self.script = VideoScript(title="Edited title", scenes=[
+            Scene(seq=1, text="First, as edited", anim="Show a circle"),
+            Scene(seq=2, text="Second", anim="Show a square"),
+        ])
+
+    def test_script_is_used_as_is(self):
+        for pipeline_mode in (False, True):
+            engine = _engine(pipeline_mode=pipeline_mode)
+            success, summary = engine.generate_video_from_script(self.script)
+            self.assertTrue(success)
+            self.assertEqual(engine.processed, self.script.scenes)
+            self.assertEqual(summary.topic, "Edited title")
+            self.assertEqual(summary.total_scenes, 2)
+            self.assertEqual(summary.script_llm, {"success": True, "provided": True})
+            engine.llm_provider.generate_script.assert_not_called()
+            engine.llm_provider.stream_script.assert_not_called()
+            self.assertEqual(engine._final_scene_seq, 2)
+
+    def test_topic_overrides_title(self):
+        engine = _engine()
+        _, summary = engine.generate_video_from_script(self.script, "Custom topic")
+        self.assertEqual(summary.topic, "Custom topic")
+
+    def test_topic_still_generates_script(self):
+        engine = _engine()
+        engine.llm_provider.generate_script.return_value = self.script
+        engine.llm_provider.script_report = {}
+        success, _ = engine.generate_video("circles")
+        self.assertTrue(success)
+        engine.llm_provider.generate_script.assert_called_once_with("circles")
+
+
+    def test_reused_engine_forgets_the_last_scene_while_streaming(self):
+        engine = _engine(pipeline_mode=True)
+        engine._final_scene_seq = 7
+        seen = []
+        engine._process_scenes_pipelined = lambda scenes, archive_dir, summary: seen.append(engine._final_scene_seq) or []
+        success, _ = engine.generate_video("circles")
+        self.assertTrue(success)
+        # Scene 7 of the previous run must not get the final padding
+        self.assertEqual(seen, [None])
+
+
+class TestProgressEvents(unittest.TestCase):
+    """Test stage and scene progress reported to progress_callback"""
+
+    def test_stages_are_reported_in_order(self):
+        engine = _engine()
+        events = []
+        engine.progress_callback = events.append
+        script = VideoScript(title="T", scenes=[Scene(seq=1, text="a", anim="b")])
+        engine.generate_video_from_script(script)
+
+        self.assertEqual([e["stage"] for e in events], [
+            "Using provided script", "Setting up archive", "Processing scenes",
+            "Creating final video", "Archiving results", "Cleanup"
+        ])
+        progress = [e["progress"] for e in events]
+        self.assertEqual(progress, sorted(progress))
+
+    def test_scene_progress_and_eta(self):
+        engine = _engine()
+        events = []
+        engine.progress_callback = events.append
+        engine._scenes_done = 0
+        engine._scenes_started = time.time() - 10
+        summary = ProcessingSummary(topic="T", total_scenes=4)
+
+        engine._scene_done(summary, 1, True)
+        engine._scene_done(summary, 2, False)
+        self.assertEqual((summary.render_stats.success, summary.render_stats.failed), (1, 1))
+
+        last = events[-1]
+        self.assertEqual((last["scene"], last["scene_success"]), (2, False))
+        self.assertEqual((last["scenes_done"], last["total_scenes"]), (2, 4))
+        self.assertAlmostEqual(last["eta_seconds"], 10, delta=1)
+        start, end = STAGE_PROGRESS["Processing scenes"], STAGE_PROGRESS["Creating final video"]
+        self.assertEqual(last["progress"], round(start + (end - start) / 2, 1))
+
+    def test_parallel_renders_report_each_scene_as_it_finishes(self):
+        engine = _engine()
+        events = []
+        engine.progress_callback = events.append
+        engine._scenes_done = 0
+        engine._scenes_started = time.time()
+        engine.max_render_workers = 2
+        engine.tmp_dir, engine.scene_renders_dir = Path("/tmp/run"), Path("/tmp/run/video")
+        engine.render_config = SimpleNamespace(quality="low", use_cache=False)
+        seen_during_batch = []
+
+        def render_scenes_batch(render_tasks, on_scene_done=None, render_scene=None):
+            second, first = render_tasks[1], render_tasks[0]
+            on_scene_done(second, Path("/tmp/scene_2.mp4"))
+            seen_during_batch.append([e["scene"] for e in events])
+            on_scene_done(first, None)
+            return {second["task_id"]: Path("/tmp/scene_2.mp4")}
+
+        engine.manim_parallel = SimpleNamespace(render_scenes_batch=render_scenes_batch)
+        scenes = [Scene(seq=1, text="a", anim="b"), Scene(seq=2, text="c", anim="d")]
+        codes = {f"scene_{scene.seq}": ("code", f"Scene{scene.seq}") for scene in scenes}
+        summary = ProcessingSummary(topic="T", total_scenes=2)
+
+        videos = engine._render_scenes_parallel(scenes, codes, {}, Path("/tmp/archive"), summary)
+
+        self.assertEqual(videos, [Path("/tmp/scene_2.mp4")])
+        # Scene 2 was reported while scene 1 was still rendering
+        self.assertEqual(seen_during_batch, [[2]])
+        self.assertEqual([(e["scene"], e["scene_success"]) for e in events], [(2, True), (1, False)])
+        self.assertEqual((summary.render_stats.success, summary.render_stats.failed), (1, 1))
+
+    def test_callback_errors_do_not_stop_generation(self):
+        engine = _engine()
+
+        def broken(event):
+            raise RuntimeError("client went away")
+
+        engine.progress_callback = broken
+        success, _ = engine.generate_video_from_script(
+            VideoScript(title="T", scenes=[Scene(seq=1, text="a", anim="b")])
+        )
+        self.assertTrue(success)
+
+
+if __name__ == "__main__":
+    unittest.main()
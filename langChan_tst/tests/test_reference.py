@@ -0,0 +1,68 @@
+"""
+Tests for Manim reference retrieval
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.reference import ReferenceIndex, split_sections, tokenize
+
+REFERENCE = """# Guide
+
+## Graphing
+Use `Axes` and `axes.plot` to draw a sine curve.
+
+```python
+# Not a heading
+ax = Axes()
+```
+
+## 3D Scenes
+`ThreeDScene` with `set_camera_orientation` rotates the camera.
+
+### Surfaces
+`Surface` draws parametric surfaces.
+
+## Text
+`Text` and `MathTex` render formulas.
+"""
+
+
+class TestReferenceIndex(unittest.TestCase):
+    """Test section splitting and BM25 selection"""
+
+    def setUp(self):
+        self.index = ReferenceIndex(split_sections(REFERENCE))
+
+    def test_sections_follow_headings_outside_code(self):
+        titles = [section.title for section in self.index.sections]
+        self.assertEqual(titles, [
+            "Guide", "Guide > Graphing", "Guide > 3D Scenes", "Guide > 3D Scenes > Surfaces", "Guide > Text"
+        ])
+        self.assertIn("# Not a heading", self.index.sections[1].text)
+
+    def test_identifiers_are_split(self):
+        self.assertTrue({"threedscene", "three", "scene"} <= set(tokenize("ThreeDScene")))
+        self.assertTrue({"set_camera_orientation", "camera", "orientation"} <= set(tokenize("set_camera_orientation")))
+
+    def test_relevant_sections_are_selected_in_document_order(self):
+        selected = self.index.select("rotate the camera around a parametric surface", token_budget=1000)
+        self.assertEqual([section.title for section in selected],
+                         ["Guide > 3D Scenes", "Guide > 3D Scenes > Surfaces"])
+
+    def test_budget_limits_selection(self):
+        best = self.index.select("plot a sine curve on axes", token_budget=1000)[0]
+        selected = self.index.select("plot a sine curve on axes camera formulas", token_budget=best.tokens)
+        self.assertLessEqual(sum(section.tokens for section in selected), best.tokens)
+
+    def test_zero_budget_selects_everything(self):
+        self.assertEqual(len(self.index.select("anything", token_budget=0)), len(self.index.sections))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for the shared client registry
+"""
+
+import importlib.util
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.providers import registry
+
+try:
+    GENAI_AVAILABLE = importlib.util.find_spec("google.genai") is not None
+except ModuleNotFoundError:
+    GENAI_AVAILABLE = False
+
+
+class TestRegistry(unittest.TestCase):
+    """Test that clients and sessions are created once and shared"""
+
+    def setUp(self):
+        registry.close_shared_clients()
+
+    def tearDown(self):
+        registry.close_shared_clients()
+
+    def test_http_sessions_are_shared_by_name(self):
+        session = registry.get_http_session("dia")
+        self.assertIs(registry.get_http_session("dia"), session)
+        self.assertIsNot(registry.get_http_session("other"), session)
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_maxsize, registry.HTTP_POOL_MAXSIZE)
+
+    def test_factory_runs_once_per_key(self):
+        calls = []
+        before = registry.get_registry_stats()
+        for _ in range(3):
+            registry._shared(("test", "key"), lambda: calls.append(1) or object())
+        stats = registry.get_registry_stats()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(stats["created"] - before["created"], 1)
+        self.assertEqual(stats["reused"] - before["reused"], 2)
+        self.assertEqual(stats["clients"], 1)
+
+    def test_close_forgets_clients(self):
+        session = registry.get_http_session("dia")
+        registry.close_shared_clients()
+        self.assertEqual(registry.get_registry_stats()["clients"], 0)
+        self.assertIsNot(registry.get_http_session("dia"), session)
+
+    @unittest.skipUnless(GENAI_AVAILABLE, "google-genai is not installed")
+    def test_genai_clients_are_keyed_by_timeout(self):
+        client = registry.get_genai_client("test-key")
+        self.assertIs(registry.get_genai_client("test-key"), client)
+        self.assertIsNot(registry.get_genai_client("test-key", timeout=30), client)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the warm Manim render pool
+"""
+
+import importlib.util
+import tempfile
+import threading
+import unittest
+import sys
+from collections import deque
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.render_pool import ManimRenderPool, RenderError, manim_args_to_config
+
+MANIM_AVAILABLE = importlib.util.find_spec("manim") is not None
+
+SCENE_CODE = """
+from manim import *
+
+class PoolScene(Scene):
+    def construct(self):
+        self.play(Create(Circle()), run_time=0.2)
+"""
+
+BROKEN_SCENE_CODE = """
+from manim import *
+
+class PoolScene(Scene):
+    def construct(self):
+        self.play(Create(Circle().get_centre()))
+"""
+
+
+class TestManimArgs(unittest.TestCase):
+    """Test translation of CLI render arguments"""
+
+    def test_quality_and_format(self):
+        self.assertEqual(manim_args_to_config(["-qh"]), {"quality": "high_quality"})
+        self.assertEqual(
+            manim_args_to_config(["-ql", "--format", "gif"]),
+            {"quality": "low_quality", "format": "gif"}
+        )
+
+    def test_unknown_argument_is_rejected(self):
+        with self.assertRaises(ValueError):
+            manim_args_to_config(["--renderer", "opengl"])
+
+
+class _SlowWorker:
+    """Worker handle whose stop() blocks until released"""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+        self.stopping = threading.Event()
+        self.future = None
+        self.ready = True
+
+    def stop(self, kill: bool = False):
+        self.stopping.set()
+        self.release.wait(5)
+
+
+class TestWorkerReplacement(unittest.TestCase):
+    """Test that replacing a worker does not hold the pool lock"""
+
+    def _pool(self, release: threading.Event) -> ManimRenderPool:
+        pool = object.__new__(ManimRenderPool)
+        pool._lock = threading.Lock()
+        pool._pending = deque()
+        pool._workers = [_SlowWorker(release)]
+        pool._retired = []
+        pool._starting = 0
+        pool._closed = False
+        pool._startup_failures = 0
+        pool.stats = {"tasks": 0, "failed": 0, "timeouts": 0, "crashes": 0, "recycled": 0, "cancelled": 0}
+        pool._start_worker = lambda: _SlowWorker(release)
+        return pool
+
+    def test_submit_is_not_blocked_while_a_worker_stops(self):
+        release = threading.Event()
+        pool = self._pool(release)
+        worker = pool._workers[0]
+        with pool._lock:
+            pool._replace_worker(worker, crashed=False)
+        restart = threading.Thread(target=pool._restart_workers)
+        restart.start()
+        self.assertTrue(worker.stopping.wait(5))
+
+        # The replacement is owed, so a render queues instead of failing
+        future = pool.submit(Path("scene.py"), "PoolScene", ["-ql"], Path("media"))
+        self.assertFalse(future.done())
+        self.assertEqual((pool.get_stats()["workers"], pool.get_stats()["pending"]), (0, 1))
+
+        release.set()
+        restart.join(5)
+        self.assertEqual(pool.get_stats()["workers"], 1)
+        self.assertIsNot(pool._workers[0], worker)
+
+
+@unittest.skipUnless(MANIM_AVAILABLE, "manim is not installed")
+class TestManimRenderPool(unittest.TestCase):
+    """Render real scenes through the pool"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ManimRenderPool(max_workers=1, max_tasks_per_worker=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_scene(self, code: str) -> Path:
+        script_path = self.root / "scene_PoolScene.py"
+        script_path.write_text(code, encoding="utf-8")
+        return script_path
+
+    def test_renders_and_recycles_worker(self):
+        """Renders succeed across a worker retirement"""
+        for _ in range(3):
+            video = self.pool.render(self._write_scene(SCENE_CODE), "PoolScene", ["-ql"], self.root / "media")
+            self.assertTrue(video.exists())
+        self.assertGreaterEqual(self.pool.get_stats()["recycled"], 1)
+
+    def test_scene_errors_carry_traceback(self):
+        with self.assertRaises(RenderError) as ctx:
+            self.pool.render(self._write_scene(BROKEN_SCENE_CODE), "PoolScene", ["-ql"], self.root / "media")
+        self.assertIn("get_centre", ctx.exception.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
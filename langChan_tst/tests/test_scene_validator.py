@@ -0,0 +1,117 @@
+"""
+Tests for static scene validation
+"""
+
+import json
+import types
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.scene_validator import ApiIndex, build_api_index, validate_scene_source
+
+
+class Mobject:
+    def __init__(self, color=None):
+        self.color = color
+
+
+class Circle(Mobject):
+    def __init__(self, radius=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.radius = radius
+
+
+class Create:
+    def __init__(self, mobject, run_time=1.0):
+        self.mobject = mobject
+
+
+class Scene:
+    def play(self, *animations, run_time=None):
+        pass
+
+    def wait(self, duration=1.0):
+        pass
+
+
+class TitleScene(Scene):
+    def __init__(self):
+        self.title_region = None
+
+
+def _fake_manim() -> types.ModuleType:
+    module = types.ModuleType("fake_manim")
+    for obj in (Mobject, Circle, Create, Scene, TitleScene):
+        setattr(module, obj.__name__, obj)
+    module.BLUE = "#0000FF"
+    return module
+
+
+class TestSceneValidator(unittest.TestCase):
+    """Test the API index and the checks run on generated code"""
+
+    @classmethod
+    def setUpClass(cls):
+        sys.modules["fake_manim"] = _fake_manim()
+        cls.index = build_api_index(["fake_manim"])
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop("fake_manim", None)
+
+    def _kinds(self, body: str, header: str = "from fake_manim import *\n") -> list:
+        code = header + "\nclass Scene1(TitleScene):\n    def construct(self):\n" + body
+        return [issue.kind for issue in validate_scene_source(code, self.index)]
+
+    def test_index_records_signatures(self):
+        circle = self.index.get("Circle")
+        self.assertEqual(circle["params"], ["radius", "color"])
+        self.assertFalse(circle["accepts_kwargs"])
+        self.assertIn("title_region", self.index.get("TitleScene")["attributes"])
+        self.assertEqual(self.index.get("BLUE")["kind"], "constant")
+
+    def test_index_round_trips_through_json(self):
+        restored = ApiIndex.from_dict(json.loads(json.dumps(self.index.to_dict())))
+        self.assertEqual(restored.symbols, self.index.symbols)
+        self.assertEqual(restored.modules, self.index.modules)
+
+    def test_valid_scene_passes(self):
+        body = (
+            "        circle = Circle(radius=2, color=BLUE)\n"
+            "        self.play(Create(circle), run_time=2)\n"
+            "        self.wait(self.title_region)\n"
+        )
+        self.assertEqual(self._kinds(body), [])
+
+    def test_unknown_name(self):
+        self.assertEqual(self._kinds("        self.play(Create(Squircle()))\n"), ["unknown_name"])
+
+    def test_unknown_keyword_argument(self):
+        self.assertEqual(self._kinds("        Circle(radius=1, fill=BLUE)\n"), ["unknown_argument"])
+        self.assertEqual(self._kinds("        self.wait(seconds=2)\n"), ["unknown_argument"])
+
+    def test_missing_call_parentheses(self):
+        self.assertEqual(self._kinds("        self.play(Create)\n"), ["missing_call"])
+        self.assertEqual(self._kinds("        self.wait\n"), ["missing_call"])
+
+    def test_calling_a_constant(self):
+        self.assertEqual(self._kinds("        BLUE()\n"), ["not_callable"])
+
+    def test_unknown_scene_attribute(self):
+        self.assertEqual(self._kinds("        self.play(Create(self.main_region))\n"), ["unknown_attribute"])
+
+    def test_unindexed_star_import_disables_name_checks(self):
+        body = "        self.play(Create(Squircle()))\n"
+        self.assertEqual(self._kinds(body, "from fake_manim import *\nfrom other import *\n"), [])
+
+    def test_syntax_error(self):
+        self.assertEqual(self._kinds("        self.play(\n"), ["syntax"])
+
+
+if __name__ == "__main__":
+    unittest.main()
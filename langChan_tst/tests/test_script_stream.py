@@ -0,0 +1,138 @@
+"""
+Tests for streamed script generation
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.models import Scene, VideoScript
+from src.providers.llm import ScriptStream, stream_text
+from src.utils.json_stream import JSONArrayStreamParser
+
+SCRIPT = {
+    "title": "Braces { in } titles",
+    "scenes": [
+        {"seq": 1, "text": "Say \"hi\" {not a brace}", "anim": "Show [x]", "layout": "title_and_main_content"},
+        {"seq": 2, "text": "Second", "anim": "Nested {\"a\": [1, 2]}", "layout": "split_screen"},
+    ],
+    "notes": [{"ignored": True}]
+}
+RESPONSE = "```json\n" + json.dumps(SCRIPT, indent=2) + "\n```"
+
+
+def _chunks(text: str, size: int):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+class StreamingModels:
+    """Stand-in for client.models that streams a fixed response"""
+
+    def __init__(self, text: str, size: int = 7):
+        self.text = text
+        self.size = size
+        self.calls = 0
+
+    def generate_content_stream(self, model, contents, config):
+        self.calls += 1
+        for chunk in _chunks(self.text, self.size):
+            yield SimpleNamespace(text=chunk)
+
+
+class MemoryCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, text, model=""):
+        self.entries[key] = text
+
+
+class TestJSONArrayStreamParser(unittest.TestCase):
+    """Test incremental extraction of array items"""
+
+    def test_items_are_emitted_as_they_close(self):
+        parser = JSONArrayStreamParser("scenes")
+        emitted = []
+        for position, chunk in enumerate(_chunks(RESPONSE, 3)):
+            emitted.extend((position, item["seq"]) for item in parser.feed(chunk))
+
+        self.assertEqual([seq for _, seq in emitted], [1, 2])
+        self.assertEqual(parser.document(), SCRIPT)
+        # Each scene arrives as soon as it closes, before the response ends
+        self.assertLess(emitted[0][0], emitted[1][0])
+        self.assertLess(emitted[1][0], len(_chunks(RESPONSE, 3)) - 1)
+
+    def test_strings_and_nested_values_are_preserved(self):
+        parser = JSONArrayStreamParser("scenes")
+        items = [item for chunk in _chunks(RESPONSE, 1) for item in parser.feed(chunk)]
+        self.assertEqual(items, SCRIPT["scenes"])
+
+
+class TestScriptStream(unittest.TestCase):
+    """Test scene streaming from the provider"""
+
+    def test_scenes_stream_before_the_response_completes(self):
+        consumed = []
+
+        def chunks():
+            for chunk in _chunks(RESPONSE, 5):
+                consumed.append(chunk)
+                yield chunk
+
+        stream = ScriptStream(chunks())
+        first = next(iter(stream))
+        self.assertEqual(first.seq, 1)
+        self.assertLess(sum(map(len, consumed)), len(RESPONSE))
+
+    def test_complete_script_is_available_after_iteration(self):
+        stream = ScriptStream(_chunks(RESPONSE, 11))
+        self.assertEqual([scene.seq for scene in stream], [1, 2])
+        self.assertEqual(stream.script.title, SCRIPT["title"])
+
+    def test_truncated_response_keeps_complete_scenes(self):
+        cut = RESPONSE.index('"seq": 2')
+        stream = ScriptStream([RESPONSE[:cut]])
+        self.assertEqual([scene.seq for scene in stream], [1])
+        self.assertIn("truncated", stream.report["repairs"])
+
+    def test_unusable_response_retries_or_raises(self):
+        cut = RESPONSE.index('"seq": 1')
+        with self.assertRaises(ValueError):
+            list(ScriptStream([RESPONSE[:cut]]))
+
+        retried = VideoScript(title="Retried", scenes=[Scene(seq=1, text="t", anim="a")])
+        stream = ScriptStream([RESPONSE[:cut]], retry=lambda: (retried, {"retries": 1}))
+        self.assertEqual([scene.seq for scene in stream], [1])
+        self.assertEqual(stream.script.title, "Retried")
+        self.assertEqual(stream.report, {"retries": 1})
+
+    def test_malformed_scene_is_recovered_after_repair(self):
+        broken = RESPONSE.replace('"layout": "split_screen"', '"layout": "split_screen",')
+        stream = ScriptStream(_chunks(broken, 9))
+        self.assertEqual([scene.seq for scene in stream], [1, 2])
+        self.assertIn("trailing_commas", stream.report["repairs"])
+
+    def test_streamed_text_is_cached(self):
+        models = StreamingModels(RESPONSE)
+        client = SimpleNamespace(models=models)
+        cache = MemoryCache()
+
+        first = "".join(stream_text(client, "model", "prompt", response_cache=cache))
+        second = list(stream_text(client, "model", "prompt", response_cache=cache))
+
+        self.assertEqual(first, RESPONSE)
+        self.assertEqual(second, [RESPONSE])
+        self.assertEqual(models.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
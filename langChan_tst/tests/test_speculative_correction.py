@@ -0,0 +1,264 @@
+"""
+Tests for racing speculative corrections of a failed scene
+"""
+
+import concurrent.futures
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core import engine as engine_module
+from src.core.engine import VideoGenerationEngine
+from src.core.models import ProcessingSummary, Scene
+from src.utils.model_router import ModelRouter, ModelTier
+from src.utils.parallel import ManimParallelProcessor
+from src.utils.preflight import PreflightResult
+from src.utils.render_pool import RenderError
+from src.utils.scene_validator import ValidationIssue
+
+FAILING_RENDER = "from manim import *\n\nclass Scene1(Scene):\n    def construct(self):\n        fail()\n"
+
+
+def _engine(candidates: int, render):
+    """Engine with the LLM and renderer replaced by fakes"""
+    engine = object.__new__(VideoGenerationEngine)
+    engine._summary_lock = threading.Lock()
+    engine._scene_models = {}
+    engine.tmp_dir, engine.scene_renders_dir = engine_module.run_directories()
+    engine.manim_router = ModelRouter([ModelTier("fast"), ModelTier("strong")])
+    engine.render_config = SimpleNamespace(correction_candidates=candidates, timeout=10)
+    engine.requests = []
+    engine.discarded = []
+    engine.llm_cache = SimpleNamespace(discard=engine.discarded.append)
+
+    def correct(failed_code, error_message, scene_data=None, tier=None, temperature=0.1, hint=""):
+        engine.requests.append((temperature, hint))
+        index = [temperature for temperature, _ in engine_module.CORRECTION_VARIANTS].index(temperature)
+        code = f"from manim import *\n\nclass Scene1(Scene):\n    def construct(self):\n        pass  # {index}\n"
+        return code, f"key{len(engine.requests)}"
+
+    engine._correct_manim_code = correct
+    engine._run_manim = render
+    return engine
+
+
+class TestSpeculativeCorrection(unittest.TestCase):
+    """Test first-success-wins correction rounds"""
+
+    def setUp(self):
+        self.static_validation = engine_module.STATIC_VALIDATION_ENABLED
+        engine_module.STATIC_VALIDATION_ENABLED = False
+
+    def tearDown(self):
+        engine_module.STATIC_VALIDATION_ENABLED = self.static_validation
+
+    def test_first_rendered_candidate_wins(self):
+        cancelled = []
+        rendering = []
+
+        def render(script_path, class_name, manim_args, output_dir, cancel=None):
+            if output_dir.name == "candidate_1":
+                # Win only once every candidate is rendering, so all of them get cancelled
+                deadline = time.time() + 5
+                while len(rendering) < 2 and time.time() < deadline:
+                    time.sleep(0.01)
+                return output_dir / "Scene1.mp4"
+            rendering.append(output_dir.name)
+            if cancel.wait(5):
+                cancelled.append(output_dir.name)
+                raise concurrent.futures.CancelledError()
+            raise RenderError("should have been cancelled")
+
+        engine = _engine(3, render)
+        summary = ProcessingSummary(topic="t")
+        started = time.time()
+        video, code, rounds = engine._race_corrections(
+            FAILING_RENDER, "NameError", {"layout": "split_screen"}, 1, "Scene1", ["-ql"],
+            Path("/tmp/renders"), "fast", 1, 2, summary
+        )
+
+        self.assertLess(time.time() - started, 3)
+        self.assertEqual(video, Path("/tmp/renders/candidate_1/Scene1.mp4"))
+        self.assertIn("pass  # 1", code)
+        self.assertEqual(rounds, 1)
+        self.assertEqual(len({request for request in engine.requests}), 3)
+        self.assertEqual(summary.render_stats.correction_candidates, 3)
+        self.assertEqual(summary.render_stats.speculative_wins, 1)
+        self.assertEqual(summary.manim_stats.escalations, 1)
+        time.sleep(0.3)
+        self.assertEqual(sorted(cancelled), ["candidate_0", "candidate_2"])
+        # Cancelled candidates never failed a check, so their responses stay cached
+        self.assertEqual(engine.discarded, [])
+
+    def test_failed_rounds_continue_from_a_failed_candidate(self):
+        def render(script_path, class_name, manim_args, output_dir, cancel=None):
+            raise RenderError("Manim render failed", f"error in {output_dir.name}")
+
+        engine = _engine(2, render)
+        summary = ProcessingSummary(topic="t")
+        with self.assertRaises(RuntimeError):
+            engine._race_corrections(FAILING_RENDER, "NameError", None, 1, "Scene1", ["-ql"],
+                                     Path("/tmp/renders"), "strong", 1, 2, summary)
+
+        self.assertEqual(len(engine.requests), 4)
+        self.assertEqual(summary.render_stats.correction_candidates, 4)
+        self.assertEqual(summary.manim_stats.per_model["strong"]["failures"], 4)
+        self.assertEqual(sorted(engine.discarded), ["key1", "key2", "key3", "key4"])
+
+
+class TestCorrectionCache(unittest.TestCase):
+    """Test that cached code is dropped once it fails a check"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patches = {"TMP_DIR": Path(self.tmp.name), "RENDERS_DIR": Path(self.tmp.name),
+                   "STATIC_VALIDATION_ENABLED": False}
+        for name, value in patches.items():
+            self.addCleanup(setattr, engine_module, name, getattr(engine_module, name))
+            setattr(engine_module, name, value)
+
+    def test_failed_render_drops_cached_code_but_keeps_the_fix(self):
+        renders = []
+
+        def render(script_path, class_name, manim_args, output_dir, cancel=None):
+            renders.append(script_path.read_text())
+            if len(renders) == 1:
+                raise RenderError("Manim render failed", "ValueError: unsupported option")
+            return output_dir / "Scene1.mp4"
+
+        engine = _engine(1, render)
+        engine.render_config = SimpleNamespace(correction_candidates=1, timeout=10, use_cache=False,
+                                               preflight=False, get_manim_args=lambda: ["-ql"])
+        engine._scene_models = {1: "fast"}
+        engine._scene_cache_keys = {1: "key0"}
+
+        video = engine._save_and_render_manim(FAILING_RENDER, "Scene1", 1, {"layout": "split_screen"})
+
+        self.assertEqual(video.name, "Scene1.mp4")
+        self.assertEqual(len(renders), 2)
+        self.assertEqual(engine.discarded, ["key0"])
+
+
+def _scene_code(seq: int, body: str) -> str:
+    return f"from manim import *\n\nclass Scene{seq}(Scene):\n    def construct(self):\n        {body}\n"
+
+
+class TestParallelRenderChecks(unittest.TestCase):
+    """Test that the default parallel render path checks and corrects code before rendering"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patches = {"TMP_DIR": Path(self.tmp.name), "RENDERS_DIR": Path(self.tmp.name),
+                   "STATIC_VALIDATION_ENABLED": True, "validate_scene_source": self._validate}
+        for name, value in patches.items():
+            self.addCleanup(setattr, engine_module, name, getattr(engine_module, name))
+            setattr(engine_module, name, value)
+
+    @staticmethod
+    def _validate(scene_code, index=None):
+        if "Squircle" in scene_code:
+            return [ValidationIssue(5, "unknown_name", "Unknown name 'Squircle'")]
+        return []
+
+    def _engine(self, preflight=False):
+        renders = []
+
+        def render(script_path, class_name, manim_args, output_dir, cancel=None):
+            code = script_path.read_text()
+            renders.append(code)
+            if "fail()" in code:
+                raise RenderError("Manim render failed", "NameError: name 'fail' is not defined")
+            video = output_dir / f"{class_name}.mp4"
+            video.write_text(code)
+            return video
+
+        engine = _engine(1, render)
+        engine.renders = renders
+        engine.render_config = SimpleNamespace(correction_candidates=1, timeout=10, use_cache=False,
+                                               preflight=preflight, render_backend="subprocess",
+                                               quality="low", get_manim_args=lambda: ["-ql"])
+        engine._scene_cache_keys = {}
+        engine.max_render_workers = 2
+        engine.manim_parallel = ManimParallelProcessor(max_workers=2)
+        engine.render_slots = None
+        engine.progress_callback = None
+        engine._scenes_done = 0
+        engine._scenes_started = time.time()
+        return engine
+
+    def _render(self, engine, codes):
+        scenes = [Scene(seq=seq, text="narration", anim="animation") for seq in codes]
+        scene_codes = {f"scene_{seq}": (code, f"Scene{seq}") for seq, code in codes.items()}
+        summary = ProcessingSummary(topic="T", total_scenes=len(codes))
+        videos = engine._render_scenes_parallel(scenes, scene_codes, {}, Path(self.tmp.name), summary)
+        return videos, summary
+
+    def test_invalid_scene_is_corrected_before_any_render(self):
+        engine = self._engine()
+        videos, summary = self._render(engine, {
+            1: _scene_code(1, "self.wait()"),
+            2: _scene_code(2, "self.play(Create(Squircle()))")
+        })
+
+        self.assertEqual(len(videos), 2)
+        self.assertEqual(len(engine.renders), 2)
+        self.assertFalse(any("Squircle" in code for code in engine.renders))
+        self.assertEqual(summary.render_stats.static_rejections, 1)
+        self.assertEqual(len(engine.requests), 1)
+
+    def test_preflight_failure_is_corrected_before_the_real_render(self):
+        dry_runs = []
+
+        def preflight(script_path, class_name, timeout=None, use_pool=False):
+            code = script_path.read_text()
+            dry_runs.append(class_name)
+            if "fail()" in code:
+                return PreflightResult(ok=False, error="NameError: name 'fail' is not defined")
+            return PreflightResult(ok=True)
+
+        self.addCleanup(setattr, engine_module, "preflight_scene", engine_module.preflight_scene)
+        engine_module.preflight_scene = preflight
+        engine = self._engine(preflight=True)
+        videos, summary = self._render(engine, {1: _scene_code(1, "fail()"), 2: _scene_code(2, "self.wait()")})
+
+        self.assertEqual(len(videos), 2)
+        self.assertEqual(sorted(dry_runs), ["Scene1", "Scene1", "Scene2"])
+        self.assertEqual(len(engine.renders), 2)
+        self.assertFalse(any("fail()" in code for code in engine.renders))
+        self.assertEqual(summary.render_stats.preflight_failures, 1)
+
+    def test_render_outcomes_reach_the_model_router(self):
+        engine = self._engine()
+        engine._scene_models = {1: "fast", 2: "fast"}
+        videos, summary = self._render(engine, {1: _scene_code(1, "fail()"), 2: _scene_code(2, "self.wait()")})
+
+        self.assertEqual(len(videos), 2)
+        fast = engine.manim_router.stats()["fast"]
+        self.assertEqual((fast["successes"], fast["failures"]), (1, 1))
+        self.assertEqual(summary.manim_stats.per_model["fast"]["success_rate"], 0.5)
+        # The correction that fixed scene 1 is credited to the model that wrote it
+        corrected = [entry for model, entry in engine.manim_router.stats().items() if model != "fast"]
+        self.assertEqual([(entry["successes"], entry["failures"]) for entry in corrected], [(1, 0)])
+
+    def test_failed_parallel_render_drops_cached_code(self):
+        engine = self._engine()
+        engine._scene_cache_keys = {1: "key0", 2: "key2"}
+        videos, _ = self._render(engine, {1: _scene_code(1, "fail()"), 2: _scene_code(2, "self.wait()")})
+
+        self.assertEqual(len(videos), 2)
+        # Only the response that failed is dropped; the passing scene and the fix stay cached
+        self.assertEqual(engine.discarded, ["key0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for the ffmpeg video utilities
+"""
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.engine import VideoGenerationEngine
+from src.utils.video import (
+    assemble_final_video, can_stream_copy, concatenate_videos, encode_scene_clip,
+    get_media_duration, get_video_info
+)
+
+FFMPEG_AVAILABLE = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+@unittest.skipUnless(FFMPEG_AVAILABLE, "ffmpeg is not installed")
+class TestAssembleFinalVideo(unittest.TestCase):
+    """Test single-pass assembly of scene clips and narration"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _make_clip(self, name: str, duration: float, size: str = "320x240", rate: int = 30) -> Path:
+        path = self.root / name
+        subprocess.run([
+            "ffmpeg", "-y", "-f", "lavfi", "-i", f"testsrc=size={size}:rate={rate}",
+            "-t", str(duration), "-pix_fmt", "yuv420p", str(path)
+        ], check=True, capture_output=True)
+        return path
+
+    def _make_narration(self, name: str, duration: float) -> Path:
+        path = self.root / name
+        subprocess.run([
+            "ffmpeg", "-y", "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=24000",
+            "-t", str(duration), "-ac", "1", str(path)
+        ], check=True, capture_output=True)
+        return path
+
+    def test_segments_last_as_long_as_their_longest_stream(self):
+        """Narration extends a short clip, silence fills a long one, padding goes at the end"""
+        segments = [
+            (self._make_clip("a.mp4", 1.0), self._make_narration("a.wav", 2.0)),
+            (self._make_clip("b.mp4", 1.5, size="640x480", rate=60), None),
+        ]
+        output = self.root / "final.mp4"
+
+        self.assertTrue(assemble_final_video(segments, output, padding_duration=0.5))
+
+        self.assertAlmostEqual(get_media_duration(output), 4.0, delta=0.1)
+        info = get_video_info(output)
+        self.assertEqual((info["width"], info["height"]), (320, 240))
+        self.assertEqual(info["fps"], 30)
+
+    def test_missing_clip_fails(self):
+        self.assertFalse(assemble_final_video([(self.root / "missing.mp4", None)], self.root / "out.mp4"))
+
+    def test_canonical_clips_are_stream_copied(self):
+        """Clips from the per-scene encode concatenate without re-encoding the whole video"""
+        first, second = self.root / "first.mp4", self.root / "second.mp4"
+        self.assertTrue(encode_scene_clip(self._make_clip("a.mp4", 1.0), self._make_narration("a.wav", 1.5), first))
+        self.assertTrue(encode_scene_clip(self._make_clip("b.mp4", 1.0), None, second))
+        self.assertTrue(can_stream_copy([first, second]))
+
+        output = self.root / "final.mp4"
+        self.assertTrue(concatenate_videos([first, second], output, padding_duration=0.5))
+        self.assertAlmostEqual(get_media_duration(output), 3.0, delta=0.15)
+
+    def test_mismatched_clips_are_re_encoded(self):
+        clips = [self._make_clip("a.mp4", 1.0), self._make_clip("b.mp4", 1.0, size="640x480")]
+        self.assertFalse(can_stream_copy(clips))
+
+        output = self.root / "final.mp4"
+        self.assertTrue(concatenate_videos(clips, output, padding_duration=0.5))
+        self.assertAlmostEqual(get_media_duration(output), 2.5, delta=0.15)
+
+
+@unittest.skipUnless(FFMPEG_AVAILABLE, "ffmpeg is not installed")
+class TestAudioTiming(unittest.TestCase):
+    """Test narration timing injected into generated scene modules"""
+
+    def test_measured_duration_is_injected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            audio_file = Path(tmp) / "narration.wav"
+            subprocess.run([
+                "ffmpeg", "-y", "-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono", "-t", "2.5", str(audio_file)
+            ], check=True, capture_output=True)
+
+            engine = object.__new__(VideoGenerationEngine)
+            code = engine._apply_audio_timing("class Scene1: pass\n", "Scene1", audio_file)
+            namespace = {}
+            exec(code, namespace)
+
+        self.assertAlmostEqual(namespace["Scene1"].audio_duration, 2.5, delta=0.05)
+        self.assertTrue(namespace["Scene1"].external_hold)
+
+    def test_missing_audio_leaves_code_unchanged(self):
+        engine = object.__new__(VideoGenerationEngine)
+        self.assertEqual(engine._apply_audio_timing("code", "Scene1", None), "code")
+
+
+if __name__ == "__main__":
+    unittest.main()
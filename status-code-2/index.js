@@ -287,6 +287,7 @@ app.post("/submit", async (req, res) => {
     const completedTokens = [];
     const pollingStatus = tokenArray.map(() => ({
       completed: false,
+      failed: false,
       data: null,
     }));
 
@@ -312,6 +313,10 @@ app.post("/submit", async (req, res) => {
             if (pollData && pollData.scenes && pollData.scenes.length > 0) {
               return {index, token, data: pollData};
             }
+            // A failed variation never produces a script; stop polling it
+            if (pollData && pollData.status === "failed") {
+              return {index, token, data: null, failed: true, error: pollData.error};
+            }
             return null;
           } catch (error) {
             console.error(`Error polling token ${token}:`, error);
@@ -321,7 +326,11 @@ app.post("/submit", async (req, res) => {
 
         const pollResults = await Promise.all(pollPromises);
         for (const result of pollResults) {
-          if (result && !pollingStatus[result.index].completed) {
+          if (result && result.failed && !pollingStatus[result.index].completed) {
+            pollingStatus[result.index].completed = true;
+            pollingStatus[result.index].failed = true;
+            console.error(`Script generation failed for token ${result.token}:`, result.error);
+          } else if (result && !pollingStatus[result.index].completed) {
             pollingStatus[result.index].completed = true;
             pollingStatus[result.index].data = result.data;
             completedScripts[result.index] = result.data;
@@ -344,12 +353,21 @@ app.post("/submit", async (req, res) => {
     }
 
     // After polling, check if all scripts are ready
-    if (pollingStatus.every((status) => status.completed)) {
+    const failedCount = pollingStatus.filter((status) => status.failed).length;
+    if (failedCount === tokenArray.length) {
+      return res.status(500).json({
+        success: false,
+        message: "Script generation failed",
+        chatID: chatID,
+      });
+    } else if (pollingStatus.every((status) => status.completed)) {
       return res.status(200).json({
         success: true,
-        message: "All scripts generated successfully",
-        scripts: completedScripts,
-        tokens: completedTokens,
+        message: failedCount > 0
+          ? `Generated ${tokenArray.length - failedCount}/${tokenArray.length} scripts`
+          : "All scripts generated successfully",
+        scripts: completedScripts.filter(Boolean),
+        tokens: completedTokens.filter(Boolean),
         chatID: chatID,
       });
     } else {
@@ -375,7 +393,7 @@ async function pollAllScripts(tokenArray, chatID, uid, text) {
   const maxPolls = 600; // 60 * 10s = 600s
   const completedScripts = [];
   const completedTokens = [];
-  const pollingStatus = tokenArray.map(() => ({completed: false, data: null}));
+  const pollingStatus = tokenArray.map(() => ({completed: false, failed: false, data: null}));
 
   console.log(`Starting background polling for ${tokenArray.length} scripts`);
 
@@ -425,6 +443,7 @@ async function pollAllScripts(tokenArray, chatID, uid, text) {
             token,
             data: pollData,
             ready: false,
+            failed: Boolean(pollData && pollData.status === "failed"),
             alreadyCompleted: false,
           };
         } catch (error) {
@@ -443,7 +462,12 @@ async function pollAllScripts(tokenArray, chatID, uid, text) {
 
       // Process newly completed scripts
       for (const result of pollResults) {
-        if (result.ready && !result.alreadyCompleted) {
+        if (result.failed && !result.alreadyCompleted) {
+          // A failed variation never produces a script; stop polling it
+          pollingStatus[result.index].completed = true;
+          pollingStatus[result.index].failed = true;
+          console.error(`Script ${result.index + 1} failed for token ${result.token}:`, result.data.error);
+        } else if (result.ready && !result.alreadyCompleted) {
           const {index, token, data} = result;
 
           // Mark as completed